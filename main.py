@@ -1,4 +1,5 @@
 # main.py
+import sys
 import arcade
 from src.window import GameWindow
 
@@ -9,4 +10,17 @@ def main():
     arcade.run()
 
 if __name__ == "__main__":
-    main()
+    if sys.argv[1:] == ["build-assets"]:
+        from src.asset_pipeline import build_assets
+        build_assets()
+    elif sys.argv[1:2] == ["bench"]:
+        from src.bench import main as bench
+        bench(sys.argv[2:])
+    elif sys.argv[1:2] == ["replay"]:
+        from src.replay import main as replay
+        replay(sys.argv[2:])
+    elif sys.argv[1:2] == ["simulate"]:
+        from src.batch import main as simulate
+        simulate(sys.argv[2:])
+    else:
+        main()
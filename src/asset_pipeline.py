@@ -0,0 +1,121 @@
+import hashlib
+import json
+import math
+import os
+from PIL import Image
+from src.settings import SCREEN_WIDTH, SCREEN_HEIGHT, BOSS_SCALE
+
+
+BUILD_DIR = os.path.join("assets", ".build")
+# Какие копии собраны и от какой версии исходника: время изменения и размер файла
+MANIFEST = os.path.join(BUILD_DIR, "manifest.json")
+_manifest = None
+
+
+def _screen(w, h):
+    return SCREEN_WIDTH, SCREEN_HEIGHT
+
+
+def _floor_splash(w, h):
+    # FloorSelectionView вписывает картинку в 80% экрана с сохранением пропорций
+    k = min(SCREEN_WIDTH * 0.8 / w, SCREEN_HEIGHT * 0.8 / h)
+    return math.ceil(w * k), math.ceil(h * k)
+
+
+def _boss(w, h):
+    return math.ceil(w * BOSS_SCALE), math.ceil(h * BOSS_SCALE)
+
+
+# Размеры, в которых картинки реально рисуются на экране
+TARGETS = {
+    "assets/WallFirst.png": _screen,
+    "assets/Main_Background.png": _screen,
+    "assets/First_Floor.png": _floor_splash,
+    "assets/Second_Floor.png": _floor_splash,
+    "assets/Third_Floor.png": _floor_splash,
+    "assets/boss.png": _boss,
+}
+
+
+def _prefix(path):
+    return os.path.splitext(os.path.basename(path))[0] + "-"
+
+
+def baked_path(path):
+    with open(path, "rb") as f:
+        digest = hashlib.sha1(f.read()).hexdigest()[:16]
+    # Ключ: содержимое исходника и размер экрана из config.json
+    return os.path.join(BUILD_DIR, f"{_prefix(path)}{digest}-{SCREEN_WIDTH}x{SCREEN_HEIGHT}.png")
+
+
+def _stamp(path):
+    st = os.stat(path)
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _load_manifest():
+    global _manifest
+    if _manifest is None:
+        try:
+            with open(MANIFEST, encoding="utf-8") as f:
+                _manifest = json.load(f)
+        except (OSError, ValueError):
+            _manifest = {}
+    return _manifest
+
+
+def resolve(path):
+    # Исходник не читается: копия годится, пока его время изменения и размер
+    # те же, что при сборке. Хеш содержимого считает только build-assets
+    entry = _load_manifest().get(path) if path in TARGETS else None
+    if entry is None:
+        return path
+    try:
+        stamp = _stamp(path)
+    except OSError:
+        return path
+    if entry["stamp"] != stamp or entry["screen"] != [SCREEN_WIDTH, SCREEN_HEIGHT]:
+        return path
+    if not os.path.exists(entry["baked"]):
+        return path
+    return entry["baked"]
+
+
+def build_asset(path):
+    baked = baked_path(path)
+    if os.path.exists(baked):
+        return baked, False
+
+    with Image.open(path) as img:
+        size = TARGETS[path](*img.size)
+        if size[0] >= img.width and size[1] >= img.height:
+            return None, False
+        os.makedirs(BUILD_DIR, exist_ok=True)
+        img.convert("RGBA").resize(size, Image.LANCZOS).save(baked, optimize=True)
+    return baked, True
+
+
+def build_assets():
+    global _manifest
+    manifest = {}
+    for path in TARGETS:
+        if not os.path.exists(path):
+            continue
+        baked, created = build_asset(path)
+        if baked is None:
+            print(f"{path}: уже не больше нужного размера")
+            continue
+        manifest[path] = {"stamp": _stamp(path), "screen": [SCREEN_WIDTH, SCREEN_HEIGHT], "baked": baked}
+
+        # Копии от старых версий исходника или другого разрешения больше не нужны
+        keep = os.path.basename(baked)
+        for name in os.listdir(BUILD_DIR):
+            if name.startswith(_prefix(path)) and name != keep:
+                os.remove(os.path.join(BUILD_DIR, name))
+
+        print(f"{path} -> {baked}" + ("" if created else " (готово)"))
+
+    if manifest:
+        with open(MANIFEST, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+    _manifest = manifest
@@ -0,0 +1,99 @@
+import threading
+import arcade
+import numpy as np
+from PIL import Image
+from src.asset_pipeline import resolve
+
+
+_textures = {}
+_missing = set()
+# Во сколько раз уменьшена подготовленная копия относительно исходника
+_source_scale = {}
+_stats = {"hits": 0, "misses": 0}
+_matrix_textures = {}
+# Кэш заполняют и главный поток, и поток подготовки этажа
+_lock = threading.Lock()
+
+
+def get_texture(path):
+    with _lock:
+        texture = _textures.get(path)
+        if texture is not None:
+            _stats["hits"] += 1
+            return texture
+
+        _stats["misses"] += 1
+        if path in _missing:
+            raise FileNotFoundError(path)
+
+    # PNG декодируется без блокировки, чтобы поток подготовки этажа не держал главный
+    try:
+        load_path = resolve(path)
+        texture = arcade.load_texture(load_path)
+    except FileNotFoundError:
+        with _lock:
+            _missing.add(path)
+        raise
+    source_scale = None
+    if load_path != path:
+        with Image.open(path) as source:
+            source_scale = source.width / texture.width
+
+    with _lock:
+        # Если тот же путь успел загрузить другой поток, в кэше остаётся его текстура
+        cached = _textures.get(path)
+        if cached is not None:
+            return cached
+        if source_scale is not None:
+            _source_scale[path] = source_scale
+        _textures[path] = texture
+        return texture
+
+
+def make_sprite(path, scale=1.0):
+    texture = get_texture(path)
+    # Уменьшенная копия рисуется с компенсирующим масштабом, размер на экране прежний
+    with _lock:
+        source_scale = _source_scale.get(path, 1.0)
+    return arcade.Sprite(texture, scale=scale * source_scale)
+
+
+def pixel_matrix_texture(matrix, pixel, color):
+    color = tuple(color)
+    if len(color) == 3:
+        color = (*color, 255)
+    key = (tuple(matrix), pixel, color)
+    with _lock:
+        texture = _matrix_textures.get(key)
+        if texture is not None:
+            return texture
+
+        # Каждая клетка "1" становится квадратом pixel x pixel, верхняя строка матрицы сверху
+        cells = np.array([[cell == "1" for cell in row] for row in matrix], dtype=bool)
+        mask = cells.repeat(pixel, axis=0).repeat(pixel, axis=1)
+        rgba = np.zeros((*mask.shape, 4), dtype=np.uint8)
+        rgba[mask] = color
+        name = "matrix_" + "_".join(matrix) + f"_{pixel}_" + "_".join(map(str, color))
+        texture = arcade.Texture(Image.fromarray(rgba), hash=name)
+        _matrix_textures[key] = texture
+        return texture
+
+
+def texture_cache_stats():
+    with _lock:
+        return {
+            "hits": _stats["hits"],
+            "misses": _stats["misses"],
+            "loaded": len(_textures),
+            "missing": len(_missing),
+        }
+
+
+def clear_texture_cache():
+    with _lock:
+        _textures.clear()
+        _matrix_textures.clear()
+        _missing.clear()
+        _source_scale.clear()
+        _stats["hits"] = 0
+        _stats["misses"] = 0
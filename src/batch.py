@@ -0,0 +1,161 @@
+import argparse
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from src.policy import POLICIES, apply_action
+from src.simulation import Simulation
+from src.settings import *
+
+
+DT = 1 / TICK_RATE
+WIN_OUTCOMES = ("floor_select", "good_ending")
+
+
+def parse_seeds(text):
+    # "1-100,200,300-310" -> список сидов по порядку
+    seeds = []
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            first, last = part.split("-", 1)
+            seeds.extend(range(int(first), int(last) + 1))
+        else:
+            seeds.append(int(part))
+    return seeds
+
+
+def run_one(seed, floor_number, policy_name, max_ticks):
+    # Пройденные раньше этажи считаются пройденными, как при обычной игре по порядку
+    for n in completed_levels:
+        completed_levels[n] = n < floor_number
+    sim = Simulation()
+    sim.setup(floor_number, seed)
+    policy = POLICIES[policy_name](seed)
+
+    clears = defaultdict(list)
+    pos = sim.floor.current_pos
+    entered = 0
+    cleared = sim.room_cleared
+    lives = sim.lives
+    start = time.perf_counter()
+    while sim.outcome is None and sim.tick < max_ticks:
+        apply_action(sim, policy.act(sim))
+        sim.update(DT)
+        # После гибели комната загружается заново, и отсчёт зачистки тоже
+        if sim.floor.current_pos != pos or sim.lives < lives:
+            pos = sim.floor.current_pos
+            entered = sim.tick
+        elif sim.room_cleared and not cleared:
+            clears[sim.floor.get_current_room().type.value].append((sim.tick - entered) * DT)
+        cleared = sim.room_cleared
+        lives = sim.lives
+    elapsed = time.perf_counter() - start
+
+    if sim.outcome in WIN_OUTCOMES:
+        result = "win"
+    elif sim.outcome is not None:
+        result = "loss"
+    else:
+        result = "timeout"
+    return {
+        "seed": seed,
+        "result": result,
+        "ticks": sim.tick,
+        "seconds": elapsed,
+        "worker": os.getpid(),
+        "clears": dict(clears),
+        "damage": dict(sim.damage_taken),
+        "lives": sim.lives,
+    }
+
+
+def aggregate(runs):
+    total = len(runs)
+    results = defaultdict(int)
+    clears = defaultdict(list)
+    damage = defaultdict(float)
+    workers = defaultdict(lambda: [0, 0.0])
+    for r in runs:
+        results[r["result"]] += 1
+        for room_type, times in r["clears"].items():
+            clears[room_type].extend(times)
+        for source, amount in r["damage"].items():
+            damage[source] += amount
+        workers[r["worker"]][0] += r["ticks"]
+        workers[r["worker"]][1] += r["seconds"]
+
+    def summary(times):
+        times = sorted(times)
+        return {"count": len(times), "mean": sum(times) / len(times), "p50": times[len(times) // 2], "max": times[-1]}
+
+    return {
+        "runs": total,
+        "win_rate": results.get("win", 0) / total if total else 0.0,
+        "results": dict(results),
+        "clear_seconds": {room_type: summary(times) for room_type, times in sorted(clears.items())},
+        "damage_per_run": {source: amount / total for source, amount in sorted(damage.items(), key=lambda x: -x[1])},
+        "ticks_per_sec": {str(pid): ticks / seconds for pid, (ticks, seconds) in sorted(workers.items()) if seconds > 0},
+    }
+
+
+def print_report(report, wall):
+    print()
+    print(f"прогонов {report['runs']}, побед {report['win_rate']:.1%}  "
+          + "  ".join(f"{k}: {v}" for k, v in sorted(report["results"].items())))
+    print(f"\n{'время зачистки, с':<22}{'комнат':>8}{'среднее':>10}{'p50':>8}{'max':>8}")
+    for room_type, s in report["clear_seconds"].items():
+        print(f"{room_type:<22}{s['count']:>8}{s['mean']:>10.1f}{s['p50']:>8.1f}{s['max']:>8.1f}")
+    print(f"\n{'урон за прогон':<22}{'HP':>8}")
+    for source, amount in report["damage_per_run"].items():
+        print(f"{source:<22}{amount:>8.1f}")
+    rates = list(report["ticks_per_sec"].values())
+    if rates:
+        print(f"\nпроцессов {len(rates)}, тиков/с на процесс: мин {min(rates):.0f}, "
+              f"среднее {sum(rates) / len(rates):.0f}, макс {max(rates):.0f}; всего {sum(rates):.0f}")
+    print(f"заняло {wall:.1f} с")
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog="main.py simulate", description="Пакетные прогоны этажа без окна")
+    parser.add_argument("--seeds", default="1-100", help="сиды: 1-100,200,300-310")
+    parser.add_argument("--floor", type=int, default=1)
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="bot")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--max-minutes", type=float, default=10.0, help="предел игрового времени на прогон")
+    parser.add_argument("--out", help="сохранить прогоны и итоги в JSON")
+    args = parser.parse_args(argv)
+
+    seeds = parse_seeds(args.seeds)
+    if not seeds:
+        parser.error("пустой список сидов")
+    max_ticks = round(args.max_minutes * 60 * TICK_RATE)
+    run = partial(run_one, floor_number=args.floor, policy_name=args.policy, max_ticks=max_ticks)
+
+    # Прогоны раздаются пачками, чтобы меньше гонять задачи между процессами,
+    # но небольшими: иначе в конце часть процессов простаивает
+    workers = max(1, min(args.workers, len(seeds)))
+    chunksize = max(1, min(32, len(seeds) // (workers * 8)))
+    runs = []
+    start = time.perf_counter()
+    step = max(1, len(seeds) // 20)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for r in pool.map(run, seeds, chunksize=chunksize):
+            runs.append(r)
+            if len(runs) % step == 0 or len(runs) == len(seeds):
+                print(f"\r{len(runs)}/{len(seeds)}", end="", file=sys.stderr, flush=True)
+    print(file=sys.stderr)
+    wall = time.perf_counter() - start
+
+    report = aggregate(runs)
+    report.update(floor=args.floor, policy=args.policy, workers=workers)
+    print_report(report, wall)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"summary": report, "runs": runs}, f, indent=2)
+        print(f"сохранено в {args.out}")
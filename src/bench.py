@@ -0,0 +1,245 @@
+import argparse
+import glob
+import json
+import math
+import platform
+import random
+import sys
+import time
+from src.assets import clear_texture_cache, get_texture
+from src.dungeon import Floor
+from src.enemy import *
+from src.boss import *
+from src.simulation import Simulation
+from src.settings import *
+
+
+DEFAULT_SEED = 1234
+DT = 1 / TICK_RATE
+FLOOR_SIZES = (3, 4, 8, 16, 32, 64)
+TICK_ARCHETYPES = (Enemy, FastEnemy, TankEnemy, RangedEnemy,
+                   EliteRunner, EliteShooter, EliteTankFloor3, EliteArcherFloor3)
+TICK_ENEMIES = (10, 100)
+TICK_PROJECTILES = (0, 200)
+
+
+def _percentile(samples, q):
+    # Ближайший ранг по отсортированной выборке
+    return samples[min(len(samples) - 1, max(0, math.ceil(q / 100 * len(samples)) - 1))]
+
+
+def measure(name, op, repeats, setup=None, warmup=1):
+    for _ in range(warmup):
+        if setup is not None:
+            setup()
+        op()
+
+    samples = []
+    for _ in range(repeats):
+        if setup is not None:
+            setup()
+        start = time.perf_counter_ns()
+        op()
+        samples.append(time.perf_counter_ns() - start)
+
+    samples.sort()
+    return {
+        "name": name,
+        "ops": repeats,
+        "ops_per_sec": repeats / (sum(samples) / 1e9),
+        "p50_us": _percentile(samples, 50) / 1e3,
+        "p90_us": _percentile(samples, 90) / 1e3,
+        "p99_us": _percentile(samples, 99) / 1e3,
+        "max_us": samples[-1] / 1e3,
+    }
+
+
+def _headless_sim(floor_number, seed):
+    sim = Simulation()
+    sim.setup(floor_number, seed)
+    sim.player.hp = sim.player.max_hp = 1e12
+    return sim
+
+
+def _first_room(floor, room_type):
+    for pos, room in sorted(floor.rooms.items()):
+        if room.type == room_type:
+            return pos, room
+    return None, None
+
+
+def bench_floor_generation(seed, scale):
+    for size in FLOOR_SIZES:
+        # Размер этажа растёт с номером: BASE_FLOOR_SIZE + (номер - 1)
+        floor_number = size - BASE_FLOOR_SIZE + 1
+        repeats = max(3, int(4000 // (size * size) * scale))
+        yield f"floor_gen/size{size}", dict(op=lambda n=floor_number: Floor(n, seed), repeats=repeats)
+
+
+def bench_room_load(seed, scale):
+    kinds = [
+        ("start", RoomType.START, False),
+        ("normal", RoomType.NORMAL, False),
+        ("treasure", RoomType.TREASURE, False),
+        ("treasure_open", RoomType.TREASURE, True),
+        ("boss", RoomType.BOSS, False),
+    ]
+    repeats = max(5, int(60 * scale))
+    for floor_number in range(1, MAX_FLOORS + 1):
+        sim = _headless_sim(floor_number, seed)
+        for label, room_type, unlocked in kinds:
+            pos, room = _first_room(sim.floor, room_type)
+            if pos is None:
+                continue
+            room.treasure_unlocked = unlocked
+
+            # Значения цикла привязываются по умолчанию: иначе замыкание увидит последние
+            def load(sim=sim, pos=pos):
+                sim.floor.current_pos = pos
+                sim.load_current_room()
+
+            def forget_layer(room=room):
+                room.static_layer = None
+
+            # Холодная загрузка строит слой стен заново, тёплая берёт его из комнаты
+            yield f"room_load/floor{floor_number}/{label}/cold", dict(op=load, repeats=repeats, setup=forget_layer)
+            yield f"room_load/floor{floor_number}/{label}/warm", dict(op=load, repeats=repeats)
+
+
+def _top_up_projectiles(sim, count, rng):
+    pool = sim.projectiles
+    while len(pool) < count:
+        angle = rng.uniform(0, 2 * math.pi)
+        pool.spawn(rng.uniform(150, SCREEN_WIDTH - 150), rng.uniform(150, SCREEN_HEIGHT - 150),
+                   math.cos(angle) * ARROW_SPEED, math.sin(angle) * ARROW_SPEED,
+                   damage=1, from_enemy=True, scale=5, angle=math.degrees(angle))
+
+
+def bench_tick(seed, scale):
+    ticks = max(20, int(200 * scale))
+    for archetype in TICK_ARCHETYPES:
+        for n in TICK_ENEMIES:
+            for m in TICK_PROJECTILES:
+                rng = random.Random(seed)
+                sim = _headless_sim(2, seed)
+                pos, _ = _first_room(sim.floor, RoomType.NORMAL)
+                sim.floor.current_pos = pos
+                sim.load_current_room()
+                sim.current_enemies.clear()
+                sim.enemy_sprites.clear()
+                for _ in range(n):
+                    if sim.free_space.available():
+                        x, y = sim.find_free_position()
+                    else:
+                        x, y = rng.uniform(150, SCREEN_WIDTH - 150), rng.uniform(150, SCREEN_HEIGHT - 150)
+                    e = archetype(x, y)
+                    sim.current_enemies.append(e)
+                    sim.enemy_sprites.append(e.sprite)
+
+                yield f"tick/{archetype.__name__}/n{n}/p{m}", dict(
+                    op=lambda sim=sim: sim.update(DT), repeats=ticks,
+                    setup=lambda sim=sim, m=m, rng=rng: _top_up_projectiles(sim, m, rng), warmup=30)
+
+
+def bench_boss(seed, scale):
+    ticks = max(30, int(300 * scale))
+    attack_keys = {(1, 0): arcade.key.RIGHT, (-1, 0): arcade.key.LEFT,
+                   (0, 1): arcade.key.UP, (0, -1): arcade.key.DOWN}
+    for floor_number in range(1, MAX_FLOORS + 1):
+        for phase_hp in (1.0, 0.6, 0.3):
+            sim = _headless_sim(floor_number, seed)
+            sim.floor.current_pos = sim.floor.boss_pos
+            sim.load_current_room()
+            boss = sim.current_enemies[0]
+            state = {"tick": 0}
+
+            def script(sim=sim, boss=boss, state=state, phase_hp=phase_hp):
+                # Игрок ходит влево-вправо и бьёт в сторону босса; здоровье босса
+                # возвращается к доле фазы, чтобы бой не закончился посреди замера
+                boss.hp = boss.max_hp * phase_hp
+                state["tick"] += 1
+                t = state["tick"]
+                if t % 60 == 0:
+                    sim.key_release(arcade.key.A if (t // 60) % 2 else arcade.key.D)
+                    sim.key_press(arcade.key.D if (t // 60) % 2 else arcade.key.A)
+                if t % 20 == 0:
+                    dx = boss.x - sim.player.x
+                    dy = boss.y - sim.player.y
+                    direction = (1 if dx > 0 else -1, 0) if abs(dx) > abs(dy) else (0, 1 if dy > 0 else -1)
+                    sim.key_press(attack_keys[direction])
+                    sim.key_release(attack_keys[direction])
+
+            yield f"boss/floor{floor_number}/hp{int(phase_hp * 100)}", dict(
+                op=lambda sim=sim: sim.update(DT), repeats=ticks, setup=script, warmup=30)
+
+
+def bench_assets(seed, scale):
+    paths = sorted(glob.glob("assets/*.png"))
+
+    def load_all():
+        for path in paths:
+            get_texture(path)
+
+    yield "assets/load_all", dict(op=load_all, repeats=max(3, int(10 * scale)), setup=clear_texture_cache)
+
+
+SCENARIOS = [bench_floor_generation, bench_room_load, bench_tick, bench_boss, bench_assets]
+
+
+def compare(results, baseline, tolerance):
+    # Регрессия - падение ops/s больше чем на tolerance относительно сохранённого прогона
+    regressions = []
+    print()
+    print(f"{'name':<44} {'baseline':>12} {'now':>12} {'change':>8}")
+    for r in results:
+        old = baseline.get(r["name"])
+        if old is None:
+            continue
+        change = r["ops_per_sec"] / old["ops_per_sec"] - 1
+        mark = ""
+        if change < -tolerance:
+            mark = "  REGRESSION"
+            regressions.append(r["name"])
+        print(f"{r['name']:<44} {old['ops_per_sec']:>12.1f} {r['ops_per_sec']:>12.1f} {change:>+8.1%}{mark}")
+    return regressions
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog="main.py bench", description="Замеры производительности без окна")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--only", action="append", default=[],
+                        help="запускать только замеры, в имени которых есть эта строка")
+    parser.add_argument("--quick", action="store_true", help="в пять раз меньше повторов")
+    parser.add_argument("--out", default="bench_results.json")
+    parser.add_argument("--baseline", help="JSON прошлого прогона для сравнения")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    args = parser.parse_args(argv)
+    scale = 0.2 if args.quick else 1.0
+
+    results = []
+    print(f"{'name':<44} {'ops/s':>12} {'p50 us':>10} {'p90 us':>10} {'p99 us':>10}")
+    for scenario in SCENARIOS:
+        # Сценарий отдаёт имя и параметры замера до запуска, фильтр ничего лишнего не меряет
+        for name, case in scenario(args.seed, scale):
+            if args.only and not any(part in name for part in args.only):
+                continue
+            r = measure(name, **case)
+            results.append(r)
+            print(f"{r['name']:<44} {r['ops_per_sec']:>12.1f} {r['p50_us']:>10.1f} "
+                  f"{r['p90_us']:>10.1f} {r['p99_us']:>10.1f}")
+
+    report = {
+        "seed": args.seed,
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "results": {r["name"]: r for r in results},
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nсохранено в {args.out}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
@@ -1,14 +1,24 @@
 import arcade
 import math
-import random
+from src.assets import make_sprite
 from src.settings import BOSS_HP, BOSS_SCALE, BOSS_SPEED
 from src.enemy import Enemy, TankEnemy
+from src.rng import get_random
+from src.timers import Countdown, get_clock
 
 
 class Boss(Enemy):
+    steer_batched = False
+    dash_time = Countdown()
+    dash_cooldown = Countdown()
+    slow_timer = Countdown(on_expire="_end_slow")
+
     def __init__(self, x, y):
+        self.clock = get_clock()
+        self.rng = get_random().ai
+        self.stunned = False
         try:
-            self.sprite = arcade.Sprite("assets/boss.png", scale=BOSS_SCALE)
+            self.sprite = make_sprite("assets/boss.png", scale=BOSS_SCALE)
         except Exception:
             self.sprite = arcade.SpriteSolidColor(64, 64, arcade.color.PURPLE)
         self.sprite.center_x = x
@@ -32,13 +42,11 @@ class Boss(Enemy):
     def alive(self):
         return self.hp > 0
 
-    def update_phase(self, player, walls, dt):
-        if self.slowed:
-            self.slow_timer -= dt
-            if self.slow_timer <= 0:
-                self.slowed = False
-                self.slow_mult = 1.0
+    def _end_slow(self):
+        self.slowed = False
+        self.slow_mult = 1.0
 
+    def update_phase(self, player, walls, dt):
         if self.phase == 1:
             desired_distance = 260
         elif self.phase == 2:
@@ -54,7 +62,6 @@ class Boss(Enemy):
         else:
             self.phase = 1
 
-        self.dash_cooldown -= dt
         dx = player.x - self.x
         dy = player.y - self.y
         dist = math.hypot(dx, dy)
@@ -64,27 +71,12 @@ class Boss(Enemy):
             vx = dx / dist * (self.speed * speed_multiplier * (self.slow_mult ** 2)) * dt
             vy = dy / dist * (self.speed * speed_multiplier * (self.slow_mult ** 2)) * dt
 
-            old_x = self.sprite.center_x
-            self.sprite.center_x += vx
-            if arcade.check_for_collision_with_list(self.sprite, walls):
-                self.sprite.center_x = old_x
-            old_y = self.sprite.center_y
-            self.sprite.center_y += vy
-            if arcade.check_for_collision_with_list(self.sprite, walls):
-                self.sprite.center_y = old_y
+            walls.slide(self.sprite, vx, vy)
         else:
             vx = dx / max(dist, 1) * self.speed * (self.slow_mult ** 2) * 0.4 * dt
             vy = dy / max(dist, 1) * self.speed * (self.slow_mult ** 2) * 0.4 * dt
 
-            old_x = self.sprite.center_x
-            self.sprite.center_x += vx
-            if arcade.check_for_collision_with_list(self.sprite, walls):
-                self.sprite.center_x = old_x
-
-            old_y = self.sprite.center_y
-            self.sprite.center_y += vy
-            if arcade.check_for_collision_with_list(self.sprite, walls):
-                self.sprite.center_y = old_y
+            walls.slide(self.sprite, vx, vy)
 
         if not self.is_dashing and self.phase >= 2 and self.dash_cooldown <= 0 and dist > 120:
             self.is_dashing = True
@@ -101,19 +93,10 @@ class Boss(Enemy):
             self.dash_cooldown = 2.5
 
         if self.is_dashing:
-            self.dash_time -= dt
             vx = self.dash_dir_x * self.dash_speed * dt
             vy = self.dash_dir_y * self.dash_speed * dt
 
-            old_x = self.sprite.center_x
-            self.sprite.center_x += vx
-            if arcade.check_for_collision_with_list(self.sprite, walls):
-                self.sprite.center_x = old_x
-
-            old_y = self.sprite.center_y
-            self.sprite.center_y += vy
-            if arcade.check_for_collision_with_list(self.sprite, walls):
-                self.sprite.center_y = old_y
+            walls.slide(self.sprite, vx, vy)
 
             if self.dash_time <= 0:
                 self.is_dashing = False
@@ -131,9 +114,18 @@ class Boss(Enemy):
             self.sprite.color = arcade.color.WHITE
 
 class BossFloor2(Enemy):
+    steer_batched = False
+    arrow_timer = Countdown()
+    slow_timer = Countdown(on_expire="_end_slow")
+    dash_timer = Countdown()
+    dash_cooldown = Countdown()
+
     def __init__(self, x, y):
+        self.clock = get_clock()
+        self.rng = get_random().ai
+        self.stunned = False
         try:
-            self.sprite = arcade.Sprite("assets/boss_floor2.png", scale=7)
+            self.sprite = make_sprite("assets/boss_floor2.png", scale=7)
         except Exception:
             self.sprite = arcade.SpriteSolidColor(64, 64, arcade.color.DARK_RED)
 
@@ -155,37 +147,21 @@ class BossFloor2(Enemy):
     def alive(self):
         return self.hp > 0
 
-    def update(self, player, walls, dt, projectile_list):
-        if self.slowed:
-            self.slow_timer -= dt
-            if self.slow_timer <= 0:
-                self.slowed = False
-                self.slow_mult = 1.0
+    def _end_slow(self):
+        self.slowed = False
+        self.slow_mult = 1.0
 
+    def update(self, player, walls, dt, projectiles):
         dx = player.x - self.sprite.center_x
         dy = player.y - self.sprite.center_y
 
-        if self.dash_cooldown > 0:
-            self.dash_cooldown -= dt
-
-        if self.arrow_timer > 0:
-            self.arrow_timer -= dt
-
         if self.state == "walk":
             dist = math.hypot(dx, dy)
             if dist > 1:
                 vx = dx / dist * self.speed * (self.slow_mult ** 1.5) * dt
                 vy = dy / dist * self.speed * (self.slow_mult ** 1.5) * dt
 
-                ox = self.sprite.center_x
-                self.sprite.center_x += vx
-                if arcade.check_for_collision_with_list(self.sprite, walls):
-                    self.sprite.center_x = ox
-
-                oy = self.sprite.center_y
-                self.sprite.center_y += vy
-                if arcade.check_for_collision_with_list(self.sprite, walls):
-                    self.sprite.center_y = oy
+                walls.slide(self.sprite, vx, vy)
 
             aligned_x = abs(dx) < 30
             aligned_y = abs(dy) < 30
@@ -201,24 +177,14 @@ class BossFloor2(Enemy):
                 self.dash_cooldown = 5.0
 
         elif self.state == "dash":
-            self.dash_timer -= dt
             vx = self.dash_dir[0] * 400 * (self.slow_mult ** 1.5) * dt
             vy = self.dash_dir[1] * 400 * (self.slow_mult ** 1.5) * dt
 
-            old_x = self.sprite.center_x
-            self.sprite.center_x += vx
-            if arcade.check_for_collision_with_list(self.sprite, walls):
-                self.sprite.center_x = old_x
-                self.state = "walk"
-
-            old_y = self.sprite.center_y
-            self.sprite.center_y += vy
-            if arcade.check_for_collision_with_list(self.sprite, walls):
-                self.sprite.center_y = old_y
+            if walls.slide(self.sprite, vx, vy):
                 self.state = "walk"
 
             if self.arrow_timer <= 0:
-                self.spawn_side_arrows(projectile_list)
+                self.spawn_side_arrows(projectiles)
                 self.arrow_timer = 0.19
 
             if self.dash_timer <= 0:
@@ -229,7 +195,7 @@ class BossFloor2(Enemy):
         else:
             self.sprite.scale_x = -abs(self.sprite.scale_x)
 
-    def spawn_side_arrows(self, projectile_list):
+    def spawn_side_arrows(self, projectiles):
         px, py = self.sprite.center_x, self.sprite.center_y
 
         if self.dash_dir[0] != 0:
@@ -238,23 +204,23 @@ class BossFloor2(Enemy):
             dirs = [(1, 0), (-1, 0)]
 
         for dx, dy in dirs:
-            try:
-                arrow = arcade.Sprite("assets/arrow.png", scale=5)
-            except:
-                arrow = arcade.SpriteSolidColor(10, 10, arcade.color.YELLOW)
-            arrow.center_x = px
-            arrow.center_y = py
-            arrow.change_x = dx * 600
-            arrow.change_y = dy * 600
-            arrow.damage = 20
-            arrow.from_enemy = True
-            projectile_list.append(arrow)
+            projectiles.spawn(px, py, dx * 600, dy * 600, damage=20, from_enemy=True, scale=5)
 
 class BossFloor3(Enemy):
+    steer_batched = False
+    slow_timer = Countdown(on_expire="_end_slow")
+    block_timer = Countdown()
+    sword_timer = Countdown()
+    sword_cd_timer = Countdown()
+    arrow_cd = Countdown()
+    summon_cd = Countdown()
+    dash_cd = Countdown()
+    dash_timer = Countdown()
+
     def __init__(self, x, y):
         super().__init__(x, y)
         try:
-            self.sprite = arcade.Sprite("assets/boss_knight.png", scale=9)
+            self.sprite = make_sprite("assets/boss_knight.png", scale=9)
         except Exception:
             self.sprite = arcade.SpriteSolidColor(80, 80, arcade.color.DARK_BLUE)
 
@@ -298,23 +264,15 @@ class BossFloor3(Enemy):
             return
         self.hp -= dmg
 
+    def _end_slow(self):
+        self.slowed = False
+        self.slow_mult = 1.0
+
     def update_phase(self, player, walls, dt, enemies, enemy_projectiles):
-        if self.slowed:
-            self.slow_timer -= dt
-            if self.slow_timer <= 0:
-                self.slowed = False
-                self.slow_mult = 1.0
-        
         if self.hp <= self.max_hp * 0.5:
             self.phase = 2
 
-        self.arrow_cd -= dt
-        self.summon_cd -= dt
-        self.block_timer -= dt
-        self.dash_cd -= dt
-        self.sword_cd_timer -= dt
-
-        if self.block_timer <= 0 and random.random() < 0.01:
+        if self.block_timer <= 0 and self.rng.random() < 0.01:
             self.blocking = True
             self.block_timer = 1.2
         elif self.block_timer <= 0:
@@ -336,19 +294,9 @@ class BossFloor3(Enemy):
             vx = self.dash_dx * self.dash_speed * self.slow_mult * dt
             vy = self.dash_dy * self.dash_speed * self.slow_mult * dt
 
-            old_x = self.sprite.center_x
-            self.sprite.center_x += vx
-            if arcade.check_for_collision_with_list(self.sprite, walls):
-                self.sprite.center_x = old_x
+            if walls.slide(self.sprite, vx, vy):
                 self.dashing = False
 
-            old_y = self.sprite.center_y
-            self.sprite.center_y += vy
-            if arcade.check_for_collision_with_list(self.sprite, walls):
-                self.sprite.center_y = old_y
-                self.dashing = False
-
-            self.dash_timer -= dt
             if self.dash_timer <= 0:
                 self.dashing = False
 
@@ -361,7 +309,6 @@ class BossFloor3(Enemy):
             self.sword_timer = 0.8
 
         if self.sword_warning:
-            self.sword_timer -= dt
             if self.sword_timer <= 0:
                 self.sword_warning = False
                 self.sword_cd_timer = self.sword_cooldown
@@ -380,24 +327,22 @@ class BossFloor3(Enemy):
                 dx_a = math.cos(angle)
                 dy_a = math.sin(angle)
 
-                try:
-                    arrow = arcade.Sprite("assets/arrow.png", scale=4)
-                except:
-                    arrow = arcade.SpriteSolidColor(10, 10, arcade.color.YELLOW)
-                arrow.center_x = self.x
-                arrow.center_y = self.y
-                arrow.change_x = dx_a * ARROW_SPEED_LOCAL
-                arrow.change_y = dy_a * ARROW_SPEED_LOCAL
-                arrow.angle = math.degrees(math.atan2(dy_a, dx_a))
-                arrow.damage = 10
-                arrow.from_enemy = True
-                enemy_projectiles.append(arrow)
+                enemy_projectiles.spawn(
+                    self.x,
+                    self.y,
+                    dx_a * ARROW_SPEED_LOCAL,
+                    dy_a * ARROW_SPEED_LOCAL,
+                    damage=10,
+                    from_enemy=True,
+                    scale=4,
+                    angle=math.degrees(math.atan2(dy_a, dx_a))
+                )
             self.arrow_cd = self.arrow_interval
 
         if self.summon_cd <= 0:
             for _ in range(2):
-                tx = int(self.x + random.randint(-60, 60))
-                ty = int(self.y + random.randint(-60, 60))
+                tx = int(self.x + self.rng.randint(-60, 60))
+                ty = int(self.y + self.rng.randint(-60, 60))
                 enemies.append(TankEnemy(tx, ty))
             self.summon_cd = 28.0
 
@@ -405,15 +350,7 @@ class BossFloor3(Enemy):
             vx = dx / max(dist, 1) * self.speed * self.slow_mult * dt
             vy = dy / max(dist, 1) * self.speed * self.slow_mult * dt
 
-            old_x = self.sprite.center_x
-            self.sprite.center_x += vx
-            if arcade.check_for_collision_with_list(self.sprite, walls):
-                self.sprite.center_x = old_x
-
-            old_y = self.sprite.center_y
-            self.sprite.center_y += vy
-            if arcade.check_for_collision_with_list(self.sprite, walls):
-                self.sprite.center_y = old_y
+            walls.slide(self.sprite, vx, vy)
 
         if dx > 0:
             self.sprite.scale_x = abs(self.sprite.scale_x)
@@ -0,0 +1,228 @@
+import math
+import numpy as np
+from src.flow_field import FlowField
+from src.settings import SCREEN_WIDTH, SCREEN_HEIGHT, WALL_TILE
+
+
+def sprite_box(sprite):
+    points = sprite.hit_box.get_adjusted_points()
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+# Зазор, который остаётся после касания, чтобы погрешность не давала наложения
+CONTACT_SKIN = 1e-3
+
+
+class CollisionGrid:
+    def __init__(self, width=SCREEN_WIDTH, height=SCREEN_HEIGHT, cell=WALL_TILE):
+        self.cell = cell
+        self.cols = math.ceil(width / cell)
+        self.rows = math.ceil(height / cell)
+        # Клетки, целиком занятые стеной, проверяются за O(1)
+        self.solid = bytearray(self.cols * self.rows)
+        # Препятствия, не совпадающие с сеткой (камни), хранятся по клеткам
+        self.partial = {}
+        self.entries = {}
+        self.solid_view = np.frombuffer(self.solid, dtype=np.uint8).reshape(self.rows, self.cols)
+        self._obstacle_boxes = None
+        self._solid_sums = None
+        # Растёт при каждом изменении стен, по нему перестраиваются производные данные
+        self.version = 0
+        self._flow_field = None
+
+    @classmethod
+    def from_sprites(cls, sprites):
+        grid = cls()
+        for s in sprites:
+            grid.add(s)
+        return grid
+
+    def _cell_range(self, left, bottom, right, top):
+        c0 = max(0, int(left // self.cell))
+        c1 = min(self.cols - 1, math.ceil(right / self.cell) - 1)
+        r0 = max(0, int(bottom // self.cell))
+        r1 = min(self.rows - 1, math.ceil(top / self.cell) - 1)
+        return c0, c1, r0, r1
+
+    def add(self, sprite):
+        box = sprite_box(sprite)
+        left, bottom, right, top = box
+        c0, c1, r0, r1 = self._cell_range(left, bottom, right, top)
+        cells = []
+        for r in range(r0, r1 + 1):
+            for c in range(c0, c1 + 1):
+                cl = c * self.cell
+                cb = r * self.cell
+                if left <= cl and bottom <= cb and right >= cl + self.cell and top >= cb + self.cell:
+                    self.solid[r * self.cols + c] += 1
+                    cells.append((c, r, True))
+                else:
+                    self.partial.setdefault((c, r), []).append((sprite, box))
+                    cells.append((c, r, False))
+        self.entries[sprite] = cells
+        self._obstacle_boxes = None
+        self._solid_sums = None
+        self.version += 1
+
+    def remove(self, sprite):
+        cells = self.entries.pop(sprite, None)
+        if cells is None:
+            return
+        self._obstacle_boxes = None
+        self._solid_sums = None
+        self.version += 1
+        for c, r, is_solid in cells:
+            if is_solid:
+                self.solid[r * self.cols + c] -= 1
+            else:
+                bucket = self.partial[(c, r)]
+                bucket[:] = [entry for entry in bucket if entry[0] is not sprite]
+                if not bucket:
+                    del self.partial[(c, r)]
+
+    def box_blocked(self, left, bottom, right, top):
+        c0, c1, r0, r1 = self._cell_range(left, bottom, right, top)
+        for r in range(r0, r1 + 1):
+            row = r * self.cols
+            for c in range(c0, c1 + 1):
+                if self.solid[row + c]:
+                    return True
+                bucket = self.partial.get((c, r))
+                if bucket:
+                    for _, (l, b, rt, t) in bucket:
+                        if left < rt and right > l and bottom < t and top > b:
+                            return True
+        return False
+
+    def collides(self, sprite):
+        return self.box_blocked(*sprite_box(sprite))
+
+    def _near_boxes(self, left, bottom, right, top):
+        c0, c1, r0, r1 = self._cell_range(left, bottom, right, top)
+        seen = set()
+        for r in range(r0, r1 + 1):
+            row = r * self.cols
+            for c in range(c0, c1 + 1):
+                if self.solid[row + c]:
+                    yield c * self.cell, r * self.cell, (c + 1) * self.cell, (r + 1) * self.cell
+                for sprite, box in self.partial.get((c, r), ()):
+                    if id(sprite) not in seen:
+                        seen.add(id(sprite))
+                        yield box
+
+    def sweep(self, left, bottom, right, top, dx, dy):
+        # Прямоугольник сдвигается на (dx, dy): доля пути до первого касания стены
+        # (1.0 - не упёрся) и нормаль контакта
+        hit_t = 1.0
+        normal = (0, 0)
+        for l, b, r, t in self._near_boxes(min(left, left + dx), min(bottom, bottom + dy),
+                                           max(right, right + dx), max(top, top + dy)):
+            if dx > 0:
+                x_in, x_out = (l - right) / dx, (r - left) / dx
+            elif dx < 0:
+                x_in, x_out = (r - left) / dx, (l - right) / dx
+            elif left < r and right > l:
+                x_in, x_out = -math.inf, math.inf
+            else:
+                continue
+            if dy > 0:
+                y_in, y_out = (b - top) / dy, (t - bottom) / dy
+            elif dy < 0:
+                y_in, y_out = (t - bottom) / dy, (b - top) / dy
+            elif bottom < t and top > b:
+                y_in, y_out = -math.inf, math.inf
+            else:
+                continue
+
+            enter = max(x_in, y_in)
+            leave = min(x_out, y_out)
+            if enter >= leave or leave <= 0 or enter >= hit_t:
+                continue
+            hit_t = max(enter, 0.0)
+            if x_in > y_in:
+                normal = (-1 if dx > 0 else 1, 0)
+            else:
+                normal = (0, -1 if dy > 0 else 1)
+        return hit_t, normal
+
+    def slide(self, sprite, vx, vy):
+        # Движение по осям до касания: на низкой частоте кадров быстрый спрайт
+        # не проскакивает сквозь камень. Возвращает, упёрся ли спрайт
+        left, bottom, right, top = sprite_box(sprite)
+        blocked = False
+        x = sprite.center_x
+        y = sprite.center_y
+
+        if vx:
+            t, _ = self.sweep(left, bottom, right, top, vx, 0)
+            if t < 1.0:
+                blocked = True
+                vx = math.copysign(max(abs(vx) * t - CONTACT_SKIN, 0.0), vx)
+            x += vx
+            left += vx
+            right += vx
+
+        if vy:
+            t, _ = self.sweep(left, bottom, right, top, 0, vy)
+            if t < 1.0:
+                blocked = True
+                vy = math.copysign(max(abs(vy) * t - CONTACT_SKIN, 0.0), vy)
+            y += vy
+
+        sprite.position = (x, y)
+        return blocked
+
+    def flow_field(self):
+        if self._flow_field is None:
+            self._flow_field = FlowField(self)
+        return self._flow_field
+
+    def obstacle_boxes(self):
+        if self._obstacle_boxes is None:
+            boxes = {}
+            for bucket in self.partial.values():
+                for sprite, box in bucket:
+                    boxes[id(sprite)] = box
+            self._obstacle_boxes = np.array(list(boxes.values()), dtype=float).reshape(-1, 4)
+        return self._obstacle_boxes
+
+    def solid_sums(self):
+        if self._solid_sums is None:
+            sums = np.zeros((self.rows + 1, self.cols + 1), dtype=np.int64)
+            sums[1:, 1:] = self.solid_view.astype(np.int64).cumsum(0).cumsum(1)
+            self._solid_sums = sums
+        return self._solid_sums
+
+    def boxes_blocked(self, left, bottom, right, top):
+        # Векторная версия box_blocked для массивов прямоугольников
+        left = np.asarray(left, dtype=float)
+        bottom = np.asarray(bottom, dtype=float)
+        right = np.asarray(right, dtype=float)
+        top = np.asarray(top, dtype=float)
+        blocked = np.zeros(left.shape, dtype=bool)
+        if left.size == 0:
+            return blocked
+
+        # Те же границы, что в _cell_range; пустой диапазон ничего не задевает
+        c0 = np.maximum(np.floor(left / self.cell), 0).astype(int)
+        c1 = np.minimum(np.ceil(right / self.cell) - 1, self.cols - 1).astype(int)
+        r0 = np.maximum(np.floor(bottom / self.cell), 0).astype(int)
+        r1 = np.minimum(np.ceil(top / self.cell) - 1, self.rows - 1).astype(int)
+        nonempty = (c1 >= c0) & (r1 >= r0)
+        c0 = np.minimum(c0, self.cols)
+        r0 = np.minimum(r0, self.rows)
+        c1 = np.maximum(c1 + 1, 0)
+        r1 = np.maximum(r1 + 1, 0)
+        # Число сплошных клеток в прямоугольнике — четыре чтения из префиксных сумм
+        sums = self.solid_sums()
+        count = sums[r1, c1] - sums[r0, c1] - sums[r1, c0] + sums[r0, c0]
+        blocked |= nonempty & (count > 0)
+
+        boxes = self.obstacle_boxes()
+        if len(boxes):
+            hits = ((left[:, None] < boxes[:, 2]) & (right[:, None] > boxes[:, 0]) &
+                    (bottom[:, None] < boxes[:, 3]) & (top[:, None] > boxes[:, 1]))
+            blocked |= hits.any(axis=1)
+        return blocked
@@ -1,11 +1,13 @@
-import random
 from src.settings import *
 from src.room import Room
+from src.rng import FloorRandom, new_seed
 
 
 class Floor:
-    def __init__(self, floor_number=1):
+    def __init__(self, floor_number=1, seed=None):
         self.floor_number = floor_number
+        self.seed = new_seed() if seed is None else seed
+        self.rng = FloorRandom(self.seed, floor_number)
         self.size = BASE_FLOOR_SIZE + (floor_number - 1)
         self.rooms = {}
         self.start_pos = (0, 0)
@@ -21,18 +23,18 @@ class Floor:
             for y in range(self.size):
                 pos = (x, y)
                 if pos == self.start_pos:
-                    r = Room(pos, RoomType.START)
+                    r = Room(pos, RoomType.START, self.rng.layout)
                 elif pos == self.boss_pos:
-                    r = Room(pos, RoomType.BOSS)
+                    r = Room(pos, RoomType.BOSS, self.rng.layout)
                 else:
-                    r = Room(pos, RoomType.NORMAL)
+                    r = Room(pos, RoomType.NORMAL, self.rng.layout)
                 self.rooms[pos] = r
 
         normal_positions = [p for p, r in self.rooms.items() if r.type == RoomType.NORMAL]
         
         if normal_positions:
             # Выбираем комнату для сокровищницы
-            tp = random.choice(normal_positions)
+            tp = self.rng.layout.choice(normal_positions)
             self.rooms[tp].type = RoomType.TREASURE
             self.rooms[tp].treasure_unlocked = False
             self.treasure_pos = tp
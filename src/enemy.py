@@ -1,16 +1,32 @@
 # enemy.py
 import arcade
 import math
-import random
+from src.assets import make_sprite
+from src.rng import get_random
+from src.timers import Countdown, get_clock
 from src.settings import ENEMY_SCALE, ENEMY_HP, ENEMY_SPEED, ARROW_SPEED
 
 
 class Enemy:
+    texture_path = "assets/enemy 2.png"
+    # Пакетное движение: идти к игроку при steer_min < dist < steer_max.
+    # Стрелков в пакет не берём: выстрел зависит от положения и до, и после шага
+    steer_batched = True
+    steer_min = 1
+    steer_max = 360
+    stun_timer = Countdown(on_expire="_end_stun")
+    # Таймеры, которые стоят на месте, пока враг оглушён
+    stun_frozen = ()
+
     def __init__(self, x, y, hp=None, speed=None):
+        self.clock = get_clock()
+        self.rng = get_random().ai
         self.stunned = False
-        self.stun_timer = 0.0
+        self.stunned_at = 0.0
+        # Шаг этого тика уже сделан пакетным проходом, update не нужен
+        self.batch_done = False
         try:
-            self.sprite = arcade.Sprite("assets/enemy 2.png", scale=ENEMY_SCALE)
+            self.sprite = make_sprite(self.texture_path, scale=ENEMY_SCALE)
         except Exception:
             self.sprite = arcade.SpriteSolidColor(28, 28, arcade.color.RED)
         self.sprite.center_x = x
@@ -31,61 +47,76 @@ class Enemy:
     def alive(self):
         return self.hp > 0
 
+    def steers_itself(self, player):
+        return False
+
+    def steered(self, dx, dist):
+        # Остаток update после шага, который сделал пакетный проход
+        if not self.stunned and self.steer_min < dist < self.steer_max:
+            self.face(dx)
+
+    def face(self, dx):
+        if dx > 0:
+            self.sprite.scale_x = abs(self.sprite.scale_x)
+        else:
+            self.sprite.scale_x = -abs(self.sprite.scale_x)
+
+    def chase_direction(self, player, walls, ux, uy):
+        # Поле путей общее для комнаты и обходит камни; без камней идём напрямую
+        way = walls.flow_field().toward(player.x, player.y, self.x, self.y)
+        return way if way is not None else (ux, uy)
+
+    def stun(self, duration):
+        if not self.stunned:
+            self.stunned_at = self.clock.now
+        self.stunned = True
+        self.stun_timer = duration
+
+    def _end_stun(self):
+        self.stunned = False
+        paused = self.clock.now - self.stunned_at
+        for name in self.stun_frozen:
+            getattr(type(self), name).delay(self, paused)
+
+    def move(self, vx, vy, walls):
+        return walls.slide(self.sprite, vx, vy)
+
     def update(self, player, walls, dt):
         if self.stunned:
-            self.stun_timer -= dt
-            if self.stun_timer <= 0:
-                self.stunned = False
             return
         dx = player.x - self.x
         dy = player.y - self.y
         dist = math.hypot(dx, dy)
         if dist < 360 and dist > 1:
-            vx = dx / dist * self.speed * dt
-            vy = dy / dist * self.speed * dt
-
-            old_x = self.sprite.center_x
-            self.sprite.center_x += vx
-            if arcade.check_for_collision_with_list(self.sprite, walls):
-                self.sprite.center_x = old_x
-
-            old_y = self.sprite.center_y
-            self.sprite.center_y += vy
-            if arcade.check_for_collision_with_list(self.sprite, walls):
-                self.sprite.center_y = old_y
-
-            if dx > 0:
-                self.sprite.scale_x = abs(self.sprite.scale_x)
-            else:
-                self.sprite.scale_x = -abs(self.sprite.scale_x)
+            ux, uy = self.chase_direction(player, walls, dx / dist, dy / dist)
+            vx = ux * self.speed * dt
+            vy = uy * self.speed * dt
+            self.move(vx, vy, walls)
+            self.face(dx)
 
 class FastEnemy(Enemy):
+    texture_path = "assets/enemy_fast.png"
+
     def __init__(self, x, y):
         super().__init__(x, y, hp=25, speed=260)
-        try:
-            self.sprite.texture = arcade.load_texture("assets/enemy_fast.png")
-        except:
-            pass
 
 class TankEnemy(Enemy):
+    texture_path = "assets/enemy_tank.png"
+
     def __init__(self, x, y):
         super().__init__(x, y, hp=140, speed=70)
-        try:
-            self.sprite.texture = arcade.load_texture("assets/enemy_tank.png")
-        except:
-            pass
 
 class RangedEnemy(Enemy):
+    texture_path = "assets/enemy_ranged.png"
+    steer_batched = False
+    timer = Countdown()
+
     def __init__(self, x, y):
         super().__init__(x, y, hp=40, speed=80)
-        try:
-            self.sprite.texture = arcade.load_texture("assets/enemy_ranged.png")
-        except:
-            pass
         self.shoot_cd = 1.5
-        self.timer = random.uniform(0.3, 1.2)
+        self.timer = self.rng.uniform(0.3, 1.2)
     
-    def try_shoot(self, player, projectile_list):
+    def try_shoot(self, player, projectiles):
         if self.timer > 0:
             return
 
@@ -98,27 +129,20 @@ class RangedEnemy(Enemy):
         dx /= dist
         dy /= dist
 
-        try:
-            arrow = arcade.Sprite("assets/arrow.png", scale=5)
-        except:
-            arrow = arcade.SpriteSolidColor(10, 10, arcade.color.YELLOW)
-        arrow.center_x = self.x + dx * 36
-        arrow.center_y = self.y + dy * 36
-
-        arrow.change_x = dx * ARROW_SPEED
-        arrow.change_y = dy * ARROW_SPEED
-        arrow.angle = math.degrees(math.atan2(dx, dy))
-
-        arrow.damage = 15
-        arrow.from_enemy = True
-        arrow.time_alive = 0
-
-        projectile_list.append(arrow)
+        projectiles.spawn(
+            self.x + dx * 36,
+            self.y + dy * 36,
+            dx * ARROW_SPEED,
+            dy * ARROW_SPEED,
+            damage=15,
+            from_enemy=True,
+            scale=5,
+            angle=math.degrees(math.atan2(dx, dy))
+        )
         self.timer = self.shoot_cd
 
-    def update(self, player, walls, dt, projectile_list):
-        self.timer -= dt
-        self.try_shoot(player, projectile_list)
+    def update(self, player, walls, dt, projectiles):
+        self.try_shoot(player, projectiles)
 
         dx = player.x - self.x
         dy = player.y - self.y
@@ -128,25 +152,22 @@ class RangedEnemy(Enemy):
             vx = -dx / dist * self.speed * dt
             vy = -dy / dist * self.speed * dt
         elif dist > 360:
-            vx = dx / dist * self.speed * dt
-            vy = dy / dist * self.speed * dt
+            ux, uy = self.chase_direction(player, walls, dx / dist, dy / dist)
+            vx = ux * self.speed * dt
+            vy = uy * self.speed * dt
         else:
             vx = vy = 0
 
-        ox = self.sprite.center_x
-        self.sprite.center_x += vx
-        if arcade.check_for_collision_with_list(self.sprite, walls):
-            self.sprite.center_x = ox
-
-        oy = self.sprite.center_y
-        self.sprite.center_y += vy
-        if arcade.check_for_collision_with_list(self.sprite, walls):
-            self.sprite.center_y = oy
+        self.move(vx, vy, walls)
 
 class EliteRunner(FastEnemy):
+    dash_cd = Countdown()
+    dash_timer = Countdown()
+    stun_frozen = ("dash_cd", "dash_timer")
+
     def __init__(self, x, y):
         super().__init__(x, y)
-        self.dash_cd = random.uniform(1.5, 2.5)
+        self.dash_cd = self.rng.uniform(1.5, 2.5)
         self.dash_timer = 0.0
         self.is_dashing = False
         self.dash_dir = (0, 0)
@@ -155,11 +176,7 @@ class EliteRunner(FastEnemy):
 
     def update(self, player, walls, dt):
         if self.stunned:
-            self.stun_timer -= dt
-            if self.stun_timer <= 0:
-                self.stunned = False
             return
-        self.dash_cd -= dt
 
         dx = player.x - self.x
         dy = player.y - self.y
@@ -168,25 +185,13 @@ class EliteRunner(FastEnemy):
         if not self.is_dashing and self.dash_cd <= 0 and dist > 60:
             self.is_dashing = True
             self.dash_timer = 0.25
-            self.dash_cd = random.uniform(2.0, 3.0)
+            self.dash_cd = self.rng.uniform(2.0, 3.0)
             self.dash_dir = (dx / max(dist, 1), dy / max(dist, 1))
 
         if self.is_dashing:
-            self.dash_timer -= dt
             vx = self.dash_dir[0] * self.dash_speed * dt
             vy = self.dash_dir[1] * self.dash_speed * dt
-
-            ox = self.sprite.center_x
-            oy = self.sprite.center_y
-
-            self.sprite.center_x += vx
-            if arcade.check_for_collision_with_list(self.sprite, walls):
-                self.sprite.center_x = ox
-                self.is_dashing = False
-
-            self.sprite.center_y += vy
-            if arcade.check_for_collision_with_list(self.sprite, walls):
-                self.sprite.center_y = oy
+            if self.move(vx, vy, walls):
                 self.is_dashing = False
 
             if self.dash_timer <= 0:
@@ -196,64 +201,63 @@ class EliteRunner(FastEnemy):
         
         self.sprite.color = arcade.color.PURPLE_HEART
 
+    def steers_itself(self, player):
+        # Рывок быстрый, враг двигает себя сам через walls.slide с поиском касания,
+        # в том числе в тике, когда рывок начинается
+        if self.is_dashing:
+            return True
+        return self.dash_cd <= 0 and math.hypot(player.x - self.x, player.y - self.y) > 60
+
+    def steered(self, dx, dist):
+        if not self.stunned:
+            super().steered(dx, dist)
+            self.sprite.color = arcade.color.PURPLE_HEART
+
 class EliteShooter(Enemy):
+    steer_batched = False
+    timer = Countdown()
+    stun_frozen = ("timer",)
+
     def __init__(self, x, y):
         super().__init__(x, y, hp=55, speed=90)
-        self.shoot_cd = random.uniform(3.0, 4.0)
-        self.timer = random.uniform(1.5, 3)
+        self.shoot_cd = self.rng.uniform(3.0, 4.0)
+        self.timer = self.rng.uniform(1.5, 3)
 
-    def update(self, player, walls, dt, projectile_list):
+    def update(self, player, walls, dt, projectiles):
         if self.stunned:
-            self.stun_timer -= dt
-            if self.stun_timer <= 0:
-                self.stunned = False
             return
-        self.timer -= dt
 
         dx = player.x - self.x
         dy = player.y - self.y
         dist = math.hypot(dx, dy)
 
         if dist > 1:
-            vx = dx / dist * self.speed * dt
-            vy = dy / dist * self.speed * dt
-
-            ox = self.sprite.center_x
-            self.sprite.center_x += vx
-            if arcade.check_for_collision_with_list(self.sprite, walls):
-                self.sprite.center_x = ox
-
-            oy = self.sprite.center_y
-            self.sprite.center_y += vy
-            if arcade.check_for_collision_with_list(self.sprite, walls):
-                self.sprite.center_y = oy
+            ux, uy = self.chase_direction(player, walls, dx / dist, dy / dist)
+            vx = ux * self.speed * dt
+            vy = uy * self.speed * dt
+            self.move(vx, vy, walls)
 
         if self.timer <= 0 and dist < 520:
             dx /= max(dist, 1)
             dy /= max(dist, 1)
 
-            try:
-                arrow = arcade.Sprite("assets/arrow.png", scale=4)
-            except:
-                arrow = arcade.SpriteSolidColor(10, 10, arcade.color.YELLOW)
-            arrow.center_x = self.x
-            arrow.center_y = self.y
-            arrow.change_x = dx * 200
-            arrow.change_y = dy * 200
-            arrow.damage = 12
-            arrow.from_enemy = True
-
-            projectile_list.append(arrow)
+            projectiles.spawn(self.x, self.y, dx * 200, dy * 200, damage=12, from_enemy=True, scale=4)
             self.timer = self.shoot_cd
         
         self.sprite.color = arcade.color.PURPLE_HEART
 
 class EliteTankFloor3(TankEnemy):
+    steer_min = 60
+    steer_max = float("inf")
+    slam_timer = Countdown()
+    warn_timer = Countdown()
+    stun_frozen = ("slam_timer", "warn_timer")
+
     def __init__(self, x, y):
         super().__init__(x, y)
         self.hp = 260
         self.speed = 55
-        self.slam_cd = random.uniform(2.5, 4.0)
+        self.slam_cd = self.rng.uniform(2.5, 4.0)
         self.slam_timer = 0.0
         self.slam_radius = 140
         self.slam_damage = 35
@@ -265,11 +269,7 @@ class EliteTankFloor3(TankEnemy):
 
     def update(self, player, walls, dt):
         if self.stunned:
-            self.stun_timer -= dt
-            if self.stun_timer <= 0:
-                self.stunned = False
             return
-        self.slam_timer -= dt
 
         dx = player.x - self.x
         dy = player.y - self.y
@@ -278,10 +278,9 @@ class EliteTankFloor3(TankEnemy):
         if not self.is_slamming and self.slam_timer <= 0 and dist < 220:
             self.is_slamming = True
             self.warn_timer = self.warn_time
-            self.slam_timer = random.uniform(3.0, 4.5)
+            self.slam_timer = self.rng.uniform(3.0, 4.5)
 
         if self.is_slamming:
-            self.warn_timer -= dt
             if self.warn_timer <= 0:
                 if dist <= self.slam_radius:
                     player.hp -= self.slam_damage
@@ -290,74 +289,63 @@ class EliteTankFloor3(TankEnemy):
             return
 
         if dist > 60:
-            vx = dx / dist * self.speed * dt
-            vy = dy / dist * self.speed * dt
+            ux, uy = self.chase_direction(player, walls, dx / dist, dy / dist)
+            vx = ux * self.speed * dt
+            vy = uy * self.speed * dt
+            self.move(vx, vy, walls)
 
-            ox = self.sprite.center_x
-            self.sprite.center_x += vx
-            if arcade.check_for_collision_with_list(self.sprite, walls):
-                self.sprite.center_x = ox
+        self.face(dx)
+        self.sprite.color = arcade.color.PURPLE_HEART
 
-            oy = self.sprite.center_y
-            self.sprite.center_y += vy
-            if arcade.check_for_collision_with_list(self.sprite, walls):
-                self.sprite.center_y = oy
+    def steers_itself(self, player):
+        # Удар (и тик, когда он начинается) танк ведёт сам и не двигается
+        if self.is_slamming:
+            return True
+        return self.slam_timer <= 0 and math.hypot(player.x - self.x, player.y - self.y) < 220
 
-        if dx > 0:
-            self.sprite.scale_x = abs(self.sprite.scale_x)
-        else:
-            self.sprite.scale_x = -abs(self.sprite.scale_x)
-
-        self.sprite.color = arcade.color.PURPLE_HEART
+    def steered(self, dx, dist):
+        if not self.stunned:
+            self.face(dx)
+            self.sprite.color = arcade.color.PURPLE_HEART
 
 class EliteArcherFloor3(RangedEnemy):
+    volley_timer = Countdown()
+    volley_interval_timer = Countdown()
+    stun_frozen = ("volley_timer", "volley_interval_timer")
+
     def __init__(self, x, y):
         super().__init__(x, y)
-        self.volley_cooldown = random.uniform(3.0, 4.5)
+        self.volley_cooldown = self.rng.uniform(3.0, 4.5)
         self.volley_timer = self.volley_cooldown
         self.in_volley = False
         self.volley_count = 0
-        self.max_volley = random.randint(3, 5)
+        self.max_volley = self.rng.randint(3, 5)
         self.volley_interval = 0.3
         self.volley_interval_timer = 0.0
         self.sprite.color = arcade.color.PURPLE_HEART
 
-    def update(self, player, walls, dt, projectile_list):
+    def update(self, player, walls, dt, projectiles):
         if self.stunned:
-            self.stun_timer -= dt
-            if self.stun_timer <= 0:
-                self.stunned = False
             return
         dx = player.x - self.x
         dy = player.y - self.y
         dist = math.hypot(dx, dy)
 
         if not self.in_volley and dist > 120:
-            vx = dx / max(dist, 1) * self.speed * dt
-            vy = dy / max(dist, 1) * self.speed * dt
-
-            ox = self.sprite.center_x
-            self.sprite.center_x += vx
-            if arcade.check_for_collision_with_list(self.sprite, walls):
-                self.sprite.center_x = ox
-
-            oy = self.sprite.center_y
-            self.sprite.center_y += vy
-            if arcade.check_for_collision_with_list(self.sprite, walls):
-                self.sprite.center_y = oy
-
-        self.volley_timer -= dt
+            ux, uy = self.chase_direction(player, walls, dx / max(dist, 1), dy / max(dist, 1))
+            vx = ux * self.speed * dt
+            vy = uy * self.speed * dt
+            self.move(vx, vy, walls)
 
         if not self.in_volley and self.volley_timer <= 0 and dist < 600:
             self.in_volley = True
             self.volley_count = 0
-            self.max_volley = random.randint(6, 10)
+            self.max_volley = self.rng.randint(6, 10)
             self.volley_interval_timer = 0.0
 
         if self.in_volley:
-            self.volley_interval_timer -= dt
             if self.volley_interval_timer <= 0:
-                self.fire_arrow(player, projectile_list)
+                self.fire_arrow(player, projectiles)
                 self.volley_count += 1
                 self.volley_interval_timer = self.volley_interval
                 if self.volley_count >= self.max_volley:
@@ -369,22 +357,20 @@ class EliteArcherFloor3(RangedEnemy):
         else:
             self.sprite.scale_x = -abs(self.sprite.scale_x)
 
-    def fire_arrow(self, player, projectile_list):
+    def fire_arrow(self, player, projectiles):
         dx = player.x - self.x
         dy = player.y - self.y
         dist = math.hypot(dx, dy)
         dx /= max(dist, 1)
         dy /= max(dist, 1)
 
-        try:
-            arrow = arcade.Sprite("assets/arrow.png", scale=4)
-        except:
-            arrow = arcade.SpriteSolidColor(10, 10, arcade.color.YELLOW)
-        arrow.center_x = self.x
-        arrow.center_y = self.y
-        arrow.change_x = dx * 650
-        arrow.change_y = dy * 650
-        arrow.angle = math.degrees(math.atan2(dy, dx))
-        arrow.damage = 14
-        arrow.from_enemy = True
-        projectile_list.append(arrow)
+        projectiles.spawn(
+            self.x,
+            self.y,
+            dx * 650,
+            dy * 650,
+            damage=14,
+            from_enemy=True,
+            scale=4,
+            angle=math.degrees(math.atan2(dy, dx))
+        )
@@ -0,0 +1,171 @@
+import heapq
+import math
+import numpy as np
+from src.settings import FLOW_FIELD_CELL, FLOW_FIELD_CLEARANCE
+
+
+# Соседи клетки и цена шага: 2 по прямой, 3 по диагонали
+_NEIGHBOURS = [
+    (1, 0, 2), (-1, 0, 2), (0, 1, 2), (0, -1, 2),
+    (1, 1, 3), (1, -1, 3), (-1, 1, 3), (-1, -1, 3)
+]
+_WEIGHTS = [w for _, _, w in _NEIGHBOURS]
+
+
+class FlowField:
+    def __init__(self, walls, cell=FLOW_FIELD_CELL, clearance=FLOW_FIELD_CLEARANCE):
+        self.walls = walls
+        self.cell = cell
+        self.clearance = clearance
+        self.cols = math.ceil(walls.cols * walls.cell / cell)
+        self.rows = math.ceil(walls.rows * walls.cell / cell)
+        self.walls_version = None
+        self.target = None
+        self.open_room = True
+        self.passable = None
+        # Граф проходов между клетками: зависит только от стен, а не от цели
+        self.neighbours = None
+        self.allowed = None
+        self.centres = None
+        # Для каждой клетки - центр клетки, куда идти дальше; nan, если пути нет
+        self.step_x = None
+        self.step_y = None
+        self.steps = None
+
+    def _cell_of(self, x, y):
+        col = min(max(int(x // self.cell), 0), self.cols - 1)
+        row = min(max(int(y // self.cell), 0), self.rows - 1)
+        return col, row
+
+    def _refresh_passable(self):
+        xs = (np.arange(self.cols) + 0.5) * self.cell
+        ys = (np.arange(self.rows) + 0.5) * self.cell
+        cx, cy = np.meshgrid(xs, ys)
+        cx = cx.ravel()
+        cy = cy.ravel()
+        c = self.clearance
+        blocked = self.walls.boxes_blocked(cx - c, cy - c, cx + c, cy + c)
+        self.passable = ~blocked
+        self._link_cells(self.passable)
+        self.centres = list(zip(cx.tolist(), cy.tolist()))
+        # Без камней в комнате обходить нечего, враги идут напрямую
+        self.open_room = len(self.walls.obstacle_boxes()) == 0
+        self.walls_version = self.walls.version
+
+    def _link_cells(self, passable):
+        # Для каждой клетки (и непроходимой: с неё может стартовать поиск) - соседи
+        # и можно ли в них шагнуть. По диагонали нельзя срезать угол камня
+        cols = self.cols
+        rows = self.rows
+        grid = np.pad(passable.reshape(rows, cols), 1, constant_values=False)
+        index = np.arange(rows * cols).reshape(rows, cols)
+        targets = []
+        allowed = []
+        for dc, dr, _ in _NEIGHBOURS:
+            ok = grid[1 + dr:1 + dr + rows, 1 + dc:1 + dc + cols]
+            if dc and dr:
+                ok = ok & grid[1:1 + rows, 1 + dc:1 + dc + cols] & grid[1 + dr:1 + dr + rows, 1:1 + cols]
+            targets.append((index + dr * cols + dc).ravel())
+            allowed.append(ok.ravel())
+        self.neighbours = np.stack(targets, axis=1).tolist()
+        self.allowed = np.stack(allowed, axis=1).tolist()
+
+    def _build(self, col, row):
+        cols = self.cols
+        neighbours = self.neighbours
+        allowed = self.allowed
+        start = row * cols + col
+        cost = [math.inf] * len(neighbours)
+        after = [-1] * len(neighbours)
+        cost[start] = 0
+        after[start] = start
+
+        # Дейкстра от клетки игрока: after[i] - следующая клетка на пути из i к игроку
+        heap = [(0, start)]
+        while heap:
+            d, i = heapq.heappop(heap)
+            if d > cost[i]:
+                continue
+            for j, w, ok in zip(neighbours[i], _WEIGHTS, allowed[i]):
+                if not ok:
+                    continue
+                nd = d + w
+                if nd < cost[j]:
+                    cost[j] = nd
+                    after[j] = i
+                    heapq.heappush(heap, (nd, j))
+
+        # Целимся через клетку: так путь не ломается на каждой клетке
+        after = np.array(after)
+        reached = after >= 0
+        ahead = np.where(reached, after, 0)
+        ahead = np.where(reached, ahead[ahead], -1)
+        ahead[start] = -1
+
+        # Враг может стоять там, где центр его клетки задевает камень:
+        # такие клетки ведут в ближайшую достижимую соседнюю
+        cost = np.array(cost).reshape(self.rows, cols)
+        index = np.arange(len(ahead)).reshape(self.rows, cols)
+        for _ in range(2):
+            padded_cost = np.pad(cost, 1, constant_values=math.inf)
+            padded_index = np.pad(index, 1, constant_values=-1)
+            best = np.full(cost.shape, math.inf)
+            best_index = np.full(cost.shape, -1)
+            for dc, dr, w in _NEIGHBOURS:
+                near = padded_cost[1 + dr:1 + dr + self.rows, 1 + dc:1 + dc + cols] + w
+                better = near < best
+                best = np.where(better, near, best)
+                best_index = np.where(better, padded_index[1 + dr:1 + dr + self.rows, 1 + dc:1 + dc + cols], best_index)
+            fill = np.isinf(cost) & np.isfinite(best)
+            ahead = np.where(fill.ravel(), best_index.ravel(), ahead)
+            cost = np.where(fill, best, cost)
+
+        self.step_x = np.where(ahead >= 0, (ahead % cols + 0.5) * self.cell, np.nan)
+        self.step_y = np.where(ahead >= 0, (ahead // cols + 0.5) * self.cell, np.nan)
+        # Одиночные запросы быстрее читают обычные списки, чем numpy-скаляры
+        centres = self.centres
+        self.steps = [centres[a] if a >= 0 else None for a in ahead.tolist()]
+        self.target = (col, row)
+
+    def _update(self, tx, ty):
+        if self.walls_version != self.walls.version:
+            self._refresh_passable()
+            self.target = None
+        if self.open_room:
+            return
+        target = self._cell_of(tx, ty)
+        if target != self.target:
+            self._build(*target)
+
+    def toward(self, tx, ty, x, y):
+        # Единичный вектор в обход камней или None, если идти можно напрямую
+        self._update(tx, ty)
+        if self.open_room:
+            return None
+        col, row = self._cell_of(x, y)
+        step = self.steps[row * self.cols + col]
+        if step is None:
+            return None
+        dx = step[0] - x
+        dy = step[1] - y
+        # Как в towards: sqrt округляется одинаково в math и numpy, hypot - нет
+        length = math.sqrt(dx * dx + dy * dy)
+        if length < 1e-9:
+            return None
+        return dx / length, dy / length
+
+    def towards(self, tx, ty, xs, ys):
+        # Векторная версия toward: направления и маска тех, кому нужен обход
+        self._update(tx, ty)
+        if self.open_room:
+            zeros = np.zeros(len(xs))
+            return zeros, zeros, np.zeros(len(xs), dtype=bool)
+        cols = np.minimum(np.maximum((xs // self.cell).astype(int), 0), self.cols - 1)
+        rows = np.minimum(np.maximum((ys // self.cell).astype(int), 0), self.rows - 1)
+        i = rows * self.cols + cols
+        dx = self.step_x[i] - xs
+        dy = self.step_y[i] - ys
+        length = np.sqrt(dx * dx + dy * dy)
+        use = ~np.isnan(length) & (length > 1e-9)
+        safe = np.where(use, length, 1.0)
+        return np.where(use, dx / safe, 0.0), np.where(use, dy / safe, 0.0), use
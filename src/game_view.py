@@ -1,9 +1,13 @@
 import arcade
-import random
-from PIL import Image
+import os
 import time
-from src.player import Player
-from src.dungeon import Floor
+from src.simulation import Simulation
+from src.preload import FloorPreloader
+from src.hud import TextCache, LivesRow, OverlayBatch
+from src.assets import get_texture, pixel_matrix_texture
+from src.timestep import FixedTimestep, SpriteInterpolator
+from src.profiler import FrameProfiler
+from src.replay import Recorder, ReplayPlayer
 from src.enemy import *
 from src.boss import *
 from src.settings import *
@@ -14,7 +18,7 @@ class Heart(arcade.Sprite):
     
     def __init__(self, x, y):
         texture = Heart.get_heart_texture()
-        super().__init__(texture=texture)
+        super().__init__(texture)
         self.center_x = x
         self.center_y = y
         self.pickup_type = "heart"
@@ -28,45 +32,12 @@ class Heart(arcade.Sprite):
     
     @staticmethod
     def _create_heart_texture():
-        matrix = HEART_MATRIX
-        width = len(matrix[0]) * PIXEL
-        height = len(matrix) * PIXEL
-        
-        img = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-        pixels = img.load()
-        
-        for r, row in enumerate(matrix):
-            for c, cell in enumerate(row):
-                if cell == "1":
-                    for px in range(PIXEL):
-                        for py in range(PIXEL):
-                            x_pos = c * PIXEL + px
-                            y_pos = height - (r * PIXEL + py) - 1
-                            if 0 <= x_pos < width and 0 <= y_pos < height:
-                                pixels[x_pos, y_pos] = (255, 105, 180, 255)
-        
-        return arcade.Texture.create_filled(
-            f"heart_{width}x{height}",
-            (width, height),
-            color_list=Heart._image_to_color_list(img)
-        )
-    
-    @staticmethod
-    def _image_to_color_list(img):
-        width, height = img.size
-        data = img.load()
-        colors = []
-        
-        for y in range(height):
-            for x in range(width):
-                pixel = data[x, y]
-                colors.append(pixel)
-        
-        return colors
+        return pixel_matrix_texture(HEART_MATRIX, PIXEL, (255, 105, 180))
 
 class StoryView(arcade.View):
     def __init__(self, previous_view):
         super().__init__()
+        self.labels = TextCache()
         self.previous_view = previous_view
         self.button_list = []
         self.hovered_button = None
@@ -160,7 +131,7 @@ class StoryView(arcade.View):
         
         page = self.pages[self.current_page]
         
-        arcade.draw_text(
+        self.labels.draw(
             page["title"], 
             SCREEN_WIDTH // 2, 
             SCREEN_HEIGHT - 70,
@@ -174,7 +145,7 @@ class StoryView(arcade.View):
         
         y_pos = SCREEN_HEIGHT - 140
         for line in page["content"]:
-            arcade.draw_text(
+            self.labels.draw(
                 line,
                 SCREEN_WIDTH // 2,
                 y_pos,
@@ -186,7 +157,7 @@ class StoryView(arcade.View):
             )
             y_pos -= 35
         
-        arcade.draw_text(
+        self.labels.draw(
             f"Страница {self.current_page + 1} из {len(self.pages)}",
             SCREEN_WIDTH // 2,
             150,
@@ -226,7 +197,7 @@ class StoryView(arcade.View):
                 2
             )
             
-            arcade.draw_text(
+            self.labels.draw(
                 button["text"],
                 button["x"] + button["width"] // 2,
                 button["y"] + button["height"] // 2,
@@ -287,9 +258,11 @@ class StoryView(arcade.View):
                 self.current_page += 1
 
 class IntroView(arcade.View):
-    def __init__(self, floor_number):
+    def __init__(self, floor_number, preloader=None):
         super().__init__()
+        self.labels = TextCache()
         self.floor_number = floor_number
+        self.preloader = preloader
         self.button_list = []
         self.hovered_button = None
         self.pressed_button = None
@@ -329,7 +302,7 @@ class IntroView(arcade.View):
         
         y_pos = SCREEN_HEIGHT // 2 + 60
         for i, line in enumerate(intro_text_lines):
-            arcade.draw_text(
+            self.labels.draw(
                 line,
                 SCREEN_WIDTH // 2,
                 y_pos - i * 30,
@@ -370,7 +343,7 @@ class IntroView(arcade.View):
                 2
             )
             
-            arcade.draw_text(
+            self.labels.draw(
                 button["text"],
                 button["x"] + button["width"] // 2,
                 button["y"] + button["height"] // 2,
@@ -407,7 +380,7 @@ class IntroView(arcade.View):
                     
                     if btn["action"] == "continue":
                         game_view = GameView()
-                        game_view.setup(self.floor_number)
+                        game_view.setup(self.floor_number, self.preloader)
                         self.window.show_view(game_view)
                     
                     break
@@ -417,7 +390,7 @@ class IntroView(arcade.View):
     def on_key_press(self, key, modifiers):
         if key == arcade.key.ENTER or key == arcade.key.SPACE:
             game_view = GameView()
-            game_view.setup(self.floor_number)
+            game_view.setup(self.floor_number, self.preloader)
             self.window.show_view(game_view)
         elif key == arcade.key.ESCAPE:
             floor_view = FloorSelectionView()
@@ -425,9 +398,11 @@ class IntroView(arcade.View):
             self.window.show_view(floor_view)
 
 class IntroLevel2View(arcade.View):
-    def __init__(self, floor_number):
+    def __init__(self, floor_number, preloader=None):
         super().__init__()
+        self.labels = TextCache()
         self.floor_number = floor_number
+        self.preloader = preloader
         self.button_list = []
         self.hovered_button = None
         self.pressed_button = None
@@ -484,7 +459,7 @@ class IntroLevel2View(arcade.View):
                 font_size = 20
             
             if line:
-                arcade.draw_text(
+                self.labels.draw(
                     line,
                     SCREEN_WIDTH // 2,
                     y_pos - i * 25,
@@ -525,7 +500,7 @@ class IntroLevel2View(arcade.View):
                 2
             )
             
-            arcade.draw_text(
+            self.labels.draw(
                 button["text"],
                 button["x"] + button["width"] // 2,
                 button["y"] + button["height"] // 2,
@@ -562,7 +537,7 @@ class IntroLevel2View(arcade.View):
                     
                     if btn["action"] == "continue":
                         game_view = GameView()
-                        game_view.setup(self.floor_number)
+                        game_view.setup(self.floor_number, self.preloader)
                         self.window.show_view(game_view)
                     
                     break
@@ -572,7 +547,7 @@ class IntroLevel2View(arcade.View):
     def on_key_press(self, key, modifiers):
         if key == arcade.key.ENTER or key == arcade.key.SPACE:
             game_view = GameView()
-            game_view.setup(self.floor_number)
+            game_view.setup(self.floor_number, self.preloader)
             self.window.show_view(game_view)
         elif key == arcade.key.ESCAPE:
             floor_view = FloorSelectionView()
@@ -580,9 +555,11 @@ class IntroLevel2View(arcade.View):
             self.window.show_view(floor_view)
 
 class IntroLevel3View(arcade.View):
-    def __init__(self, floor_number):
+    def __init__(self, floor_number, preloader=None):
         super().__init__()
+        self.labels = TextCache()
         self.floor_number = floor_number
+        self.preloader = preloader
         self.button_list = []
         self.hovered_button = None
         self.pressed_button = None
@@ -643,7 +620,7 @@ class IntroLevel3View(arcade.View):
                 font_size = 20
             
             if line:
-                arcade.draw_text(
+                self.labels.draw(
                     line,
                     SCREEN_WIDTH // 2,
                     y_pos - i * 25,
@@ -684,7 +661,7 @@ class IntroLevel3View(arcade.View):
                 2
             )
             
-            arcade.draw_text(
+            self.labels.draw(
                 button["text"],
                 button["x"] + button["width"] // 2,
                 button["y"] + button["height"] // 2,
@@ -721,7 +698,7 @@ class IntroLevel3View(arcade.View):
                     
                     if btn["action"] == "continue":
                         game_view = GameView()
-                        game_view.setup(self.floor_number)
+                        game_view.setup(self.floor_number, self.preloader)
                         self.window.show_view(game_view)
                     
                     break
@@ -731,7 +708,7 @@ class IntroLevel3View(arcade.View):
     def on_key_press(self, key, modifiers):
         if key == arcade.key.ENTER or key == arcade.key.SPACE:
             game_view = GameView()
-            game_view.setup(self.floor_number)
+            game_view.setup(self.floor_number, self.preloader)
             self.window.show_view(game_view)
         elif key == arcade.key.ESCAPE:
             floor_view = FloorSelectionView()
@@ -741,6 +718,7 @@ class IntroLevel3View(arcade.View):
 class TutorialView(arcade.View):
     def __init__(self, previous_view):
         super().__init__()
+        self.labels = TextCache()
         self.previous_view = previous_view
         self.button_list = []
         self.hovered_button = None
@@ -770,7 +748,7 @@ class TutorialView(arcade.View):
             (20, 20, 40)
         )
         
-        arcade.draw_text(
+        self.labels.draw(
             "ОБУЧЕНИЕ", 
             SCREEN_WIDTH // 2, 
             SCREEN_HEIGHT - 60,
@@ -818,7 +796,7 @@ class TutorialView(arcade.View):
                 font_size = 18
             
             if line:
-                arcade.draw_text(
+                self.labels.draw(
                     line,
                     SCREEN_WIDTH // 2,
                     y_pos,
@@ -860,7 +838,7 @@ class TutorialView(arcade.View):
                 2
             )
             
-            arcade.draw_text(
+            self.labels.draw(
                 button["text"],
                 button["x"] + button["width"] // 2,
                 button["y"] + button["height"] // 2,
@@ -909,13 +887,14 @@ class TutorialView(arcade.View):
 class MainMenuView(arcade.View):
     def __init__(self):
         super().__init__()
+        self.labels = TextCache()
         self.button_list = []
         self.hovered_button = None
         self.pressed_button = None
         
     def setup(self):
         try:
-            self.background_texture = arcade.load_texture("assets/Main_Background.png")
+            self.background_texture = get_texture("assets/Main_Background.png")
         except:
             self.background_texture = None
         
@@ -995,7 +974,7 @@ class MainMenuView(arcade.View):
                 2
             )
             
-            arcade.draw_text(
+            self.labels.draw(
                 button["text"],
                 button["x"] + button["width"] // 2,
                 button["y"] + button["height"] // 2,
@@ -1043,6 +1022,7 @@ class MainMenuView(arcade.View):
 class FloorSelectionView(arcade.View):
     def __init__(self):
         super().__init__()
+        self.labels = TextCache()
         self.button_list = []
         self.hovered_button = None
         self.pressed_button = None
@@ -1054,12 +1034,13 @@ class FloorSelectionView(arcade.View):
         self.showing_floor_image = False
         self.floor_image_start_time = 0
         self.selected_floor = None
+        self.preloader = None
         self.floor_textures = {}
         
     def setup(self):
         for floor_num, image_name in self.floor_images.items():
             try:
-                texture = arcade.load_texture(f"assets/{image_name}.png")
+                texture = get_texture(f"assets/{image_name}.png")
                 self.floor_textures[floor_num] = texture
             except:
                 self.floor_textures[floor_num] = arcade.Texture.create_empty(
@@ -1155,7 +1136,7 @@ class FloorSelectionView(arcade.View):
             (20, 20, 40)
         )
         
-        arcade.draw_text(
+        self.labels.draw(
             "ВЫБОР ЭТАЖА", 
             SCREEN_WIDTH // 2, 
             SCREEN_HEIGHT - 70,
@@ -1167,7 +1148,7 @@ class FloorSelectionView(arcade.View):
             bold=True
         )
         
-        arcade.draw_text(
+        self.labels.draw(
             "пройденные уровни горят зеленым",
             SCREEN_WIDTH // 2,
             SCREEN_HEIGHT - 110,
@@ -1217,7 +1198,7 @@ class FloorSelectionView(arcade.View):
             )
             
             text_size = 16 if "floor" in button else 14
-            arcade.draw_text(
+            self.labels.draw(
                 button["text"],
                 button["x"] + button["width"] // 2,
                 button["y"] + button["height"] // 2,
@@ -1230,7 +1211,7 @@ class FloorSelectionView(arcade.View):
             )
             
             if button.get("locked", False):
-                arcade.draw_text(
+                self.labels.draw(
                     "🔒",
                     button["x"] + button["width"] - 20,
                     button["y"] + button["height"] // 2,
@@ -1293,7 +1274,7 @@ class FloorSelectionView(arcade.View):
                     3: "ПОДЗЕМЕЛЬЕ"
                 }
                 
-                arcade.draw_text(
+                self.labels.draw(
                     f"ЭТАЖ {self.selected_floor}: {floor_names.get(self.selected_floor, '')}",
                     SCREEN_WIDTH // 2, 
                     SCREEN_HEIGHT - 90,
@@ -1305,7 +1286,7 @@ class FloorSelectionView(arcade.View):
                     bold=True
                 )
                 
-                arcade.draw_text(
+                self.labels.draw(
                     "ЗАГРУЗКА УРОВНЯ...",
                     SCREEN_WIDTH // 2, 
                     70,
@@ -1320,15 +1301,15 @@ class FloorSelectionView(arcade.View):
             else:
                 self.showing_floor_image = False
                 if self.selected_floor == 1:
-                    intro_view = IntroView(self.selected_floor)
+                    intro_view = IntroView(self.selected_floor, self.preloader)
                     intro_view.setup()
                     self.window.show_view(intro_view)
                 elif self.selected_floor == 2:
-                    intro_view = IntroLevel2View(self.selected_floor)
+                    intro_view = IntroLevel2View(self.selected_floor, self.preloader)
                     intro_view.setup()
                     self.window.show_view(intro_view)
                 elif self.selected_floor == 3:
-                    intro_view = IntroLevel3View(self.selected_floor)
+                    intro_view = IntroLevel3View(self.selected_floor, self.preloader)
                     intro_view.setup()
                     self.window.show_view(intro_view)
     
@@ -1382,305 +1363,66 @@ class FloorSelectionView(arcade.View):
                             self.selected_floor = btn["floor"]
                             self.showing_floor_image = True
                             self.floor_image_start_time = time.time()
+                            # Этаж генерируется, пока показывается заставка
+                            self.preloader = FloorPreloader(self.selected_floor)
                     
                     break
         
         self.pressed_button = None
 
 class GameView(arcade.View):
+    records_input = True
+
     def __init__(self):
         super().__init__()
-        self.sword_slashes = []
-        self.keys_held = set()
+        self.labels = TextCache()
         self.background_texture = None
         self.show_tutorial_button = True
-        self.wall_sprites = None
-        self.door_sprites = None
-        self.floor = None
-        self.room_cleared = False
-        self.door_open = False
-        self.projectile_sprites = arcade.SpriteList()
-        self.pickup_sprites = arcade.SpriteList()
-        self.axe_swings = []
-        self.halberd_swings = []
-        self.hammer_swings = []
-        self.notice_text = ""
-        self.notice_timer = 0.0
-        self.lives = 3
-        self.screen_shake = 0
-
-    def try_activate_shield(self):
-        p = self.player
-        if not p.has_shield or not p.shield_ready:
-            return
-        
-        p.parry_active = True
-        p.parry_timer = p.parry_window
-
-        for arrow in self.projectile_sprites[:]:
-            if not getattr(arrow, "from_enemy", False):
-                continue
-
-            dx = arrow.center_x - p.x
-            dy = arrow.center_y - p.y
-            dist = math.hypot(dx, dy)
-
-            if dist <= p.shield_radius:
-                arrow.remove_from_sprite_lists()
-
-        p.shield_ready = False
-        room = self.floor.get_current_room()
-        if room.type == RoomType.BOSS:
-            p.shield_time_cooldown = 7.0
-        else:
-            p.shield_room_cooldown = 2
-
-    def setup(self, floor_number=1):
+        self.sim = Simulation()
+        self.timestep = FixedTimestep()
+        self.interpolator = SpriteInterpolator()
+        self.lives_row = LivesRow(20, SCREEN_HEIGHT - 130)
+        self.overlay = OverlayBatch()
+        self.profiler = FrameProfiler()
+        self.recorder = None
+        self.replay_path = None
+
+    def setup(self, floor_number=1, preloader=None, seed=None):
         self.floor_number = floor_number
-        self.lives = 3
-        self.room_cleared = False
-        self.door_open = False
-        
+
         try:
-            self.background_texture = arcade.load_texture("assets/WallFirst.png")
+            self.background_texture = get_texture("assets/WallFirst.png")
         except:
             self.background_texture = None
-        
-        self.player = Player(SCREEN_WIDTH // 2, 190)
-        self.player_list = arcade.SpriteList()
-        self.player_list.append(self.player.sprite)
-        
-        self.enemy_sprites = arcade.SpriteList()
-        self.wall_sprites = arcade.SpriteList()
-        self.door_sprites = arcade.SpriteList()
-        self.current_enemies = []
-        self.projectile_sprites = arcade.SpriteList()
-        self.pickup_sprites = arcade.SpriteList()
-        
-        self.floor = Floor(floor_number)
-        
-        self.load_current_room()
-    
-    def load_current_room(self):
-        self.enemy_sprites.clear()
-        self.wall_sprites.clear()
-        self.door_sprites.clear()
-        self.pickup_sprites.clear()
-        self.projectile_sprites.clear()
-        self.current_enemies.clear()
-        self.sword_slashes.clear()
-        self.axe_swings.clear()
-        self.halberd_swings.clear()
-        self.hammer_swings.clear()
-        self.room_cleared = False
-        self.notice_text = ""
-        self.notice_timer = 0.0
-
-        room = self.floor.get_current_room()
-        room.add_forbidden_zone(SCREEN_WIDTH // 2, 190, 200)
-
-        for x in range(0, SCREEN_WIDTH, WALL_TILE):
-            rock = arcade.SpriteSolidColor(WALL_TILE, WALL_TILE, arcade.color.DARK_BROWN)
-            rock.is_rock = False
-            rock.is_wall = True
-            rock.center_x = x + WALL_TILE // 2
-            rock.center_y = WALL_TILE // 2
-            self.wall_sprites.append(rock)
-            
-            rock2 = arcade.SpriteSolidColor(WALL_TILE, WALL_TILE, arcade.color.DARK_BROWN)
-            rock2.is_rock = False
-            rock2.is_wall = True
-            rock2.center_x = x + WALL_TILE // 2
-            rock2.center_y = SCREEN_HEIGHT - WALL_TILE // 2
-            self.wall_sprites.append(rock2)
-        
-        for y in range(WALL_TILE, SCREEN_HEIGHT - WALL_TILE, WALL_TILE):
-            rock = arcade.SpriteSolidColor(WALL_TILE, WALL_TILE, arcade.color.DARK_BROWN)
-            rock.is_rock = False
-            rock.is_wall = True
-            rock.center_x = WALL_TILE // 2
-            rock.center_y = y + WALL_TILE // 2
-            self.wall_sprites.append(rock)
-            
-            rock2 = arcade.SpriteSolidColor(WALL_TILE, WALL_TILE, arcade.color.DARK_BROWN)
-            rock2.is_rock = False
-            rock2.is_wall = True
-            rock2.center_x = SCREEN_WIDTH - WALL_TILE // 2
-            rock2.center_y = y + WALL_TILE // 2
-            self.wall_sprites.append(rock2)
-
-        def is_position_allowed(x, y, forbidden):
-            for fx, fy, r in forbidden:
-                if abs(x - fx) < r and abs(y - fy) < r:
-                    return False
-            return True
-
-        attempts = 0
-        spawned = 0
-        if room.type not in (RoomType.BOSS, RoomType.START, RoomType.TREASURE):
-            while spawned < 6 and attempts < 10:
-                attempts += 1
-                x = random.randint(180, SCREEN_WIDTH - 180)
-                y = random.randint(180, SCREEN_HEIGHT - 180)
 
-                if not is_position_allowed(x, y, room.forbidden_zones):
-                    continue
-
-                try:
-                    rock = arcade.Sprite("assets/rock.png", scale=6.0)
-                except:
-                    rock = arcade.SpriteSolidColor(50, 50, arcade.color.BROWN)
-                rock.center_x = x
-                rock.center_y = y
-                rock.is_rock = True        
-                rock.is_wall = False
-                self.wall_sprites.append(rock)
-                spawned += 1
-
-        margin = 80
-
-        def spawn_door(x, y, direction):
+        if preloader is not None and preloader.floor_number == floor_number and seed is None:
             try:
-                d = arcade.Sprite("assets/door.png", scale=6.0)
-            except Exception:
-                d = arcade.SpriteSolidColor(120, 160, arcade.color.DARK_BROWN)
-            d.center_x = x
-            d.center_y = y
-            d.direction = direction
-            self.door_sprites.append(d)
-
-        if room.doors.get("up") is not None:
-            spawn_door(SCREEN_WIDTH // 2, SCREEN_HEIGHT - margin, "up")
-        if room.doors.get("down") is not None:
-            spawn_door(SCREEN_WIDTH // 2, margin, "down")
-        if room.doors.get("left") is not None:
-            spawn_door(margin, SCREEN_HEIGHT // 2, "left")
-        if room.doors.get("right") is not None:
-            spawn_door(SCREEN_WIDTH - margin, SCREEN_HEIGHT // 2, "right")
-
-        if room.type == RoomType.BOSS:
-            bx = SCREEN_WIDTH // 2
-            by = SCREEN_HEIGHT // 2 + 60
-
-            if self.floor_number == 1:
-                boss = Boss(bx, by)
-            elif self.floor_number == 2:
-                boss = BossFloor2(bx, by)
-            elif self.floor_number == 3:
-                boss = BossFloor3(bx, by)
-
-            self.current_enemies.append(boss)
-            self.enemy_sprites.append(boss.sprite)
-        elif room.type not in (RoomType.WEAPON, RoomType.SHIELD):
-            for spawn in room.enemy_spawns:
-                x, y = self.find_free_position()
-                roll = random.random()
-                
-                if self.floor_number == 1:
-                    if roll < 0.5:
-                        e = Enemy(x, y)
-                    elif roll < 0.7:
-                        e = FastEnemy(x, y)
-                    elif roll < 0.9:
-                        e = TankEnemy(x, y)
-                    else:
-                        e = RangedEnemy(x, y)
-                
-                elif self.floor_number == 2:
-                    if roll < 0.35:
-                        e = EliteRunner(x, y)
-                    elif roll < 0.65:
-                        e = EliteShooter(x, y)
-                    elif roll < 0.85:
-                        e = FastEnemy(x, y)
-                    else:
-                        e = Enemy(x, y)
-
-                elif self.floor_number == 3:
-                    if roll < 0.25:
-                        e = EliteTankFloor3(x, y)
-                    elif roll < 0.4:
-                        e = EliteArcherFloor3(x, y)
-                    elif roll < 0.5:
-                        e = TankEnemy(x, y)
-                    elif roll < 0.75:
-                        e = EliteShooter(x, y)
-                    else:
-                        e = FastEnemy(x, y)
-
-                self.current_enemies.append(e)
-                self.enemy_sprites.append(e.sprite)
-
-        if room.type == RoomType.TREASURE and room.treasure_unlocked:
-            ax = arcade.Sprite("assets/axe.png", scale=5)
-            ax.center_x, ax.center_y = self.find_free_position()
-            ax.pickup_type = "axe"
-            self.pickup_sprites.append(ax)
-
-            bw = arcade.Sprite("assets/bow).png", scale=5)
-            bw.center_x, bw.center_y = self.find_free_position()
-            bw.pickup_type = "bow"
-            self.pickup_sprites.append(bw)
-
-            if self.floor_number >= 2:
-                shield = arcade.Sprite("assets/shield.png", scale=5)
-                shield.center_x, shield.center_y = self.find_free_position()
-                shield.pickup_type = "shield"
-                self.pickup_sprites.append(shield)
-
-                halberd = arcade.Sprite("assets/halberd.png", scale=5)
-                halberd.center_x, halberd.center_y = self.find_free_position()
-                halberd.pickup_type = "halberd"
-                self.pickup_sprites.append(halberd)
-
-                if random.random() > 0.8:
-                    hm = arcade.Sprite("assets/hammer.png", scale=5)
-                    hm.center_x, hm.center_y = self.find_free_position()
-                    hm.pickup_type = "hammer"
-                    self.pickup_sprites.append(hm)
-
-        self.room_cleared = len(self.current_enemies) == 0
-        self.player.sprite.center_x = SCREEN_WIDTH // 2
-        self.player.sprite.center_y = 190
-        
-        p = self.player
-        if p.has_shield and not p.shield_ready:
-            p.shield_room_cooldown -= 1
-            if p.shield_room_cooldown <= 0:
-                p.shield_ready = True
-
-    def find_free_position(self, min_x=150, max_x=None, min_y=150, max_y=None, tries=100):
-        if max_x is None:
-            max_x = SCREEN_WIDTH - 150
-        if max_y is None:
-            max_y = SCREEN_HEIGHT - 150
-
-        for _ in range(tries):
-            x = random.randint(min_x, max_x)
-            y = random.randint(min_y, max_y)
-
-            dummy = arcade.SpriteSolidColor(86, 86, arcade.color.RED)
-            dummy.center_x = x
-            dummy.center_y = y
-
-            if not arcade.check_for_collision_with_list(dummy, self.wall_sprites) and \
-               not arcade.check_for_collision_with_list(dummy, self.door_sprites) and \
-               not arcade.check_for_collision_with_list(dummy, self.pickup_sprites):
-                return x, y
-
-        return SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2
+                self.sim = preloader.result()
+            except Exception as e:
+                # Фоновая подготовка упала - собираем этаж здесь же, игра не прерывается
+                print(f"Не удалось подготовить этаж {floor_number} заранее: {e}")
+                self.sim.setup(floor_number, seed)
+        else:
+            self.sim.setup(floor_number, seed)
+        self.sim.profiler = self.profiler
 
-    def _update_doors_state(self):
-        for door in self.door_sprites:
-            door.is_open = self.room_cleared or self.floor.get_current_room().type == RoomType.START
-            if isinstance(door, arcade.SpriteSolidColor):
-                if door.is_open:
-                    door.color = arcade.color.LIGHT_GREEN
-                else:
-                    door.color = arcade.color.DARK_BROWN
+        # Запись ввода воспроизводима только при фиксированном шаге
+        if self.records_input and RECORD_REPLAYS and FIXED_TIMESTEP:
+            self.recorder = Recorder(floor_number, self.sim.floor.seed)
+            self.sim.recorder = self.recorder
+            stamp = time.strftime("%Y%m%d_%H%M%S")
+            self.replay_path = os.path.join(REPLAY_DIR, f"floor{floor_number}_{stamp}_{self.sim.floor.seed}.fcr")
 
     def on_draw(self):
         self.clear()
+        sim = self.sim
+        prof = self.profiler
+        prof.start()
+        if FIXED_TIMESTEP:
+            self.interpolator.apply(sim.interpolated_sprites(), self.timestep.alpha)
+            sim.projectiles.sync_sprites(self.timestep.alpha)
+        else:
+            sim.projectiles.sync_sprites()
         
         if self.background_texture:
             arcade.draw_texture_rect(
@@ -1695,69 +1437,126 @@ class GameView(arcade.View):
         else:
             arcade.draw_lbwh_rectangle_filled(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT, arcade.color.DARK_SLATE_GRAY)
         
-        self.wall_sprites.draw(pixelated=True)
-        self.door_sprites.draw(pixelated=True)
-        self.enemy_sprites.draw(pixelated=True)
-        self.pickup_sprites.draw(pixelated=True)
-        self.projectile_sprites.draw(pixelated=True)
-        self.player_list.draw(pixelated=True)
-        
-        if self.player.has_shield and self.player.shield_ready:
-            arcade.draw_circle_outline(
-                self.player.x,
-                self.player.y,
-                self.player.shield_radius,
+        sim.border_sprites.draw(pixelated=True)
+        sim.wall_sprites.draw(pixelated=True)
+        sim.door_sprites.draw(pixelated=True)
+        sim.enemy_sprites.draw(pixelated=True)
+        sim.pickup_sprites.draw(pixelated=True)
+        sim.projectiles.sprite_list.draw(pixelated=True)
+        sim.player_list.draw(pixelated=True)
+        prof.lap("sprites")
+        
+        # Накладки боя: готовые фигуры из кэша, сдвинутые и повёрнутые на месте
+        overlay = self.overlay
+
+        if sim.player.has_shield and sim.player.shield_ready:
+            overlay.circle_outline(
+                sim.player.x,
+                sim.player.y,
+                sim.player.shield_radius,
                 arcade.color.CYAN,
                 3
             )
         
-        for s in self.sword_slashes:
-            arcade.draw_line(s["x1"], s["y1"], s["x2"], s["y2"], arcade.color.WHITE, s["width"])
+        for s in sim.sword_slashes:
+            overlay.line(s["x1"], s["y1"], s["x2"], s["y2"], arcade.color.WHITE, s["width"])
         
-        for a in self.axe_swings:
-            arcade.draw_circle_outline(a["x"], a["y"], a["radius"], arcade.color.ORANGE, 3)
+        for a in sim.axe_swings:
+            overlay.circle_outline(a["x"], a["y"], a["radius"], arcade.color.ORANGE, 3)
 
-        for h in self.halberd_swings:
-            arcade.draw_arc_outline(
+        for h in sim.halberd_swings:
+            overlay.arc_outline(
                 h["x"],
                 h["y"],
-                h["radius"] * 2,
-                h["radius"] * 2,
+                h["radius"],
                 arcade.color.LIGHT_BLUE,
                 h["angle"] - h["arc"] / 2,
                 h["angle"] + h["arc"] / 2,
                 4
             )
 
-        for h in self.hammer_swings:
+        for h in sim.hammer_swings:
             if h["phase"] == "windup":
-                arcade.draw_circle_outline(
+                overlay.circle_outline(
                     h["x"], h["y"],
                     h["radius"],
                     arcade.color.ORANGE,
                     3
                 )
             else:
-                arcade.draw_circle_filled(
+                overlay.circle_filled(
                     h["x"], h["y"],
                     h["radius"],
                     (*arcade.color.ORANGE[:3], 120)
                 )
 
+        for e in sim.current_enemies:
+            if isinstance(e, BossFloor3) and e.sword_warning:
+                dx = sim.player.x - e.x
+                dy = sim.player.y - e.y
+                angle = math.degrees(math.atan2(dy, dx))
+    
+                overlay.arc_outline(
+                    e.x,
+                    e.y,
+                    e.sword_range,
+                    arcade.color.RED,
+                    angle - 60,
+                    angle + 60,
+                    5
+                )
+        
+        for e in sim.current_enemies:
+            if isinstance(e, EliteTankFloor3) and e.is_slamming:
+                overlay.circle_outline(
+                    e.x,
+                    e.y,
+                    e.slam_radius,
+                    arcade.color.RED,
+                    4
+                )
+        
+            if isinstance(e, EliteArcherFloor3) and e.in_volley:
+                overlay.circle_outline(
+                    e.x,
+                    e.y,
+                    30,
+                    arcade.color.ORANGE,
+                    3       
+                )
+            if getattr(e, "stunned", False):
+                overlay.circle_outline(
+                    e.x,
+                    e.y + 20,
+                    20,
+                arcade.color.YELLOW,
+                    2
+                )
+            if getattr(e, "slowed", False):
+                overlay.circle_outline(
+                    e.x,
+                    e.y,
+                    36,
+                    arcade.color.BLUE,
+                    3
+                )
+
+        prof.lap("shapes")
+
         tutorial_button_x = SCREEN_WIDTH - 80
         tutorial_button_y = SCREEN_HEIGHT - 25
         
         arcade.draw_circle_filled(tutorial_button_x, tutorial_button_y, 16, (87, 76, 41))
         arcade.draw_circle_outline(tutorial_button_x, tutorial_button_y, 16, BUTTON_BORDER, 1)
-        arcade.draw_text("?", tutorial_button_x, tutorial_button_y, 
+        self.labels.draw("?", tutorial_button_x, tutorial_button_y, 
                         TEXT_COLOR, 20, anchor_x="center", anchor_y="center",
                         font_name=("Arial", "arial"), bold=True)
         
-        arcade.draw_text("F1", tutorial_button_x, tutorial_button_y - 30,
+        self.labels.draw("F1", tutorial_button_x, tutorial_button_y - 30,
                         arcade.color.LIGHT_GRAY, 14, anchor_x="center", anchor_y="center",
                         font_name=("Arial", "arial"))
 
-        room = self.floor.get_current_room()
+        room = sim.floor.get_current_room()
         room_type_text = ""
         if room.type == RoomType.START:
             room_type_text = "СТАРТ"
@@ -1772,33 +1571,26 @@ class GameView(arcade.View):
         elif room.type == RoomType.SHIELD:
             room_type_text = "ЩИТОВАЯ"
         else:
-            room_type_text = f"КОМНАТА {self.floor.current_pos[0] + 1}-{self.floor.current_pos[1] + 1}"
+            room_type_text = f"КОМНАТА {sim.floor.current_pos[0] + 1}-{sim.floor.current_pos[1] + 1}"
         
-        arcade.draw_text(f"HP: {int(self.player.hp)}/{self.player.max_hp}", 15, SCREEN_HEIGHT - 30, 
+        self.labels.draw(f"HP: {int(sim.player.hp)}/{sim.player.max_hp}", 15, SCREEN_HEIGHT - 30, 
                        arcade.color.BLACK, 22)
-        arcade.draw_text(f"Keys: {self.player.keys}", 15, SCREEN_HEIGHT - 60,
+        self.labels.draw(f"Keys: {sim.player.keys}", 15, SCREEN_HEIGHT - 60,
                        arcade.color.GOLD, 18)
-        arcade.draw_text(f"Weapon: {self.player.weapon}", 15, SCREEN_HEIGHT - 90,
+        self.labels.draw(f"Weapon: {sim.player.weapon}", 15, SCREEN_HEIGHT - 90,
                        arcade.color.LIGHT_GRAY, 18)
         
-        heart_spacing = 32
-        for i in range(self.lives):
-            matrix_w = len(HEART_MATRIX[0]) * PIXEL
-            matrix_h = len(HEART_MATRIX) * PIXEL
-            x = 20 + matrix_w // 2 + i * heart_spacing
-            y = SCREEN_HEIGHT - 130 - matrix_h // 2
-            top_left_x = x - matrix_w // 2
-            top_left_y = y + matrix_h // 2
-            draw_pixel_matrix(HEART_MATRIX, top_left_x, top_left_y, arcade.color.RED)
-        
-        arcade.draw_text(room_type_text, SCREEN_WIDTH // 2, SCREEN_HEIGHT - 60,
+        self.lives_row.update(sim.lives)
+        self.lives_row.draw()
+        
+        self.labels.draw(room_type_text, SCREEN_WIDTH // 2, SCREEN_HEIGHT - 60,
                        arcade.color.WHITE, 20, anchor_x="center")
         
-        arcade.draw_text(f"Этаж {self.floor_number}", SCREEN_WIDTH // 2, SCREEN_HEIGHT - 30,
+        self.labels.draw(f"Этаж {self.floor_number}", SCREEN_WIDTH // 2, SCREEN_HEIGHT - 30,
                        arcade.color.BLACK, 24, anchor_x="center", bold=True)
 
-        if any(isinstance(e, Boss) for e in self.current_enemies):
-            boss = next(e for e in self.current_enemies if isinstance(e, Boss))
+        if any(isinstance(e, Boss) for e in sim.current_enemies):
+            boss = next(e for e in sim.current_enemies if isinstance(e, Boss))
             bar_w = 450
             x = (SCREEN_WIDTH - bar_w) // 2
             y = SCREEN_HEIGHT - 60
@@ -1806,548 +1598,59 @@ class GameView(arcade.View):
             arcade.draw_lbwh_rectangle_filled(x, y - 7, int(bar_w * ratio), 14, arcade.color.RED)
             arcade.draw_lrbt_rectangle_outline(x, x + bar_w, y - 7, y + 7, arcade.color.WHITE)
             
-            arcade.draw_text(f"Фаза: {boss.phase}", x + bar_w // 2, y - 30,
+            self.labels.draw(f"Фаза: {boss.phase}", x + bar_w // 2, y - 30,
                            arcade.color.YELLOW, 16, anchor_x="center")
         
-        if self.room_cleared and self.floor.get_current_room().type != RoomType.BOSS:
-            arcade.draw_text("E - войти в дверь", SCREEN_WIDTH // 2, 40,
+        if sim.room_cleared and sim.floor.get_current_room().type != RoomType.BOSS:
+            self.labels.draw("E - войти в дверь", SCREEN_WIDTH // 2, 40,
                            arcade.color.LIGHT_GREEN, 18, anchor_x="center")
         
-        for e in self.current_enemies:
-            if isinstance(e, BossFloor3) and e.sword_warning:
-                dx = self.player.x - e.x
-                dy = self.player.y - e.y
-                angle = math.degrees(math.atan2(dy, dx))
-    
-                arcade.draw_arc_outline(
-                    e.x,
-                    e.y,
-                    e.sword_range * 2,
-                    e.sword_range * 2,
-                    arcade.color.RED,
-                    angle - 60,
-                    angle + 60,
-                    5
-                )
-        
-        for e in self.current_enemies:
-            if isinstance(e, EliteTankFloor3) and e.is_slamming:
-                arcade.draw_circle_outline(
-                    e.x,
-                    e.y,
-                    e.slam_radius,
-                    arcade.color.RED,
-                    4
-                )
-        
-            if isinstance(e, EliteArcherFloor3) and e.in_volley:
-                arcade.draw_circle_outline(
-                    e.x,
-                    e.y,
-                    30,
-                    arcade.color.ORANGE,
-                    3       
-                )
-            if getattr(e, "stunned", False):
-                arcade.draw_circle_outline(
-                    e.x,
-                    e.y + 20,
-                    20,
-                arcade.color.YELLOW,
-                    2
-                )
-            if getattr(e, "slowed", False):
-                arcade.draw_circle_outline(
-                    e.x,
-                    e.y,
-                    36,
-                    arcade.color.BLUE,
-                    3
-                )
+        if sim.notice_text:
+            self.labels.draw(sim.notice_text, SCREEN_WIDTH//2 - 200, SCREEN_HEIGHT - 100, arcade.color.YELLOW, 20)
+        prof.lap("hud")
+        prof.draw(sim)
 
-        if self.notice_timer > 0 and self.notice_text:
-            arcade.draw_text(self.notice_text, SCREEN_WIDTH//2 - 200, SCREEN_HEIGHT - 100, arcade.color.YELLOW, 20)
+        self.interpolator.restore()
 
     def on_update(self, dt):
-        if self.player.dash_time > 0:
-            self.player.dash_time -= dt
-            vx = self.player.dash_dx * self.player.dash_speed * dt
-            vy = self.player.dash_dy * self.player.dash_speed * dt
-
-            old_x = self.player.sprite.center_x
-            self.player.sprite.center_x += vx
-            if arcade.check_for_collision_with_list(self.player.sprite, self.wall_sprites):
-                self.player.sprite.center_x = old_x
-
-            old_y = self.player.sprite.center_y
-            self.player.sprite.center_y += vy
-            if arcade.check_for_collision_with_list(self.player.sprite, self.wall_sprites):
-                self.player.sprite.center_y = old_y
-
-        dx = dy = 0
-        if arcade.key.W in self.keys_held:
-            dy += 1
-        if arcade.key.S in self.keys_held:
-            dy -= 1
-        if arcade.key.A in self.keys_held:
-            dx -= 1
-        if arcade.key.D in self.keys_held:
-            dx += 1
-
-        if dx or dy:
-            length = math.hypot(dx, dy)
-            nx = dx / length
-            ny = dy / length
-
-            old_x = self.player.sprite.center_x
-            self.player.sprite.center_x += nx * self.player.speed * dt
-            if arcade.check_for_collision_with_list(self.player.sprite, self.wall_sprites):
-                self.player.sprite.center_x = old_x
-
-            old_y = self.player.sprite.center_y
-            self.player.sprite.center_y += ny * self.player.speed * dt
-            if arcade.check_for_collision_with_list(self.player.sprite, self.wall_sprites):
-                self.player.sprite.center_y = old_y
-
-            if nx > 0:
-                self.player.sprite.scale_x = abs(self.player.sprite.scale_x)
-            elif nx < 0:
-                self.player.sprite.scale_x = -abs(self.player.sprite.scale_x)
-
-        self.player.update(dt, self.keys_held)
-        p = self.player
-        room = self.floor.get_current_room()
-
-        if p.has_shield and not p.shield_ready:
-            if room.type == RoomType.BOSS:
-                p.shield_time_cooldown -= dt
-                if p.shield_time_cooldown <= 0:
-                    p.shield_ready = True
-
-        for e in list(self.current_enemies):
-            if isinstance(e, Boss):
-                e.update_phase(self.player, self.wall_sprites, dt)
-            elif isinstance(e, BossFloor2):
-                e.update(self.player, self.wall_sprites, dt, self.projectile_sprites)
-            elif isinstance(e, BossFloor3):
-                new_enemies = []
-                e.update_phase(
-                    player=self.player,
-                    walls=self.wall_sprites,
-                    dt=dt,
-                    enemies=new_enemies,
-                    enemy_projectiles=self.projectile_sprites
-                )
-                if len(new_enemies) > 0:
-                    for ne in new_enemies:
-                        self.current_enemies.append(ne)
-                        self.enemy_sprites.append(ne.sprite)
-                    new_enemies.clear()
-            elif isinstance(e, (RangedEnemy, EliteShooter, EliteArcherFloor3)):
-                e.update(self.player, self.wall_sprites, dt, self.projectile_sprites)
-            else:
-                e.update(self.player, self.wall_sprites, dt)
-            
-            if abs(e.x - self.player.x) < 28 and abs(e.y - self.player.y) < 28:
-                self.player.hp -= 20 * dt
-
-            if not e.alive:
-                try:
-                    self.current_enemies.remove(e)
-                except ValueError:
-                    pass
-                try:
-                    self.enemy_sprites.remove(e.sprite)
-                except ValueError:
-                    pass
-
-        for proj in list(self.projectile_sprites):
-            proj.center_x += proj.change_x * dt
-            proj.center_y += proj.change_y * dt
-
-            if not getattr(proj, "from_enemy", False):
-                for e in list(self.current_enemies):
-                    if arcade.check_for_collision(proj, e.sprite):
-                        e.hp -= getattr(proj, "damage", 40)
-                        try:
-                            self.projectile_sprites.remove(proj)
-                        except ValueError:
-                            pass
-                        break
-
-            if getattr(proj, "from_enemy", False):
-                if arcade.check_for_collision(proj, self.player.sprite):
-                    if self.player.parry_active:
-                        proj.from_enemy = False
-                        proj.change_x *= -1
-                        proj.change_y *= -1
-                        proj.damage = int(proj.damage * 1.5)
-                        proj.color = arcade.color.CYAN
-                        self.player.parry_active = False
-                        self.player.parry_timer = 0
-                    else:
-                        self.player.hp -= getattr(proj, "damage", 15)
-                        self.projectile_sprites.remove(proj)
-                    continue
-
-            if arcade.check_for_collision_with_list(proj, self.wall_sprites):
-                try:
-                    self.projectile_sprites.remove(proj)
-                except ValueError:
-                    pass
-                continue
-            
-            if proj.center_x < -200 or proj.center_x > SCREEN_WIDTH + 200 or proj.center_y < -200 or proj.center_y > SCREEN_HEIGHT + 200:
-                try:
-                    self.projectile_sprites.remove(proj)
-                except ValueError:
-                    pass
-
-        for s in list(self.sword_slashes):
-            s["time"] -= dt
-            if s["time"] <= 0:
-                self.sword_slashes.remove(s)
-
-        for a in list(self.axe_swings):
-            if a.get("applied", False) is False:
-                for e in list(self.current_enemies):
-                    if distance((e.x, e.y), (a["x"], a["y"])) <= a["radius"]:
-                        e.hp -= a.get("damage", 60)
-                a["applied"] = True
-
-            a["time"] -= dt
-            if a["time"] <= 0:
-                self.axe_swings.remove(a)
-
-        for h in list(self.halberd_swings):
-            if not h["applied"]:
-                for e in self.current_enemies:
-                    dx = e.x - h["x"]
-                    dy = e.y - h["y"]
-                    dist = math.hypot(dx, dy)
-
-                    if dist > h["radius"]:
-                        continue
-
-                    enemy_angle = math.degrees(math.atan2(dx, dy))
-                    delta = (enemy_angle - h["angle"] + 180) % 360 - 180
-
-                    if abs(delta) <= h["arc"] / 2:
-                        e.hp -= h["damage"]
-
-                h["applied"] = True
-
-            h["time"] -= dt
-            if h["time"] <= 0:
-                self.halberd_swings.remove(h)
-
-        for h in list(self.hammer_swings):
-            h["timer"] -= dt
-
-            if h["phase"] == "windup" and h["timer"] <= HAMMER_IMPACT:
-                h["phase"] = "impact"
-
-                for e in self.current_enemies:
-                    if arcade.get_distance_between_sprites(e.sprite, self.player.sprite) <= h["radius"]:
-                        e.hp -= h["damage"]
-                        
-                        if getattr(e, "can_be_stunned", True):                         
-                            e.stunned = True
-                            e.stun_timer = HAMMER_STUN_TIME
-                        else:
-                            e.slowed = True
-                            e.slow_timer = HAMMER_BOSS_SLOW_TIME
-                            e.slow_mult = HAMMER_BOSS_SLOW_MULT
-
-                for obj in self.wall_sprites[:]:
-                    if not getattr(obj, "is_rock", False):
-                        continue
-
-                    if arcade.get_distance_between_sprites(obj, self.player.sprite) <= h["radius"]:
-                        obj.remove_from_sprite_lists()
-            
-            if h["timer"] <= 0:
-                self.hammer_swings.remove(h)
-
-        for p in list(self.pickup_sprites):
-            if arcade.check_for_collision(self.player.sprite, p):
-                ptype = getattr(p, "pickup_type", "key")
-                if ptype == "key":
-                    self.player.keys += 1
-                    self.notice_text = "Picked up a key!"
-                    self.notice_timer = 2.0
-                elif ptype == "axe":
-                    self.player.weapon = "axe"
-                    self.notice_text = "Picked up: Axe"
-                    self.notice_timer = 2.0
-                elif ptype == "bow":
-                    self.player.weapon = "bow"
-                    self.notice_text = "Picked up: Bow"
-                    self.notice_timer = 2.0
-                elif ptype == "shield":
-                    self.player.has_shield = True
-                    self.notice_text = "Picked up: Shield"
-                    self.notice_timer = 2.0
-                elif ptype == "halberd":
-                    self.player.weapon = "halberd"
-                    self.notice_text = "Picked up: Halberd"
-                    self.notice_timer = 2.0
-                elif ptype == "hammer":
-                    self.player.weapon = "hammer"
-                    self.notice_text = "Picked up: Battle Hammer"
-                    self.notice_timer = 2.0
-                elif ptype == "heart":
-                    self.player.max_hp += 20
-                    self.player.hp = min(self.player.max_hp, self.player.hp + 40)
-                    self.notice_text = "Max HP increased!"
-                    self.notice_timer = 2.0
-                
-                try:
-                    self.pickup_sprites.remove(p)
-                except ValueError:
-                    pass
-
-        prev_cleared = self.room_cleared
-        self.room_cleared = len(self.current_enemies) == 0
-        room = self.floor.get_current_room()
-
-        if self.room_cleared and room.type == RoomType.BOSS:
-            completed_levels[self.floor_number] = True
-            
-            self.notice_text = f"УРОВЕНЬ {self.floor_number} ПРОЙДЕН!"
-            self.notice_timer = 3.0
-            
-            if self.floor_number == 3 and all(completed_levels.values()):
-                time.sleep(1.0)
-                good_ending_view = GoodEndingView()
-                good_ending_view.setup()
-                self.window.show_view(good_ending_view)
-            else:
-                if self.notice_timer <= 0:
-                    floor_view = FloorSelectionView()
-                    floor_view.setup()
-                    self.window.show_view(floor_view)
-
-        if self.room_cleared and (not prev_cleared):
-            if room.type not in (RoomType.START, RoomType.BOSS, RoomType.TREASURE, RoomType.WEAPON, RoomType.SHIELD):
-                if random.random() < KEY_DROP_CHANCE:
-                    kx, ky = self.find_free_position()
-                    key_sprite = arcade.Sprite("assets/key.png", scale=5)
-                    key_sprite.center_x = kx
-                    key_sprite.center_y = ky
-                    key_sprite.pickup_type = "key"
-                    self.pickup_sprites.append(key_sprite)
-                    self.notice_text = "A key dropped!"
-                    self.notice_timer = 2.0
-
-        if self.notice_timer > 0:
-            self.notice_timer -= dt
-            if self.notice_timer <= 0:
-                self.notice_text = ""
+        self.profiler.frame()
+        if FIXED_TIMESTEP:
+            for _ in range(self.timestep.advance(dt)):
+                self.interpolator.capture(self.sim.interpolated_sprites())
+                self.sim.update(self.timestep.step)
+                if self.sim.outcome:
+                    break
+        else:
+            self.sim.update(dt)
 
-        if self.player.hp <= 0:
-            self.lives -= 1
-            
-            if self.lives > 0:
-                self.player.hp = self.player.max_hp
-                self.load_current_room()
-            else:
-                bad_ending_view = BadEndingView(self.floor_number)
-                bad_ending_view.setup()
-                self.window.show_view(bad_ending_view)
+        if self.sim.outcome == "good_ending":
+            good_ending_view = GoodEndingView()
+            good_ending_view.setup()
+            self.window.show_view(good_ending_view)
+        elif self.sim.outcome == "floor_select":
+            floor_view = FloorSelectionView()
+            floor_view.setup()
+            self.window.show_view(floor_view)
+        elif self.sim.outcome == "bad_ending":
+            bad_ending_view = BadEndingView(self.floor_number)
+            bad_ending_view.setup()
+            self.window.show_view(bad_ending_view)
 
     def on_key_press(self, key, modifiers):
-        self.keys_held.add(key)
-
-        if key == arcade.key.LSHIFT:
-            if self.player.dash_cooldown <= 0:
-                dx = dy = 0
-                if arcade.key.W in self.keys_held:
-                    dy += 1
-                if arcade.key.S in self.keys_held:
-                    dy -= 1
-                if arcade.key.A in self.keys_held:
-                    dx -= 1
-                if arcade.key.D in self.keys_held:
-                    dx += 1
-
-                if dx != 0 or dy != 0:
-                    length = math.hypot(dx, dy)
-                    self.player.dash_dx = dx / length
-                    self.player.dash_dy = dy / length
-
-                    self.player.dash_time = self.player.dash_duration
-                    self.player.dash_cooldown = self.player.dash_cd_time
-
-        if key == arcade.key.SPACE:
-            self.try_activate_shield()
-
-        if key in (arcade.key.UP, arcade.key.DOWN, arcade.key.LEFT, arcade.key.RIGHT):
-            if self.player.weapon == "axe":
-                if not self.player.can_attack():
-                    return
-                self.player.reset_attack()
-                swing = {"x": self.player.x, "y": self.player.y, "radius": 120, "time": 0.18, "damage": 70, "applied": False}
-                self.axe_swings.append(swing)
-            
-            elif self.player.weapon == "halberd":
-                if not self.player.can_attack():
-                    return
-
-                self.player.attack_cooldown = HALBERD_COOLDOWN
-                self.player.reset_attack()
-
-                if key == arcade.key.UP:
-                    angle = 90
-                elif key == arcade.key.DOWN:
-                    angle = -90
-                elif key == arcade.key.LEFT:
-                    angle = 180
-                else:
-                    angle = 0
-
-                swing = {
-                    "x": self.player.x,
-                    "y": self.player.y,
-                    "angle": angle,
-                    "radius": HALBERD_RADIUS,
-                    "arc": HALBERD_ARC_ANGLE,
-                    "time": HALBERD_TIME,
-                    "damage": HALBERD_DAMAGE,
-                    "applied": False
-                }
-
-                self.halberd_swings.append(swing)
-                return
-            
-            elif self.player.weapon == "hammer":
-                if not self.player.can_attack():
-                    return
-
-                self.player.attack_cooldown = HAMMER_COOLDOWN
-                self.player.reset_attack()
-
-                if key == arcade.key.UP:
-                    angle = 90
-                elif key == arcade.key.DOWN:
-                    angle = -90
-                elif key == arcade.key.LEFT:
-                    angle = 180
-                else:
-                    angle = 0
-
-                swing = {
-                    "x": self.player.x,
-                    "y": self.player.y,
-                    "radius": HAMMER_RADIUS,
-                    "timer": HAMMER_WINDUP + HAMMER_IMPACT,
-                    "phase": "windup",
-                    "damage": HAMMER_DAMAGE,
-                    "applied": False
-                }   
-
-                self.hammer_swings.append(swing)
-                return
-
-            elif self.player.weapon == "bow":
-                if not self.player.can_attack():
-                    return
-                self.player.reset_attack()
-                
-                try:
-                    arrow = arcade.Sprite("assets/arrow.png", scale=5)
-                except:
-                    arrow = arcade.SpriteSolidColor(10, 10, arcade.color.YELLOW)
-
-                arrow.center_x = self.player.x
-                arrow.center_y = self.player.y
-                
-                dx = dy = 0
-                if key == arcade.key.UP:
-                    dy = 1
-                elif key == arcade.key.DOWN:
-                    dy = -1
-                elif key == arcade.key.LEFT:
-                    dx = -1
-                elif key == arcade.key.RIGHT:
-                    dx = 1
-                
-                length = math.hypot(dx, dy)
-                if length == 0:
-                    length = 1
-                dx /= length
-                dy /= length
-                
-                arrow.change_x = dx * ARROW_SPEED
-                arrow.change_y = dy * ARROW_SPEED
-                arrow.angle = math.degrees(math.atan2(dy, dx))
-                arrow.damage = 45
-                self.projectile_sprites.append(arrow)
-            
-            else:
-                if not self.player.can_attack():
-                    return
-                self.player.reset_attack()
-
-                x1 = self.player.x
-                y1 = self.player.y
-                x2 = x1
-                y2 = y1
-                L = SWORD_LENGTH
-                if key == arcade.key.UP:
-                    y2 += L
-                elif key == arcade.key.DOWN:
-                    y2 -= L
-                elif key == arcade.key.LEFT:
-                    x2 -= L
-                elif key == arcade.key.RIGHT:
-                    x2 += L
-
-                self.sword_slashes.append({"x1": x1, "y1": y1, "x2": x2, "y2": y2, "time": SWORD_TIME, "width": SWORD_THICKNESS})
-
-                for e in list(self.current_enemies):
-                    if abs(e.x - x2) < 48 and abs(e.y - y2) < 48:
-                        e.hp -= 40
-
-        if key == arcade.key.E and self.room_cleared:
-            room = self.floor.get_current_room()
-            for door in list(self.door_sprites):
-                if arcade.check_for_collision(self.player.sprite, door):
-                    target = self.floor.get_current_room().doors.get(door.direction)
-                    if not target:
-                        continue
-                    target_room = self.floor.rooms.get(target)
-                    
-                    if target_room and target_room.type == RoomType.TREASURE and (not target_room.treasure_unlocked):
-                        if self.player.keys > 0:
-                            self.player.keys -= 1
-                            target_room.treasure_unlocked = True
-                            self.notice_text = "Unlocked treasure room!"
-                            self.notice_timer = 2.0
-                            if self.floor.move(target):
-                                self.load_current_room()
-                        else:
-                            self.notice_text = "Door is locked. Need a key."
-                            self.notice_timer = 2.0
-                        break
-                    else:
-                        if self.floor.move(target):
-                            self.load_current_room()
-                        break
+        self.sim.key_press(key)
 
         if key == arcade.key.F1:
             tutorial_view = TutorialView(self)
             tutorial_view.setup()
             self.window.show_view(tutorial_view)
 
+        if key == arcade.key.F3:
+            self.profiler.toggle()
+
         if key == arcade.key.ESCAPE:
             floor_view = FloorSelectionView()
             floor_view.setup()
             self.window.show_view(floor_view)
-
-        if key == arcade.key.R:
-            self.floor = Floor(self.floor_number)
-            self.load_current_room()
     
     def on_mouse_press(self, x, y, button, modifiers):
         tutorial_button_x = SCREEN_WIDTH - 80
@@ -2360,11 +1663,74 @@ class GameView(arcade.View):
             self.window.show_view(tutorial_view)
     
     def on_key_release(self, key, modifiers):
-        self.keys_held.discard(key)
+        self.sim.key_release(key)
+
+    def on_hide_view(self):
+        # Сохраняется при каждом уходе с экрана: после обучения запись продолжается в тот же файл
+        if self.recorder is not None:
+            try:
+                self.recorder.save(self.replay_path, self.sim.tick)
+            except OSError as e:
+                print(f"Не удалось сохранить запись {self.replay_path}: {e}")
+
+class ReplayView(GameView):
+    records_input = False
+
+    def __init__(self, replay, speed=1.0):
+        super().__init__()
+        self.replay = replay
+        self.speed = speed
+        self.timestep = FixedTimestep(max_steps=max(MAX_CATCH_UP_STEPS, math.ceil(MAX_CATCH_UP_STEPS * speed)))
+        self.playback = None
+        self.finished = False
+        self.seek_step = 10.0
+
+    def setup(self):
+        super().setup(self.replay.floor_number, seed=self.replay.seed)
+        self.playback = ReplayPlayer(self.replay, self.sim)
+
+    def on_update(self, dt):
+        self.profiler.frame()
+        for _ in range(self.timestep.advance(dt * self.speed)):
+            if self.playback.done:
+                break
+            self.interpolator.capture(self.sim.interpolated_sprites())
+            self.playback.step()
+        if self.playback.done and not self.finished:
+            # Симуляция больше не тикает, поэтому надпись не сотрётся
+            self.finished = True
+            self.sim.show_notice("Запись закончилась. ESC - в меню", 1.0)
+
+    def seek(self, seconds):
+        if self.finished:
+            self.sim.clear_notice()
+            self.finished = False
+        self.playback.seek(round(seconds * self.replay.tick_rate))
+        # Прошлые позиции спрайтов остались до прыжка, интерполировать от них нельзя
+        self.interpolator.capture(self.sim.interpolated_sprites())
+
+    def on_key_press(self, key, modifiers):
+        # Ввод берётся только из записи; стрелки перематывают на seek_step секунд
+        if key == arcade.key.F3:
+            self.profiler.toggle()
+        elif key in (arcade.key.LEFT, arcade.key.RIGHT):
+            step = self.seek_step if key == arcade.key.RIGHT else -self.seek_step
+            self.seek(self.sim.tick / self.replay.tick_rate + step)
+        elif key == arcade.key.ESCAPE:
+            menu_view = MainMenuView()
+            menu_view.setup()
+            self.window.show_view(menu_view)
+
+    def on_key_release(self, key, modifiers):
+        pass
+
+    def on_mouse_press(self, x, y, button, modifiers):
+        pass
 
 class GoodEndingView(arcade.View):
     def __init__(self):
         super().__init__()
+        self.labels = TextCache()
         self.button_list = []
         self.hovered_button = None
         self.pressed_button = None
@@ -2420,7 +1786,7 @@ class GoodEndingView(arcade.View):
                 y_pos -= 40
             
             if line:
-                arcade.draw_text(
+                self.labels.draw(
                     line,
                     SCREEN_WIDTH // 2,
                     y_pos - i * 25,
@@ -2461,7 +1827,7 @@ class GoodEndingView(arcade.View):
                 2
             )
             
-            arcade.draw_text(
+            self.labels.draw(
                 button["text"],
                 button["x"] + button["width"] // 2,
                 button["y"] + button["height"] // 2,
@@ -2497,8 +1863,7 @@ class GoodEndingView(arcade.View):
                     btn == self.pressed_button):
                     
                     if btn["action"] == "back":
-                        global completed_levels
-                        completed_levels = {1: False, 2: False, 3: False}
+                        completed_levels.update({1: False, 2: False, 3: False})
                         menu_view = MainMenuView()
                         menu_view.setup()
                         self.window.show_view(menu_view)
@@ -2509,8 +1874,7 @@ class GoodEndingView(arcade.View):
     
     def on_key_press(self, key, modifiers):
         if key == arcade.key.ENTER or key == arcade.key.SPACE or key == arcade.key.ESCAPE:
-            global completed_levels
-            completed_levels = {1: False, 2: False, 3: False}
+            completed_levels.update({1: False, 2: False, 3: False})
             menu_view = MainMenuView()
             menu_view.setup()
             self.window.show_view(menu_view)
@@ -2518,6 +1882,7 @@ class GoodEndingView(arcade.View):
 class BadEndingView(arcade.View):
     def __init__(self, floor_number):
         super().__init__()
+        self.labels = TextCache()
         self.floor_number = floor_number
         self.button_list = []
         self.hovered_button = None
@@ -2579,7 +1944,7 @@ class BadEndingView(arcade.View):
                 y_pos -= 40
             
             if line:
-                arcade.draw_text(
+                self.labels.draw(
                     line,
                     SCREEN_WIDTH // 2,
                     y_pos - i * 25,
@@ -2620,7 +1985,7 @@ class BadEndingView(arcade.View):
                 2
             )
             
-            arcade.draw_text(
+            self.labels.draw(
                 button["text"],
                 button["x"] + button["width"] // 2,
                 button["y"] + button["height"] // 2,
@@ -2656,8 +2021,7 @@ class BadEndingView(arcade.View):
                     btn == self.pressed_button):
                     
                     if btn["action"] == "back":
-                        global completed_levels
-                        completed_levels = {1: False, 2: False, 3: False}
+                        completed_levels.update({1: False, 2: False, 3: False})
                         menu_view = MainMenuView()
                         menu_view.setup()
                         self.window.show_view(menu_view)
@@ -2668,8 +2032,7 @@ class BadEndingView(arcade.View):
     
     def on_key_press(self, key, modifiers):
         if key == arcade.key.ENTER or key == arcade.key.SPACE or key == arcade.key.ESCAPE:
-            global completed_levels
-            completed_levels = {1: False, 2: False, 3: False}
+            completed_levels.update({1: False, 2: False, 3: False})
             menu_view = MainMenuView()
             menu_view.setup()
             self.window.show_view(menu_view)
@@ -0,0 +1,113 @@
+import math
+import arcade
+from arcade import shape_list
+from src.assets import pixel_matrix_texture
+from src.settings import HEART_MATRIX, PIXEL
+
+
+class TextCache:
+    def __init__(self):
+        self.labels = {}
+
+    def draw(self, text, x, y, color=arcade.color.WHITE, font_size=12.0, **kwargs):
+        # Надпись в одном и том же месте и стиле переиспользуется между кадрами,
+        # вёрстка пересчитывается только когда меняется сам текст
+        key = (x, y, font_size, tuple(sorted(kwargs.items())))
+        entry = self.labels.get(key)
+        if entry is None:
+            label = arcade.Text(str(text), x, y, color, font_size, **kwargs)
+            entry = self.labels[key] = [label, color]
+        else:
+            label = entry[0]
+            label.text = text
+            if entry[1] != color:
+                label.color = color
+                entry[1] = color
+        label.draw()
+        return label
+
+    def clear(self):
+        self.labels.clear()
+
+
+class LivesRow:
+    def __init__(self, left, top, spacing=32, color=arcade.color.RED):
+        self.left = left
+        self.top = top
+        self.spacing = spacing
+        self.texture = pixel_matrix_texture(HEART_MATRIX, PIXEL, color)
+        self.sprites = arcade.SpriteList(lazy=True)
+
+    def update(self, lives):
+        # Спрайты пересоздаются только когда меняется число жизней
+        if len(self.sprites) == lives:
+            return
+        self.sprites.clear()
+        w, h = self.texture.size
+        for i in range(lives):
+            heart = arcade.Sprite(self.texture)
+            heart.center_x = self.left + w // 2 + i * self.spacing
+            heart.center_y = self.top - h // 2
+            self.sprites.append(heart)
+
+    def draw(self):
+        self.sprites.draw(pixelated=True)
+
+
+class OverlayBatch:
+    def __init__(self, segments=48):
+        self.segments = segments
+        # Фигура строится один раз в начале координат и кэшируется по форме и цвету.
+        # Радиусы у накладок постоянные, меняются только положение и поворот,
+        # а их задают списку фигур при отрисовке, ничего не пересобирая
+        self.templates = {}
+
+    def _template(self, key, build):
+        shapes = self.templates.get(key)
+        if shapes is None:
+            # Список создаётся лениво: ему нужен контекст окна
+            shapes = self.templates[key] = shape_list.ShapeElementList()
+            shapes.append(build())
+        return shapes
+
+    def _draw(self, shapes, x, y, angle=0.0):
+        shapes.position = (x, y)
+        # angle у списка фигур - по часовой стрелке
+        shapes.angle = -angle
+        shapes.draw()
+
+    def line(self, x1, y1, x2, y2, color, width=1):
+        # Удар мечом каждый кадр другой длины и направления - рисуется сразу
+        arcade.draw_line(x1, y1, x2, y2, color, width)
+
+    def circle_outline(self, x, y, radius, color, width=1):
+        key = ("ring", radius, tuple(color), width, 360.0)
+        self._draw(self._template(key, lambda: self._ring(radius, color, width, 360.0)), x, y)
+
+    def circle_filled(self, x, y, radius, color):
+        key = ("disc", radius, tuple(color))
+        shapes = self._template(key, lambda: shape_list.create_ellipse_filled(
+            0, 0, radius * 2, radius * 2, color, num_segments=self.segments))
+        self._draw(shapes, x, y)
+
+    def arc_outline(self, x, y, radius, color, start, end, width=1):
+        # Как arcade.draw_arc_outline: дуга вдвое тоньше border_width.
+        # Шаблон симметричен относительно оси x и поворачивается к середине дуги
+        span = end - start
+        key = ("ring", radius, tuple(color), width / 2, span)
+        shapes = self._template(key, lambda: self._ring(radius, color, width / 2, span))
+        self._draw(shapes, x, y, (start + end) / 2)
+
+    def _ring(self, radius, color, width, span):
+        # Кольцо или дуга толщиной width как одна полоса треугольников
+        inner = radius - width / 2
+        outer = radius + width / 2
+        steps = max(2, int(self.segments * span / 360))
+        points = []
+        for i in range(steps + 1):
+            theta = math.radians(-span / 2 + span * i / steps)
+            c = math.cos(theta)
+            s = math.sin(theta)
+            points.append((inner * c, inner * s))
+            points.append((outer * c, outer * s))
+        return shape_list.create_triangles_strip_filled_with_colors(points, [color] * len(points))
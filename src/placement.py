@@ -0,0 +1,91 @@
+import math
+import random
+import numpy as np
+from src.collision import sprite_box
+from src.settings import SCREEN_WIDTH, SCREEN_HEIGHT
+
+
+class NoFreeSpaceError(RuntimeError):
+    pass
+
+
+class FreeSpaceSampler:
+    def __init__(self, min_x=150, max_x=None, min_y=150, max_y=None, size=86, step=8):
+        if max_x is None:
+            max_x = SCREEN_WIDTH - 150
+        if max_y is None:
+            max_y = SCREEN_HEIGHT - 150
+
+        # Центры-кандидаты на сетке с шагом step; free[j, i] - можно ли поставить объект
+        self.min_x = min_x
+        self.min_y = min_y
+        self.step = step
+        self.half = size / 2
+        cols = (max_x - min_x) // step + 1
+        rows = (max_y - min_y) // step + 1
+        self.free = np.ones((rows, cols), dtype=bool)
+
+    @classmethod
+    def for_room(cls, grid, *sprite_lists, **kwargs):
+        sampler = cls(**kwargs)
+        # Стены берём из готовой сетки коллизий, остальное по хитбоксам
+        rows, cols = np.nonzero(grid.solid_view)
+        cells = np.stack([cols, rows, cols + 1, rows + 1], axis=1) * grid.cell
+        for box in sampler.reachable(np.concatenate([cells, grid.obstacle_boxes()])).tolist():
+            sampler.block(*box)
+        for sprites in sprite_lists:
+            for s in sprites:
+                sampler.block(*sprite_box(s))
+        return sampler
+
+    def _span(self, low, high, origin, size):
+        # Индексы кандидатов c, для которых low < origin + c * step < high
+        first = max(0, math.floor((low - origin) / self.step) + 1)
+        last = min(size, math.ceil((high - origin) / self.step))
+        return first, last
+
+    def reachable(self, boxes):
+        # Большинство стен по краям комнаты не задевает ни одного кандидата
+        rows, cols = self.free.shape
+        h = self.half
+        max_x = self.min_x + (cols - 1) * self.step
+        max_y = self.min_y + (rows - 1) * self.step
+        near = ((boxes[:, 2] > self.min_x - h) & (boxes[:, 0] < max_x + h) &
+                (boxes[:, 3] > self.min_y - h) & (boxes[:, 1] < max_y + h))
+        return boxes[near]
+
+    def block(self, left, bottom, right, top):
+        rows, cols = self.free.shape
+        h = self.half
+        i0, i1 = self._span(left - h, right + h, self.min_x, cols)
+        j0, j1 = self._span(bottom - h, top + h, self.min_y, rows)
+        if i0 < i1 and j0 < j1:
+            self.free[j0:j1, i0:i1] = False
+
+    def available(self):
+        return int(np.count_nonzero(self.free))
+
+    def take(self, spacing=0, rng=random):
+        slots = np.flatnonzero(self.free)
+        if len(slots) == 0:
+            raise NoFreeSpaceError("в комнате не осталось свободного места")
+        return self._claim(int(slots[rng.randrange(len(slots))]), spacing)
+
+    def nearest(self, x, y, spacing=0):
+        # Свободное место, ближайшее к точке; случайные потоки не трогает
+        slots = np.flatnonzero(self.free)
+        if len(slots) == 0:
+            raise NoFreeSpaceError("в комнате не осталось свободного места")
+        j, i = np.divmod(slots, self.free.shape[1])
+        d2 = (self.min_x + i * self.step - x) ** 2 + (self.min_y + j * self.step - y) ** 2
+        return self._claim(int(slots[np.argmin(d2)]), spacing)
+
+    def _claim(self, slot, spacing):
+        j, i = divmod(slot, self.free.shape[1])
+        x = self.min_x + i * self.step
+        y = self.min_y + j * self.step
+
+        # Занятое место (плюс отступ) больше не выдаётся
+        r = self.half + spacing
+        self.block(x - r, y - r, x + r, y + r)
+        return x, y
@@ -1,9 +1,19 @@
 import arcade
+from src.assets import make_sprite
+from src.timers import Countdown, get_clock
 from src.settings import PLAYER_HP, PLAYER_SCALE, PLAYER_SPEED
 
 
 class Player:
+    attack_timer = Countdown()
+    dash_cooldown = Countdown()
+    dash_time = Countdown()
+    slow_timer = Countdown()
+    burn_timer = Countdown(on_expire="_end_burn")
+    parry_timer = Countdown(on_expire="_end_parry")
+
     def __init__(self, x, y):
+        self.clock = get_clock()
         self.burn_timer = 0.0
         self.burn_dps = 0.0
         self.slow_timer = 0.0
@@ -18,7 +28,7 @@ class Player:
         self.shield_radius = 140
 
         try:
-            self.sprite = arcade.Sprite("assets/player.png", scale=PLAYER_SCALE)
+            self.sprite = make_sprite("assets/player.png", scale=PLAYER_SCALE)
         except Exception:
             self.sprite = arcade.SpriteSolidColor(32, 48, arcade.color.BLUE)
         self.sprite.center_x = x
@@ -51,32 +61,21 @@ class Player:
 
     def update(self, dt, keys_held):
         if self.slow_timer > 0:
-            self.slow_timer -= dt
             self.speed = self.base_speed * 0.4
         else:
             self.speed = self.base_speed
 
-        if self.attack_timer > 0:
-            self.attack_timer -= dt
-
-        if self.dash_cooldown > 0:
-            self.dash_cooldown -= dt
-
         if self.burn_timer > 0:
-            self.burn_timer -= dt
             self.hp -= self.burn_dps * dt
-            if self.burn_timer <= 0:
-                self.burn_dps = 0.0
-        
-        if self.burn_timer > 0:
             self.sprite.color = arcade.color.ORANGE
-        elif self.burn_timer == 0:
+        else:
             self.sprite.color = arcade.color.LIGHT_GRAY
 
-        if self.parry_timer > 0:
-            self.parry_timer -= dt
-            if self.parry_timer <= 0:
-                self.parry_active = False
+    def _end_burn(self):
+        self.burn_dps = 0.0
+
+    def _end_parry(self):
+        self.parry_active = False
 
     def can_attack(self):
         return self.attack_timer <= 0
@@ -0,0 +1,374 @@
+import math
+import random
+import arcade
+from collections import deque, namedtuple
+from src.flow_field import FlowField
+from src.settings import *
+
+
+# Решение политики на один тик. move - зажатые направления из DIRECTIONS,
+# attack - направление удара или None; dash, shield и use (дверь) - разовые нажатия
+Action = namedtuple("Action", "move attack dash shield use", defaults=((), None, False, False, False))
+IDLE = Action()
+
+MOVE_KEYS = {"up": arcade.key.W, "down": arcade.key.S, "left": arcade.key.A, "right": arcade.key.D}
+ATTACK_KEYS = {"up": arcade.key.UP, "down": arcade.key.DOWN, "left": arcade.key.LEFT, "right": arcade.key.RIGHT}
+
+
+def apply_action(sim, action):
+    # Движение - зажатые клавиши, разница с прошлым тиком становится нажатиями и отпусканиями.
+    # Остальное срабатывает в момент нажатия, поэтому клавиша тут же отпускается;
+    # рывок идёт после движения, потому что берёт направление из зажатых клавиш
+    held = {MOVE_KEYS[d] for d in action.move}
+    for key in sim.keys_held - held:
+        sim.key_release(key)
+    for key in held - sim.keys_held:
+        sim.key_press(key)
+
+    taps = []
+    if action.attack is not None:
+        taps.append(ATTACK_KEYS[action.attack])
+    if action.dash:
+        taps.append(arcade.key.LSHIFT)
+    if action.shield:
+        taps.append(arcade.key.SPACE)
+    if action.use:
+        taps.append(arcade.key.E)
+    for key in taps:
+        sim.key_press(key)
+        sim.key_release(key)
+
+
+def _move_toward(dx, dy, dead_zone=8, ratio=0.4):
+    # Вектор в набор из одного-двух направлений; по оси с малой долей не идём
+    if abs(dx) < dead_zone and abs(dy) < dead_zone:
+        return ()
+    limit = max(abs(dx), abs(dy)) * ratio
+    move = []
+    if dx > limit:
+        move.append("right")
+    elif dx < -limit:
+        move.append("left")
+    if dy > limit:
+        move.append("up")
+    elif dy < -limit:
+        move.append("down")
+    return tuple(move)
+
+
+def _axis(dx, dy):
+    if abs(dx) >= abs(dy):
+        return "right" if dx > 0 else "left"
+    return "up" if dy > 0 else "down"
+
+
+class Policy:
+    # Управление игроком без клавиатуры: act() вызывается перед каждым тиком
+    # и возвращает Action. Сид нужен политикам со своей случайностью
+    def __init__(self, seed=None):
+        pass
+
+    def act(self, sim):
+        return IDLE
+
+
+class RandomPolicy(Policy):
+    # Раз в полсекунды выбирает новое направление и бьёт в случайную сторону.
+    # Свой генератор, чтобы не сдвигать потоки симуляции
+    def __init__(self, seed=None):
+        self.rng = random.Random(f"{seed}:policy")
+        self.move = ()
+        self.next_change = 0
+
+    def act(self, sim):
+        if sim.tick < self.next_change:
+            return Action(self.move)
+        self.next_change = sim.tick + TICK_RATE // 2
+        self.move = tuple(d for d in DIRECTIONS if self.rng.random() < 0.35)
+        attack = self.rng.choice(list(DIRECTIONS)) if self.rng.random() < 0.5 else None
+        return Action(self.move, attack)
+
+
+class BotPolicy(Policy):
+    # Простой бот: бьёт ближайшего врага с удобной для оружия дистанции,
+    # после зачистки собирает ключи и полезные предметы и идёт по дверям этажа
+    # к сокровищнице (если есть ключ) и дальше к боссу.
+    # Путь по этажу считается заново только при смене комнаты. По комнате бот идёт
+    # по прямой, а своё поле потока строит, только упёршись в камень
+
+    # Дистанция, на которой держаться от врага
+    STANDOFF = {"sword": SWORD_LENGTH, "axe": 80, "halberd": HALBERD_RADIUS * 0.7, "hammer": 90, "bow": 300}
+    # Какое оружие подбирать вместо текущего
+    WEAPON_RANK = {"bow": 0, "sword": 1, "hammer": 2, "halberd": 3, "axe": 4}
+    # Точка перед дверью: дальше от стены, чем проходит поле потока, но в зоне без камней
+    DOOR_SPOTS = {
+        "up": (SCREEN_WIDTH // 2, SCREEN_HEIGHT - 150),
+        "down": (SCREEN_WIDTH // 2, 150),
+        "left": (150, SCREEN_HEIGHT // 2),
+        "right": (SCREEN_WIDTH - 150, SCREEN_HEIGHT // 2),
+    }
+    MARGIN = 130
+    # Игрок крупнее врагов, поле потока строится под его половину ширины
+    CLEARANCE = 58
+    DETOUR_TICKS = 2 * TICK_RATE
+    RETARGET = 96
+    STUCK_TICKS = 2 * TICK_RATE
+    NUDGES = [(0, 0)] + [(dx * r, dy * r) for r in (48, 96, 144)
+                         for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (-1, 1), (1, -1), (-1, -1))]
+    WANDER = (("up", "left"), ("down", "right"), ("up", "right"), ("down", "left"))
+    # Столько секунд после зачистки бот пробует дойти до предмета или двери. Камни
+    # расставлены под размер врагов, и крупный игрок иногда не пролезает к двери:
+    # тогда она считается закрытой и путь по этажу ищется в обход
+    GIVE_UP = 6.0
+
+    def __init__(self, seed=None):
+        self.walls = None
+        self.field = None
+        self.plan_pos = None
+        self.plan_door = None
+        self.looted = False
+        self.room_pos = None
+        self.cleared_at = 0
+        self.blocked = set()
+        self.wander_index = 0
+
+    def _toward(self, sim, tx, ty, fallback=None):
+        walls = sim.wall_grid
+        p = sim.player
+        px = p.x
+        py = p.y
+        if walls is not self.walls:
+            self.walls = walls
+            self.field = FlowField(walls, clearance=self.CLEARANCE)
+            self.raw_target = (math.inf, math.inf)
+            self.field_target = None
+            self.detour_until = 0
+            self.last = None
+            self.anchor = (sim.tick, px, py)
+            self.wander_until = 0
+        # Шли, но не сдвинулись - упёрлись в камень. Тогда какое-то время идём по полю
+        # потока, иначе бот топчется у края камня, переключаясь между прямой и обходом.
+        # Пока путь по прямой свободен, поле не нужно и не перестраивается
+        # за каждым шагом бегущего врага
+        last = self.last
+        if last is not None and last[0] == sim.tick - 1 and abs(px - last[1]) + abs(py - last[2]) < 1.0:
+            self.detour_until = sim.tick + self.DETOUR_TICKS
+        move = _move_toward(tx - px, ty - py)
+        self.last = (sim.tick, px, py) if move else None
+
+        # Поле строится по центрам клеток и в тесных местах между камнями может водить
+        # туда-обратно на месте. Если за пару секунд бот почти не сдвинулся,
+        # он на секунду уходит в сторону, каждый раз в следующую
+        tick, ax, ay = self.anchor
+        if sim.tick - tick >= self.STUCK_TICKS:
+            if move and abs(px - ax) + abs(py - ay) < 24:
+                self.wander_until = sim.tick + TICK_RATE
+                self.wander = self.WANDER[self.wander_index % len(self.WANDER)]
+                self.wander_index += 1
+            self.anchor = (sim.tick, px, py)
+        if sim.tick < self.wander_until:
+            return self.wander
+
+        if not move or sim.tick >= self.detour_until:
+            return move
+
+        # Поле перестраивается при смене клетки цели, а это несколько миллисекунд:
+        # за бегущим врагом оно строится заново, только когда тот ушёл далеко
+        rx, ry = self.raw_target
+        if (tx - rx) ** 2 + (ty - ry) ** 2 > self.RETARGET ** 2:
+            self.raw_target = (tx, ty)
+            self.field_target = self._free_spot(walls, tx, ty, fallback)
+        tx, ty = self.field_target
+        way = self.field.toward(tx, ty, px, py)
+        if way is None:
+            return move
+        # По полю идём и по малой оси: игрок шире прохода между камнями почти впритык,
+        # и смещение от центра клетки в несколько пикселей уже упирает его в камень
+        return _move_toward(way[0], way[1], dead_zone=0, ratio=0.05)
+
+    def _free_spot(self, walls, x, y, fallback):
+        # Точка в камнях - идём к запасной цели, поле обведёт вокруг. Поле от клетки,
+        # где игрок не помещается, никуда не ведёт, поэтому цель сдвигается на свободное место
+        c = self.CLEARANCE
+        if fallback is not None and walls.box_blocked(x - c, y - c, x + c, y + c):
+            x, y = fallback
+        for ox, oy in self.NUDGES:
+            if not walls.box_blocked(x + ox - c, y + oy - c, x + ox + c, y + oy + c):
+                return x + ox, y + oy
+        return x, y
+
+    def _can_hit(self, weapon, dx, dy, dist):
+        if weapon == "axe":
+            return dist <= 115
+        if weapon == "hammer":
+            return dist <= HAMMER_RADIUS - 20
+        direction = _axis(dx, dy)
+        along = abs(dx) if direction in ("left", "right") else abs(dy)
+        across = abs(dy) if direction in ("left", "right") else abs(dx)
+        if weapon == "halberd":
+            return dist <= HALBERD_RADIUS and across <= along * math.tan(math.radians(HALBERD_ARC_ANGLE / 2))
+        if weapon == "bow":
+            return across <= 24
+        return SWORD_LENGTH - 44 <= along <= SWORD_LENGTH + 44 and across <= 44
+
+    def _fight(self, sim):
+        p = sim.player
+        px = p.x
+        py = p.y
+        target = None
+        best = math.inf
+        for e in sim.current_enemies:
+            d2 = (e.x - px) ** 2 + (e.y - py) ** 2
+            if d2 < best:
+                best = d2
+                target = e
+        dx = target.x - px
+        dy = target.y - py
+        dist = math.sqrt(best)
+        weapon = p.weapon
+
+        attack = None
+        if p.attack_timer <= 0 and self._can_hit(weapon, dx, dy, dist):
+            attack = _axis(dx, dy)
+
+        shield = False
+        pool = sim.projectiles
+        if p.has_shield and p.shield_ready and len(pool):
+            shield = len(pool.within_radius(px, py, p.shield_radius * 0.8, from_enemy=True)) >= 2
+
+        # Встать на одной из осей врага на расстоянии удара - на ближайшей,
+        # которая не упирается в стену комнаты
+        standoff = self.STANDOFF.get(weapon, SWORD_LENGTH)
+        ex = target.x
+        ey = target.y
+        low = self.MARGIN
+        spot = None
+        best = math.inf
+        for ux, uy in DIRECTIONS.values():
+            sx = ex + ux * standoff
+            sy = ey + uy * standoff
+            if sx < low or sy < low or sx > SCREEN_WIDTH - low or sy > SCREEN_HEIGHT - low:
+                continue
+            d2 = (sx - px) ** 2 + (sy - py) ** 2
+            if d2 < best:
+                best = d2
+                spot = (sx, sy)
+        if spot is None:
+            spot = (min(max(ex - math.copysign(standoff, dx), low), SCREEN_WIDTH - low),
+                    min(max(ey - math.copysign(standoff, dy), low), SCREEN_HEIGHT - low))
+
+        # Враг вплотную - рывок в сторону от него
+        if dist < 40 and p.dash_cooldown <= 0:
+            return Action(_move_toward(-dx, -dy, dead_zone=0), attack, dash=True, shield=shield)
+        return Action(self._toward(sim, spot[0], spot[1], (ex, ey)), attack, shield=shield)
+
+    def _wanted(self, sim, pickup_type):
+        if pickup_type in ("key", "heart", "shield"):
+            return True
+        rank = self.WEAPON_RANK
+        return rank.get(pickup_type, -1) > rank.get(sim.player.weapon, 0)
+
+    def _goal(self, sim):
+        floor = sim.floor
+        treasure = floor.rooms.get(floor.treasure_pos) if floor.treasure_pos is not None else None
+        if treasure is not None and not self.looted:
+            if treasure.treasure_unlocked or sim.player.keys > 0:
+                return floor.treasure_pos
+        return floor.boss_pos
+
+    def _next_door(self, sim):
+        goal = self._goal(sim)
+        door = self._door_toward(sim.floor, goal)
+        if door is None and goal != sim.floor.boss_pos:
+            door = self._door_toward(sim.floor, sim.floor.boss_pos)
+        return door
+
+    def _door_toward(self, floor, goal):
+        # Поиск в ширину по дверям этажа; запертая сокровищница проходима, только если она цель
+        start = floor.current_pos
+        if start == goal:
+            return None
+        came = {start: None}
+        queue = deque([start])
+        while queue:
+            pos = queue.popleft()
+            if pos == goal:
+                break
+            for direction, nxt in floor.rooms[pos].doors.items():
+                if nxt in came or (pos, direction) in self.blocked:
+                    continue
+                room = floor.rooms[nxt]
+                if room.type == RoomType.TREASURE and not room.treasure_unlocked and nxt != goal:
+                    continue
+                came[nxt] = pos
+                queue.append(nxt)
+        if goal not in came:
+            return None
+        pos = goal
+        while came[pos] != start:
+            pos = came[pos]
+        for direction, nxt in floor.rooms[start].doors.items():
+            if nxt == pos:
+                return direction
+        return None
+
+    def act(self, sim):
+        if sim.current_enemies:
+            # Отсчёт времени на сбор предметов и путь к двери начинается с зачистки
+            self.room_pos = None
+            return self._fight(sim)
+
+        p = sim.player
+        px = p.x
+        py = p.y
+        floor = sim.floor
+        if floor.current_pos != self.room_pos:
+            self.room_pos = floor.current_pos
+            self.cleared_at = sim.tick
+        late = sim.tick - self.cleared_at > self.GIVE_UP * TICK_RATE
+
+        target = None
+        best = math.inf
+        for s in () if late else sim.pickup_sprites:
+            if not self._wanted(sim, getattr(s, "pickup_type", "key")):
+                continue
+            d2 = (s.center_x - px) ** 2 + (s.center_y - py) ** 2
+            if d2 < best:
+                best = d2
+                target = s
+        if target is not None:
+            return Action(self._toward(sim, target.center_x, target.center_y))
+
+        if floor.current_pos == floor.treasure_pos:
+            self.looted = True
+        if not sim.room_cleared:
+            return IDLE
+
+        # Следующая дверь пересчитывается при смене комнаты, после того как подобран ключ
+        # и когда до двери не удалось дойти
+        if late and sim.tick - self.cleared_at > 2 * self.GIVE_UP * TICK_RATE and self.plan_door is not None:
+            self.blocked.add((floor.current_pos, self.plan_door))
+            self.cleared_at = sim.tick - self.GIVE_UP * TICK_RATE
+            self.plan_pos = None
+        state = (floor.current_pos, p.keys, self.looted)
+        if state != self.plan_pos:
+            self.plan_pos = state
+            self.plan_door = self._next_door(sim)
+        if self.plan_door is None:
+            return IDLE
+        # Дойдя до точки перед дверью, упираемся в стену и жмём E, пока не пройдём
+        door = self.plan_door
+        tx, ty = self.DOOR_SPOTS[door]
+        ux, uy = DIRECTIONS[door]
+        ahead = (px - tx) * ux + (py - ty) * uy
+        aside = abs((px - tx) * uy - (py - ty) * ux)
+        if ahead > -16 and aside < 16:
+            return Action((door,), use=True)
+        return Action(self._toward(sim, tx, ty))
+
+
+POLICIES = {
+    "idle": Policy,
+    "random": RandomPolicy,
+    "bot": BotPolicy,
+}
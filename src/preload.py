@@ -0,0 +1,58 @@
+import threading
+from src.assets import get_texture
+from src.simulation import Simulation
+
+
+WARMUP_TEXTURES = [
+    "assets/WallFirst.png",
+    "assets/player.png",
+    "assets/enemy 2.png",
+    "assets/enemy_fast.png",
+    "assets/enemy_tank.png",
+    "assets/enemy_ranged.png",
+    "assets/boss.png",
+    "assets/boss_floor2.png",
+    "assets/boss_knight.png",
+    "assets/rock.png",
+    "assets/door.png",
+    "assets/arrow.png",
+    "assets/key.png",
+    "assets/axe.png",
+    "assets/bow).png",
+    "assets/shield.png",
+    "assets/halberd.png",
+    "assets/hammer.png",
+]
+
+
+class FloorPreloader:
+    def __init__(self, floor_number):
+        self.floor_number = floor_number
+        self.sim = None
+        self.error = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        try:
+            for path in WARMUP_TEXTURES:
+                try:
+                    get_texture(path)
+                except:
+                    pass
+            sim = Simulation()
+            sim.setup(self.floor_number)
+            self.sim = sim
+        except Exception as e:
+            self.error = e
+
+    @property
+    def ready(self):
+        return not self._thread.is_alive()
+
+    def result(self):
+        # Если заставка оказалась короче генерации, дожидаемся потока
+        self._thread.join()
+        if self.error is not None:
+            raise self.error
+        return self.sim
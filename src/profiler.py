@@ -0,0 +1,110 @@
+import time
+from collections import deque
+import arcade
+from src.hud import TextCache
+from src.settings import PROFILER_FRAMES, PROFILER_REFRESH, TICK_RATE
+
+
+UPDATE_PHASES = ("player", "enemies", "projectiles", "swings", "pickups", "room")
+DRAW_PHASES = ("sprites", "shapes", "hud")
+
+
+class FrameProfiler:
+    # Отметки lap() делят кадр на фазы: каждая фаза - время с предыдущей отметки.
+    # Пока оверлей выключен, отметки сразу возвращаются и почти ничего не стоят
+    def __init__(self, frames=PROFILER_FRAMES, refresh=PROFILER_REFRESH):
+        self.enabled = False
+        self.refresh = refresh
+        names = ("frame", "update", "draw", "ticks") + UPDATE_PHASES + DRAW_PHASES
+        self.history = {name: deque(maxlen=frames) for name in names}
+        self.current = dict.fromkeys(names, 0.0)
+        self.frame_start = None
+        self.last = 0.0
+        self.next_refresh = 0.0
+        self.lines = []
+        self.labels = TextCache()
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        for samples in self.history.values():
+            samples.clear()
+        self.current = dict.fromkeys(self.current, 0.0)
+        self.frame_start = None
+        self.lines = []
+
+    def frame(self):
+        # Вызывается в начале каждого on_update и закрывает предыдущий кадр
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self.frame_start is not None:
+            current = self.current
+            current["frame"] = now - self.frame_start
+            current["update"] = sum(current[name] for name in UPDATE_PHASES)
+            current["draw"] = sum(current[name] for name in DRAW_PHASES)
+            for name, value in current.items():
+                self.history[name].append(value)
+                current[name] = 0.0
+        self.frame_start = now
+
+    def start(self):
+        if self.enabled:
+            self.last = time.perf_counter()
+
+    def lap(self, name):
+        if self.enabled:
+            now = time.perf_counter()
+            self.current[name] += now - self.last
+            self.last = now
+
+    def tick(self):
+        if self.enabled:
+            self.current["ticks"] += 1
+
+    def _row(self, title, name):
+        samples = self.history[name]
+        avg = sum(samples) / len(samples) * 1000
+        peak = max(samples) * 1000
+        return f"{title:<13}{avg:7.2f}{peak:8.2f}"
+
+    def _refresh_lines(self, sim):
+        if not self.history["frame"]:
+            self.lines = ["collecting..."]
+            return
+        frames = self.history["frame"]
+        fps = len(frames) / sum(frames) if sum(frames) > 0 else 0.0
+        ticks = sum(self.history["ticks"]) / len(self.history["ticks"])
+        lines = [
+            f"{len(frames)} frames  {fps:5.1f} fps  {ticks:.2f} ticks/frame",
+            f"{'ms':<13}{'avg':>7}{'max':>8}",
+            self._row("frame", "frame"),
+            self._row("update", "update"),
+        ]
+        lines += [self._row("  " + name, name) for name in UPDATE_PHASES]
+        lines.append(self._row("draw", "draw"))
+        lines += [self._row("  " + name, name) for name in DRAW_PHASES]
+        swings = len(sim.sword_slashes) + len(sim.axe_swings) + len(sim.halberd_swings) + len(sim.hammer_swings)
+        lines.append(f"enemies {len(sim.current_enemies)}  projectiles {len(sim.projectiles)}")
+        lines.append(f"swings {swings}  pickups {len(sim.pickup_sprites)}")
+        self.lines = lines
+
+    def draw(self, sim):
+        if not self.enabled:
+            return
+        # Текст пересобирается несколько раз в секунду, а не каждый кадр:
+        # иначе вёрстка надписей сама давала бы заметную долю кадра
+        now = time.perf_counter()
+        if now >= self.next_refresh:
+            self._refresh_lines(sim)
+            self.next_refresh = now + self.refresh
+
+        line_h = 16
+        top = 30 + line_h * len(self.lines)
+        arcade.draw_lbwh_rectangle_filled(10, 20, 330, top - 10, (0, 0, 0, 170))
+        budget = 1.0 / TICK_RATE
+        for i, line in enumerate(self.lines):
+            color = arcade.color.WHITE
+            if i == 2 and self.history["frame"] and max(self.history["frame"]) > budget * 1.5:
+                color = arcade.color.ORANGE
+            self.labels.draw(line, 18, top - line_h * (i + 1), color, 11,
+                             font_name=("Consolas", "Courier New", "monospace"))
@@ -0,0 +1,239 @@
+import math
+import arcade
+import numpy as np
+from src.assets import get_texture
+from src.settings import SCREEN_WIDTH, SCREEN_HEIGHT
+
+
+ARROW_TEXTURE = "assets/arrow.png"
+CULL_MARGIN = 200
+
+
+def _hit_extents(texture, scale, angle):
+    if texture is None:
+        return 5.0, 5.0
+    rad = math.radians(-angle)
+    c = math.cos(rad)
+    s = math.sin(rad)
+    xs = []
+    ys = []
+    for px, py in texture.hit_box_points:
+        px *= scale
+        py *= scale
+        xs.append(px * c - py * s)
+        ys.append(px * s + py * c)
+    return (max(xs) - min(xs)) / 2, (max(ys) - min(ys)) / 2
+
+
+def impact_times(ox, oy, dx, dy, hw, hh, left, bottom, right, top):
+    # Доля шага (0..1), на которой снаряд, летящий из (ox, oy) на (dx, dy), впервые
+    # касается прямоугольника; inf - не касается. Аргументы транслируются как в numpy
+    left = left - hw
+    right = right + hw
+    bottom = bottom - hh
+    top = top + hh
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tx1 = (left - ox) / dx
+        tx2 = (right - ox) / dx
+        ty1 = (bottom - oy) / dy
+        ty2 = (top - oy) / dy
+    inside_x = (ox > left) & (ox < right)
+    inside_y = (oy > bottom) & (oy < top)
+    x_in = np.where(dx == 0, np.where(inside_x, -np.inf, np.inf), np.minimum(tx1, tx2))
+    x_out = np.where(dx == 0, np.where(inside_x, np.inf, -np.inf), np.maximum(tx1, tx2))
+    y_in = np.where(dy == 0, np.where(inside_y, -np.inf, np.inf), np.minimum(ty1, ty2))
+    y_out = np.where(dy == 0, np.where(inside_y, np.inf, -np.inf), np.maximum(ty1, ty2))
+
+    enter = np.maximum(x_in, y_in)
+    leave = np.minimum(x_out, y_out)
+    hit = (enter < leave) & (enter <= 1) & (leave > 0)
+    return np.where(hit, np.maximum(enter, 0.0), np.inf)
+
+
+class ProjectilePool:
+    def __init__(self, capacity=128):
+        self.capacity = 0
+        self.free = []
+        self.x = np.zeros(0)
+        self.y = np.zeros(0)
+        self.prev_x = np.zeros(0)
+        self.prev_y = np.zeros(0)
+        self.vx = np.zeros(0)
+        self.vy = np.zeros(0)
+        self.half_w = np.zeros(0)
+        self.half_h = np.zeros(0)
+        self.age = np.zeros(0)
+        self.damage = np.zeros(0, dtype=np.int64)
+        self.from_enemy = np.zeros(0, dtype=bool)
+        self.reflected = np.zeros(0, dtype=bool)
+        self.active = np.zeros(0, dtype=bool)
+        # Визуальные параметры нужны только при отрисовке
+        self.angle = np.zeros(0)
+        self.scale = np.zeros(0)
+        self.textures = []
+        # Кто выпустил снаряд: тип врага, который обновлялся в момент spawn
+        self.source = None
+        self.sources = []
+        self.generation = np.zeros(0, dtype=np.int64)
+
+        self.sprite_list = arcade.SpriteList(lazy=True)
+        self.sprites = []
+        self.shown = set()
+        self._grow(capacity)
+
+    def _grow(self, capacity):
+        old = self.capacity
+        extra = capacity - old
+        for name in ("x", "y", "prev_x", "prev_y", "vx", "vy", "half_w", "half_h",
+                     "age", "damage", "from_enemy", "reflected", "active",
+                     "angle", "scale", "generation"):
+            arr = getattr(self, name)
+            setattr(self, name, np.concatenate([arr, np.zeros(extra, dtype=arr.dtype)]))
+        self.textures.extend([None] * extra)
+        self.sources.extend([None] * extra)
+        self.sprites.extend([None] * extra)
+        self.free.extend(range(capacity - 1, old - 1, -1))
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.capacity - len(self.free)
+
+    def spawn(self, x, y, vx, vy, damage, from_enemy=False, scale=5, angle=0.0):
+        if not self.free:
+            self._grow(self.capacity * 2)
+        i = self.free.pop()
+
+        try:
+            texture = get_texture(ARROW_TEXTURE)
+        except:
+            texture = None
+        hw, hh = _hit_extents(texture, scale, angle)
+
+        self.x[i] = self.prev_x[i] = x
+        self.y[i] = self.prev_y[i] = y
+        self.vx[i] = vx
+        self.vy[i] = vy
+        self.half_w[i] = hw
+        self.half_h[i] = hh
+        self.age[i] = 0.0
+        self.damage[i] = damage
+        self.from_enemy[i] = from_enemy
+        self.reflected[i] = False
+        self.angle[i] = angle
+        self.scale[i] = scale
+        self.textures[i] = texture
+        self.sources[i] = self.source
+        self.generation[i] += 1
+        self.active[i] = True
+        return i
+
+    def release(self, slots):
+        for i in np.atleast_1d(slots):
+            i = int(i)
+            if self.active[i]:
+                self.active[i] = False
+                self.free.append(i)
+
+    def clear(self):
+        self.release(np.flatnonzero(self.active))
+
+    def indices(self, from_enemy=None):
+        mask = self.active
+        if from_enemy is not None:
+            mask = mask & (self.from_enemy == from_enemy)
+        return np.flatnonzero(mask)
+
+    def step(self, dt):
+        np.copyto(self.prev_x, self.x)
+        np.copyto(self.prev_y, self.y)
+        a = self.active
+        self.x[a] += self.vx[a] * dt
+        self.y[a] += self.vy[a] * dt
+        self.age[a] += dt
+
+    def impact_times(self, slots, boxes):
+        # Матрица моментов касания за последний шаг: снаряды x прямоугольники (left, bottom, right, top).
+        # Проверяется весь отрезок пути, поэтому быстрая стрела не пролетает цель между кадрами
+        boxes = np.asarray(boxes, dtype=float).reshape(-1, 4)
+        ox = self.prev_x[slots][:, None]
+        oy = self.prev_y[slots][:, None]
+        return impact_times(ox, oy, self.x[slots][:, None] - ox, self.y[slots][:, None] - oy,
+                            self.half_w[slots][:, None], self.half_h[slots][:, None],
+                            boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3])
+
+    def first_hits(self, slots, boxes):
+        # Для каждого задевшего снаряда - прямоугольник, которого он коснулся раньше всех
+        times = self.impact_times(slots, boxes)
+        rows = np.flatnonzero(np.isfinite(times).any(axis=1))
+        return rows, times.argmin(axis=1)[rows]
+
+    def within_radius(self, x, y, radius, from_enemy=None):
+        slots = self.indices(from_enemy)
+        d2 = (self.x[slots] - x) ** 2 + (self.y[slots] - y) ** 2
+        return slots[d2 <= radius * radius]
+
+    def reflect(self, i):
+        self.from_enemy[i] = False
+        self.reflected[i] = True
+        self.vx[i] *= -1
+        self.vy[i] *= -1
+        self.damage[i] = int(self.damage[i] * 1.5)
+
+    def cull(self, walls):
+        slots = self.indices()
+        if len(slots) == 0:
+            return
+        x = self.x[slots]
+        y = self.y[slots]
+        out = ((x < -CULL_MARGIN) | (x > SCREEN_WIDTH + CULL_MARGIN) |
+               (y < -CULL_MARGIN) | (y > SCREEN_HEIGHT + CULL_MARGIN))
+        hw = self.half_w[slots]
+        hh = self.half_h[slots]
+        px = self.prev_x[slots]
+        py = self.prev_y[slots]
+        # Грубо - по прямоугольнику вокруг всего пути, точно - только для тех, кто рядом со стеной
+        blocked = walls.boxes_blocked(np.minimum(px, x) - hw, np.minimum(py, y) - hh,
+                                      np.maximum(px, x) + hw, np.maximum(py, y) + hh)
+        for k in np.flatnonzero(blocked).tolist():
+            t, _ = walls.sweep(px[k] - hw[k], py[k] - hh[k], px[k] + hw[k], py[k] + hh[k],
+                               x[k] - px[k], y[k] - py[k])
+            blocked[k] = t < 1.0
+        self.release(slots[out | blocked])
+
+    def sync_sprites(self, alpha=1.0):
+        slots = self.indices()
+        for i in self.shown.difference(slots.tolist()):
+            self.sprites[i].visible = False
+        self.shown = set(slots.tolist())
+
+        xs = self.prev_x[slots] + (self.x[slots] - self.prev_x[slots]) * alpha
+        ys = self.prev_y[slots] + (self.y[slots] - self.prev_y[slots]) * alpha
+        for i, x, y in zip(slots.tolist(), xs.tolist(), ys.tolist()):
+            sprite = self.sprites[i]
+            if sprite is None or sprite.pool_generation != self.generation[i]:
+                sprite = self._dress_sprite(i, sprite)
+            if self.reflected[i] and sprite.color != arcade.color.CYAN:
+                sprite.color = arcade.color.CYAN
+            sprite.position = (x, y)
+            sprite.visible = True
+
+    def _dress_sprite(self, i, sprite):
+        texture = self.textures[i]
+        if sprite is None or (texture is None) != isinstance(sprite, arcade.SpriteSolidColor):
+            if sprite is not None:
+                self.sprite_list.remove(sprite)
+            if texture is None:
+                sprite = arcade.SpriteSolidColor(10, 10, color=arcade.color.YELLOW)
+            else:
+                sprite = arcade.Sprite(texture)
+            self.sprite_list.append(sprite)
+            self.sprites[i] = sprite
+        if texture is not None:
+            sprite.texture = texture
+            sprite.scale = float(self.scale[i])
+            sprite.color = arcade.color.WHITE
+        else:
+            sprite.color = arcade.color.YELLOW
+        sprite.angle = float(self.angle[i])
+        sprite.pool_generation = self.generation[i]
+        return sprite
@@ -0,0 +1,231 @@
+import argparse
+import bisect
+import os
+import struct
+import time
+from src.simulation import Simulation
+from src.snapshot import take_snapshot, restore_snapshot
+from src.settings import *
+
+
+# Заголовок: сигнатура, версия, этаж, сид, частота тиков
+MAGIC = b"FCRP"
+VERSION = 2
+_HEADER = struct.Struct("<4sBBQH")
+
+
+class ReplayFormatError(ValueError):
+    pass
+
+
+def _put_varint(out, value):
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _get_varint(data, pos):
+    value = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise ReplayFormatError("запись оборвана")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+class Recorder:
+    # Поток событий: пары varint (тиков с прошлого события, код клавиши).
+    # Код = key * 2 + отпускание + 1, ноль зарезервирован под конец записи.
+    # Набор зажатых клавиш каждого тика однозначно восстанавливается из
+    # нажатий и отпусканий, поэтому хранятся только изменения.
+    # После событий идут ключевые кадры: число, затем (тик, длина, снимок)
+    def __init__(self, floor_number, seed, tick_rate=TICK_RATE, keyframe_interval=KEYFRAME_INTERVAL):
+        self.floor_number = floor_number
+        self.seed = seed
+        self.tick_rate = tick_rate
+        self.data = bytearray()
+        self.last_tick = 0
+        self.keyframe_ticks = max(1, round(keyframe_interval * tick_rate))
+        self.keyframes = []
+
+    def key(self, tick, key, released=False):
+        _put_varint(self.data, tick - self.last_tick)
+        _put_varint(self.data, (key << 1 | released) + 1)
+        self.last_tick = tick
+
+    def after_tick(self, sim):
+        if sim.tick % self.keyframe_ticks == 0:
+            self.keyframes.append((sim.tick, take_snapshot(sim)))
+
+    def to_bytes(self, ticks):
+        out = bytearray(_HEADER.pack(MAGIC, VERSION, self.floor_number, self.seed, self.tick_rate))
+        out += self.data
+        _put_varint(out, max(0, ticks - self.last_tick))
+        _put_varint(out, 0)
+        _put_varint(out, len(self.keyframes))
+        for tick, snapshot in self.keyframes:
+            _put_varint(out, tick)
+            _put_varint(out, len(snapshot))
+            out += snapshot
+        return bytes(out)
+
+    def save(self, path, ticks):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(self.to_bytes(ticks))
+
+
+class Replay:
+    def __init__(self, floor_number, seed, tick_rate, events, ticks, keyframes=()):
+        self.floor_number = floor_number
+        self.seed = seed
+        self.tick_rate = tick_rate
+        # События (тик, клавиша, отпущена) в порядке поступления
+        self.events = events
+        self.ticks = ticks
+        # Снимки симуляции (тик, данные) по возрастанию тика
+        self.keyframes = list(keyframes)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) < _HEADER.size:
+            raise ReplayFormatError("файл короче заголовка")
+        magic, version, floor_number, seed, tick_rate = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ReplayFormatError("это не запись игры")
+        if version not in (1, VERSION):
+            raise ReplayFormatError(f"неизвестная версия записи: {version}")
+
+        events = []
+        tick = 0
+        pos = _HEADER.size
+        while True:
+            delta, pos = _get_varint(data, pos)
+            code, pos = _get_varint(data, pos)
+            tick += delta
+            if code == 0:
+                break
+            code -= 1
+            events.append((tick, code >> 1, bool(code & 1)))
+        ticks = tick
+
+        keyframes = []
+        if version >= 2:
+            count, pos = _get_varint(data, pos)
+            for _ in range(count):
+                tick, pos = _get_varint(data, pos)
+                size, pos = _get_varint(data, pos)
+                if pos + size > len(data):
+                    raise ReplayFormatError("ключевой кадр оборван")
+                keyframes.append((tick, bytes(data[pos:pos + size])))
+                pos += size
+        return cls(floor_number, seed, tick_rate, events, ticks, keyframes)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+class ReplayPlayer:
+    def __init__(self, replay, sim=None):
+        if replay.tick_rate != TICK_RATE:
+            raise ReplayFormatError(f"запись сделана при {replay.tick_rate} тиках/с, сейчас {TICK_RATE}")
+        self.replay = replay
+        self.dt = 1.0 / replay.tick_rate
+        self.index = 0
+        self.event_ticks = [tick for tick, _, _ in replay.events]
+        self.keyframe_ticks = [tick for tick, _ in replay.keyframes]
+        # Симуляция должна быть только что собрана с сидом и этажом записи
+        if sim is None:
+            sim = Simulation()
+            sim.setup(replay.floor_number, replay.seed)
+        self.sim = sim
+
+    @property
+    def done(self):
+        return self.sim.tick >= self.replay.ticks or self.sim.outcome is not None
+
+    def step(self):
+        # Нажатия между тиками k-1 и k записаны с номером k и подаются перед тиком k
+        sim = self.sim
+        events = self.replay.events
+        while self.index < len(events) and events[self.index][0] <= sim.tick:
+            _, key, released = events[self.index]
+            if released:
+                sim.key_release(key)
+            else:
+                sim.key_press(key)
+            self.index += 1
+        sim.update(self.dt)
+
+    def seek(self, tick):
+        # Ближайший ключевой кадр не позже цели, дальше досчитываем тиками.
+        # Вперёд в пределах того же интервала кадр не нужен
+        sim = self.sim
+        target = max(0, min(tick, self.replay.ticks))
+        k = bisect.bisect_right(self.keyframe_ticks, target) - 1
+        frame_tick = self.keyframe_ticks[k] if k >= 0 else 0
+        if target < sim.tick or frame_tick > sim.tick:
+            if k >= 0:
+                restore_snapshot(sim, self.replay.keyframes[k][1])
+            else:
+                sim.setup(self.replay.floor_number, self.replay.seed)
+            self.index = bisect.bisect_left(self.event_ticks, sim.tick)
+        while sim.tick < target and not self.done:
+            self.step()
+
+    def run(self, speed=None):
+        # speed=None - без пауз, как можно быстрее; иначе во столько раз быстрее реального времени
+        start = time.perf_counter()
+        first_tick = self.sim.tick
+        while not self.done:
+            self.step()
+            if speed:
+                ahead = (self.sim.tick - first_tick) * self.dt / speed - (time.perf_counter() - start)
+                if ahead > 0:
+                    time.sleep(ahead)
+        return time.perf_counter() - start
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog="main.py replay", description="Воспроизведение записи игры")
+    parser.add_argument("path")
+    parser.add_argument("--headless", action="store_true", help="без окна, печатает итог прогона")
+    parser.add_argument("--speed", type=float, help="множитель скорости; без окна по умолчанию без ограничения")
+    parser.add_argument("--start", type=float, default=0.0, help="начать с этой секунды записи")
+    args = parser.parse_args(argv)
+    replay = Replay.load(args.path)
+
+    if args.headless:
+        player = ReplayPlayer(replay)
+        sim = player.sim
+        print(f"этаж {replay.floor_number}, сид {replay.seed}, событий {len(replay.events)}, "
+              f"ключевых кадров {len(replay.keyframes)}")
+        if args.start:
+            t = time.perf_counter()
+            player.seek(round(args.start * replay.tick_rate))
+            print(f"переход к тику {sim.tick}: {(time.perf_counter() - t) * 1000:.1f} мс")
+        first_tick = sim.tick
+        elapsed = player.run(args.speed)
+        print(f"тиков {sim.tick} из {replay.ticks}, итог: {sim.outcome or 'нет'}, "
+              f"жизней {sim.lives}, HP {int(sim.player.hp)}")
+        print(f"{elapsed:.2f} с, {(sim.tick - first_tick) / max(elapsed, 1e-9):.0f} тиков/с")
+        return
+
+    import arcade
+    from src.window import GameWindow
+    from src.game_view import ReplayView
+    window = GameWindow()
+    view = ReplayView(replay, args.speed or 1.0)
+    view.setup()
+    if args.start:
+        view.seek(args.start)
+    window.show_view(view)
+    arcade.run()
@@ -0,0 +1,41 @@
+import random
+import threading
+
+
+_local = threading.local()
+
+
+def new_seed():
+    return random.getrandbits(32)
+
+
+class FloorRandom:
+    # Независимые потоки случайных чисел этажа: генерация карты, появление врагов
+    # и предметов, поведение врагов. Лишний бросок в одном потоке не сдвигает
+    # остальные, поэтому прогон с тем же сидом и вводом повторяется точно.
+    # Строковый сид хешируется через sha512 и не зависит от PYTHONHASHSEED
+    def __init__(self, seed, floor_number):
+        self.seed = seed
+        self.floor_number = floor_number
+        self.layout = self.stream("layout")
+        self.spawns = self.stream("spawns")
+        self.ai = self.stream("ai")
+
+    def stream(self, name):
+        return random.Random(f"{self.seed}:{self.floor_number}:{name}")
+
+    def room(self, pos, name):
+        # Поток одной комнаты: камни не зависят от порядка, в котором комнаты посещают
+        return self.stream(f"{pos[0]},{pos[1]}:{name}")
+
+
+def get_random():
+    # Как и часы, потоки свои у каждого потока исполнения
+    streams = getattr(_local, "streams", None)
+    if streams is None:
+        streams = _local.streams = FloorRandom(new_seed(), 0)
+    return streams
+
+
+def set_random(streams):
+    _local.streams = streams
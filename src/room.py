@@ -3,7 +3,7 @@ from src.settings import SCREEN_HEIGHT, SCREEN_WIDTH, RoomType
 
 
 class Room:
-    def __init__(self, pos, room_type="normal"):
+    def __init__(self, pos, room_type="normal", rng=random):
         self.pos = pos
         self.type = room_type
         self.doors = {}
@@ -13,6 +13,7 @@ class Room:
         self.treasure_unlocked = False
         self.guaranteed_item = None  # Добавляем гарантированный предмет
         self.item_spawned = False  # Флаг, что предмет уже размещен
+        self.static_layer = None  # Стены и двери комнаты, строятся при первом посещении
 
         if self.type == RoomType.START:
             cnt = 0
@@ -21,11 +22,11 @@ class Room:
         elif self.type == RoomType.TREASURE:
             cnt = 0
         else:
-            cnt = random.randint(2, 4)
+            cnt = rng.randint(2, 4)
 
         for _ in range(cnt):
-            ex = random.randint(200, SCREEN_WIDTH - 200)
-            ey = random.randint(220, SCREEN_HEIGHT - 100)
+            ex = rng.randint(200, SCREEN_WIDTH - 200)
+            ey = rng.randint(220, SCREEN_HEIGHT - 100)
             self.enemy_spawns.append({"type": "enemy", "x": ex, "y": ey, "hp": None})
 
     def set_doors(self, doors_dict):
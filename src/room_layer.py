@@ -0,0 +1,116 @@
+import arcade
+import random
+import threading
+from src.assets import make_sprite
+from src.collision import CollisionGrid
+from src.settings import *
+
+
+_border_sprites = None
+# Рамку может впервые запросить и поток подготовки этажа
+_border_lock = threading.Lock()
+
+
+def border_sprites():
+    # Рамка из стен одинакова для всех комнат, поэтому строится один раз
+    global _border_sprites
+    if _border_sprites is not None:
+        return _border_sprites
+    with _border_lock:
+        if _border_sprites is None:
+            _border_sprites = _build_border()
+    return _border_sprites
+
+
+def _build_border():
+    sprites = arcade.SpriteList(lazy=True)
+
+    def add_tile(x, y):
+        tile = arcade.SpriteSolidColor(WALL_TILE, WALL_TILE, arcade.color.DARK_BROWN)
+        tile.is_rock = False
+        tile.is_wall = True
+        tile.center_x = x
+        tile.center_y = y
+        sprites.append(tile)
+
+    for x in range(0, SCREEN_WIDTH, WALL_TILE):
+        add_tile(x + WALL_TILE // 2, WALL_TILE // 2)
+        add_tile(x + WALL_TILE // 2, SCREEN_HEIGHT - WALL_TILE // 2)
+
+    for y in range(WALL_TILE, SCREEN_HEIGHT - WALL_TILE, WALL_TILE):
+        add_tile(WALL_TILE // 2, y + WALL_TILE // 2)
+        add_tile(SCREEN_WIDTH - WALL_TILE // 2, y + WALL_TILE // 2)
+
+    return sprites
+
+
+class RoomLayer:
+    def __init__(self, room, rng=random):
+        self.rocks = arcade.SpriteList(lazy=True)
+        self.doors = arcade.SpriteList(lazy=True)
+
+        room.add_forbidden_zone(SCREEN_WIDTH // 2, 190, 200)
+        self._spawn_rocks(room, rng)
+        self._spawn_doors(room)
+
+        # Сломанные молотом камни удаляются и из сетки, и из списка навсегда
+        self.grid = CollisionGrid.from_sprites(border_sprites())
+        for rock in self.rocks:
+            self.grid.add(rock)
+
+    @classmethod
+    def for_room(cls, room, streams):
+        if room.static_layer is None:
+            room.static_layer = cls(room, streams.room(room.pos, "rocks"))
+        return room.static_layer
+
+    def _spawn_rocks(self, room, rng):
+        def is_position_allowed(x, y, forbidden):
+            for fx, fy, r in forbidden:
+                if abs(x - fx) < r and abs(y - fy) < r:
+                    return False
+            return True
+
+        attempts = 0
+        spawned = 0
+        if room.type not in (RoomType.BOSS, RoomType.START, RoomType.TREASURE):
+            while spawned < 6 and attempts < 10:
+                attempts += 1
+                x = rng.randint(180, SCREEN_WIDTH - 180)
+                y = rng.randint(180, SCREEN_HEIGHT - 180)
+
+                if not is_position_allowed(x, y, room.forbidden_zones):
+                    continue
+
+                try:
+                    rock = make_sprite("assets/rock.png", scale=6.0)
+                except:
+                    rock = arcade.SpriteSolidColor(50, 50, arcade.color.BROWN)
+                rock.center_x = x
+                rock.center_y = y
+                rock.is_rock = True
+                rock.is_wall = False
+                self.rocks.append(rock)
+                spawned += 1
+
+    def _spawn_doors(self, room):
+        margin = 80
+
+        def spawn_door(x, y, direction):
+            try:
+                d = make_sprite("assets/door.png", scale=6.0)
+            except Exception:
+                d = arcade.SpriteSolidColor(120, 160, arcade.color.DARK_BROWN)
+            d.center_x = x
+            d.center_y = y
+            d.direction = direction
+            self.doors.append(d)
+
+        if room.doors.get("up") is not None:
+            spawn_door(SCREEN_WIDTH // 2, SCREEN_HEIGHT - margin, "up")
+        if room.doors.get("down") is not None:
+            spawn_door(SCREEN_WIDTH // 2, margin, "down")
+        if room.doors.get("left") is not None:
+            spawn_door(margin, SCREEN_HEIGHT // 2, "left")
+        if room.doors.get("right") is not None:
+            spawn_door(SCREEN_WIDTH - margin, SCREEN_HEIGHT // 2, "right")
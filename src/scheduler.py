@@ -0,0 +1,57 @@
+import heapq
+
+
+class ScheduledAction:
+    def __init__(self, due, callback, args):
+        self.due = due
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class Scheduler:
+    def __init__(self):
+        self.now = 0.0
+        self._queue = []
+        self._order = 0
+
+    def call_later(self, delay, callback, *args):
+        action = ScheduledAction(self.now + delay, callback, args)
+        # Порядковый номер сохраняет порядок действий с одинаковым сроком
+        heapq.heappush(self._queue, (action.due, self._order, action))
+        self._order += 1
+        return action
+
+    def advance(self, dt):
+        self.now += dt
+        while self._queue and self._queue[0][0] <= self.now:
+            _, _, action = heapq.heappop(self._queue)
+            if not action.cancelled:
+                action.callback(*action.args)
+
+    def pending(self):
+        # Живые действия (срок, номер, действие) в порядке срабатывания
+        return sorted(entry for entry in self._queue if not entry[2].cancelled)
+
+    def restore(self, now, order, entries):
+        # entries - (срок, номер, callback, args), как их вернул pending
+        self.clear()
+        self.now = now
+        self._order = order
+        actions = []
+        for due, seq, callback, args in entries:
+            action = ScheduledAction(due, callback, args)
+            heapq.heappush(self._queue, (due, seq, action))
+            actions.append(action)
+        return actions
+
+    def clear(self):
+        for _, _, action in self._queue:
+            action.cancelled = True
+        self._queue.clear()
+
+    def __len__(self):
+        return sum(1 for _, _, action in self._queue if not action.cancelled)
@@ -12,6 +12,17 @@ SCREEN_WIDTH = CONFIG["screen"]["SCREEN_WIDTH"]
 SCREEN_HEIGHT = CONFIG["screen"]["SCREEN_HEIGHT"]
 SCREEN_TITLE = CONFIG["screen"]["SCREEN_TITLE"]
 
+FIXED_TIMESTEP = CONFIG["simulation"]["FIXED_TIMESTEP"]
+TICK_RATE = CONFIG["simulation"]["TICK_RATE"]
+MAX_CATCH_UP_STEPS = CONFIG["simulation"]["MAX_CATCH_UP_STEPS"]
+BATCH_STEERING = CONFIG["simulation"]["BATCH_STEERING"]
+BATCH_STEERING_MIN_ENEMIES = CONFIG["simulation"]["BATCH_STEERING_MIN_ENEMIES"]
+PROFILER_FRAMES = CONFIG["simulation"]["PROFILER_FRAMES"]
+PROFILER_REFRESH = CONFIG["simulation"]["PROFILER_REFRESH"]
+RECORD_REPLAYS = CONFIG["simulation"]["RECORD_REPLAYS"]
+REPLAY_DIR = CONFIG["simulation"]["REPLAY_DIR"]
+KEYFRAME_INTERVAL = CONFIG["simulation"]["KEYFRAME_INTERVAL"]
+
 PLAYER_SPEED = CONFIG["player"]["PLAYER_SPEED"]
 PLAYER_HP = CONFIG["player"]["PLAYER_HP"]
 PLAYER_SCALE = CONFIG["player"]["PLAYER_SCALE"]
@@ -19,6 +30,8 @@ PLAYER_SCALE = CONFIG["player"]["PLAYER_SCALE"]
 ENEMY_SCALE = CONFIG["enemy"]["ENEMY_SCALE"]
 ENEMY_HP = CONFIG["enemy"]["ENEMY_HP"]
 ENEMY_SPEED = CONFIG["enemy"]["ENEMY_SPEED"]
+FLOW_FIELD_CELL = CONFIG["enemy"]["FLOW_FIELD_CELL"]
+FLOW_FIELD_CLEARANCE = CONFIG["enemy"]["FLOW_FIELD_CLEARANCE"]
 
 BOSS_SCALE = CONFIG["boss"]["BOSS_SCALE"]
 BOSS_HP = CONFIG["boss"]["BOSS_HP"]
@@ -47,6 +60,7 @@ OPPOSITE = {
 
 KEY_DROP_CHANCE = CONFIG["floor"]["KEY_DROP_CHANCE"]
 WALL_TILE = CONFIG["floor"]["WALL_TILE"]
+PICKUP_MIN_SIZE = CONFIG["floor"]["PICKUP_MIN_SIZE"]
 
 ARROW_SPEED = CONFIG["weapons"]["ARROW_SPEED"]
 
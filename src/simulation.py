@@ -0,0 +1,713 @@
+import arcade
+import numpy as np
+from src.player import Player
+from src.dungeon import Floor
+from src.enemy import *
+from src.boss import *
+from src.collision import sprite_box
+from src.placement import FreeSpaceSampler, NoFreeSpaceError
+from src.room_layer import RoomLayer, border_sprites
+from src.projectiles import ProjectilePool
+from src.scheduler import Scheduler
+from src.steering import steer_enemies
+from src.timers import set_clock
+from src.rng import set_random
+from src.profiler import FrameProfiler
+from src.assets import make_sprite
+from src.settings import *
+
+
+class Simulation:
+    def __init__(self):
+        self.sword_slashes = []
+        self.keys_held = set()
+        self.border_sprites = border_sprites()
+        self.wall_sprites = None
+        self.wall_grid = None
+        self.free_space = None
+        self.door_sprites = None
+        self.floor = None
+        self.room_cleared = False
+        self.door_open = False
+        self.projectiles = ProjectilePool()
+        self.pickup_sprites = arcade.SpriteList(lazy=True)
+        self.axe_swings = []
+        self.halberd_swings = []
+        self.hammer_swings = []
+        self.scheduler = Scheduler()
+        self.notice_text = ""
+        self.notice_action = None
+        self.lives = 3
+        self.screen_shake = 0
+        self.outcome = None
+        self.profiler = FrameProfiler()
+        self.recorder = None
+        self.tick = 0
+        self.damage_taken = {}
+
+    def try_activate_shield(self):
+        p = self.player
+        if not p.has_shield or not p.shield_ready:
+            return
+        
+        p.parry_active = True
+        p.parry_timer = p.parry_window
+
+        self.projectiles.release(
+            self.projectiles.within_radius(p.x, p.y, p.shield_radius, from_enemy=True)
+        )
+
+        p.shield_ready = False
+        room = self.floor.get_current_room()
+        if room.type == RoomType.BOSS:
+            p.shield_time_cooldown = 7.0
+        else:
+            p.shield_room_cooldown = 2
+
+    def setup(self, floor_number=1, seed=None):
+        self.floor_number = floor_number
+        self.lives = 3
+        self.room_cleared = False
+        self.door_open = False
+        self.outcome = None
+        self.tick = 0
+        self.damage_taken = {}
+        self.screen_shake = 0
+        self.keys_held.clear()
+        # Новый прогон начинается с нулевого времени: от него считаются все таймеры
+        self.scheduler.clear()
+        self.scheduler = Scheduler()
+        # Таймеры сущностей, созданных дальше, считают по часам этой симуляции
+        set_clock(self.scheduler)
+
+        self.player =Player(SCREEN_WIDTH // 2, 190)
+        # Списки ленивые: Simulation может собираться в фоновом потоке,
+        # а GL-буферы создаются при первой отрисовке в главном
+        self.player_list = arcade.SpriteList(lazy=True)
+        self.player_list.append(self.player.sprite)
+        
+        self.enemy_sprites = arcade.SpriteList(lazy=True)
+        self.current_enemies = []
+        self.projectiles = ProjectilePool()
+        self.pickup_sprites = arcade.SpriteList(lazy=True)
+        
+        self.floor = Floor(floor_number, seed)
+        self.rng = self.floor.rng
+        set_random(self.rng)
+        
+        self.load_current_room()
+    
+    def load_current_room(self):
+        self.enemy_sprites.clear()
+        self.pickup_sprites.clear()
+        self.projectiles.clear()
+        self.current_enemies.clear()
+        self.sword_slashes.clear()
+        self.axe_swings.clear()
+        self.halberd_swings.clear()
+        self.hammer_swings.clear()
+        self.room_cleared = False
+        self.clear_notice()
+
+        room = self.floor.get_current_room()
+        layer = RoomLayer.for_room(room, self.rng)
+        self.wall_sprites = layer.rocks
+        self.door_sprites = layer.doors
+        self.wall_grid = layer.grid
+
+        self.free_space = FreeSpaceSampler.for_room(self.wall_grid, self.door_sprites, self.pickup_sprites)
+
+        if room.type == RoomType.BOSS:
+            bx = SCREEN_WIDTH // 2
+            by = SCREEN_HEIGHT // 2 + 60
+
+            if self.floor_number == 1:
+                boss = Boss(bx, by)
+            elif self.floor_number == 2:
+                boss = BossFloor2(bx, by)
+            elif self.floor_number == 3:
+                boss = BossFloor3(bx, by)
+
+            self.current_enemies.append(boss)
+            self.enemy_sprites.append(boss.sprite)
+        elif room.type not in (RoomType.WEAPON, RoomType.SHIELD):
+            for spawn in room.enemy_spawns:
+                try:
+                    x, y = self.find_free_position(spacing=24)
+                except NoFreeSpaceError:
+                    # Места не осталось: остальные враги этой комнаты не появляются
+                    print(f"Комната {self.floor.current_pos}: нет места, не появились врагов: "
+                          f"{len(room.enemy_spawns) - len(self.current_enemies)}")
+                    break
+                roll = self.rng.spawns.random()
+                
+                if self.floor_number == 1:
+                    if roll < 0.5:
+                        e = Enemy(x, y)
+                    elif roll < 0.7:
+                        e = FastEnemy(x, y)
+                    elif roll < 0.9:
+                        e = TankEnemy(x, y)
+                    else:
+                        e = RangedEnemy(x, y)
+                
+                elif self.floor_number == 2:
+                    if roll < 0.35:
+                        e = EliteRunner(x, y)
+                    elif roll < 0.65:
+                        e = EliteShooter(x, y)
+                    elif roll < 0.85:
+                        e = FastEnemy(x, y)
+                    else:
+                        e = Enemy(x, y)
+
+                elif self.floor_number == 3:
+                    if roll < 0.25:
+                        e = EliteTankFloor3(x, y)
+                    elif roll < 0.4:
+                        e = EliteArcherFloor3(x, y)
+                    elif roll < 0.5:
+                        e = TankEnemy(x, y)
+                    elif roll < 0.75:
+                        e = EliteShooter(x, y)
+                    else:
+                        e = FastEnemy(x, y)
+
+                self.current_enemies.append(e)
+                self.enemy_sprites.append(e.sprite)
+
+        if room.type == RoomType.TREASURE and room.treasure_unlocked:
+            ax = make_sprite("assets/axe.png", scale=5)
+            ax.center_x, ax.center_y = self.find_pickup_position()
+            ax.pickup_type = "axe"
+            self.pickup_sprites.append(ax)
+
+            bw = make_sprite("assets/bow).png", scale=5)
+            bw.center_x, bw.center_y = self.find_pickup_position()
+            bw.pickup_type = "bow"
+            self.pickup_sprites.append(bw)
+
+            if self.floor_number >= 2:
+                shield = make_sprite("assets/shield.png", scale=5)
+                shield.center_x, shield.center_y = self.find_pickup_position()
+                shield.pickup_type = "shield"
+                self.pickup_sprites.append(shield)
+
+                halberd = make_sprite("assets/halberd.png", scale=5)
+                halberd.center_x, halberd.center_y = self.find_pickup_position()
+                halberd.pickup_type = "halberd"
+                self.pickup_sprites.append(halberd)
+
+                if self.rng.spawns.random() > 0.8:
+                    hm = make_sprite("assets/hammer.png", scale=5)
+                    hm.center_x, hm.center_y = self.find_pickup_position()
+                    hm.pickup_type = "hammer"
+                    self.pickup_sprites.append(hm)
+
+        self.room_cleared = len(self.current_enemies) == 0
+        self.player.sprite.center_x = SCREEN_WIDTH // 2
+        self.player.sprite.center_y = 190
+        
+        p = self.player
+        if p.has_shield and not p.shield_ready:
+            p.shield_room_cooldown -= 1
+            if p.shield_room_cooldown <= 0:
+                p.shield_ready = True
+
+    def _record_damage(self, source, amount):
+        if amount > 0:
+            self.damage_taken[source] = self.damage_taken.get(source, 0.0) + amount
+
+    def show_notice(self, text, duration):
+        self.clear_notice()
+        self.notice_text = text
+        self.notice_action = self.scheduler.call_later(duration, self.clear_notice)
+
+    def clear_notice(self):
+        if self.notice_action is not None:
+            self.notice_action.cancel()
+            self.notice_action = None
+        self.notice_text = ""
+
+    def finish(self, outcome):
+        self.outcome = outcome
+
+    def find_free_position(self, spacing=0):
+        return self.free_space.take(spacing, self.rng.spawns)
+
+    def find_pickup_position(self):
+        try:
+            return self.find_free_position()
+        except NoFreeSpaceError:
+            pass
+        # Предмет терять нельзя: ищем место под размер самого предмета, ближе к центру.
+        # Если нет и его, ошибка уходит выше
+        print(f"Комната {self.floor.current_pos}: нет места для предмета, кладём вплотную")
+        tight = FreeSpaceSampler.for_room(self.wall_grid, self.door_sprites, self.pickup_sprites,
+                                          self.enemy_sprites, size=PICKUP_MIN_SIZE, step=4)
+        return tight.nearest(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+
+    def _update_doors_state(self):
+        for door in self.door_sprites:
+            door.is_open = self.room_cleared or self.floor.get_current_room().type == RoomType.START
+            if isinstance(door, arcade.SpriteSolidColor):
+                if door.is_open:
+                    door.color = arcade.color.LIGHT_GREEN
+                else:
+                    door.color = arcade.color.DARK_BROWN
+
+    def interpolated_sprites(self):
+        return [self.player.sprite, *self.enemy_sprites]
+
+    def update(self, dt):
+        set_clock(self.scheduler)
+        set_random(self.rng)
+        prof = self.profiler
+        prof.tick()
+        prof.start()
+        if self.player.dash_time > 0:
+            vx = self.player.dash_dx * self.player.dash_speed * dt
+            vy = self.player.dash_dy * self.player.dash_speed * dt
+
+            self.wall_grid.slide(self.player.sprite, vx, vy)
+
+        dx = dy = 0
+        if arcade.key.W in self.keys_held:
+            dy += 1
+        if arcade.key.S in self.keys_held:
+            dy -= 1
+        if arcade.key.A in self.keys_held:
+            dx -= 1
+        if arcade.key.D in self.keys_held:
+            dx += 1
+
+        if dx or dy:
+            length = math.hypot(dx, dy)
+            nx = dx / length
+            ny = dy / length
+
+            self.wall_grid.slide(self.player.sprite, nx * self.player.speed * dt, ny * self.player.speed * dt)
+
+            if nx > 0:
+                self.player.sprite.scale_x = abs(self.player.sprite.scale_x)
+            elif nx < 0:
+                self.player.sprite.scale_x = -abs(self.player.sprite.scale_x)
+
+        hp = self.player.hp
+        self.player.update(dt, self.keys_held)
+        self._record_damage("burn", hp - self.player.hp)
+        p = self.player
+        room = self.floor.get_current_room()
+
+        if p.has_shield and not p.shield_ready:
+            if room.type == RoomType.BOSS:
+                p.shield_time_cooldown -= dt
+                if p.shield_time_cooldown <= 0:
+                    p.shield_ready = True
+        prof.lap("player")
+
+        # Пакетный проход окупается только на больших толпах
+        if BATCH_STEERING and len(self.current_enemies) >= BATCH_STEERING_MIN_ENEMIES:
+            steer_enemies(self.current_enemies, self.player, self.wall_grid, dt)
+
+        for e in list(self.current_enemies):
+            # Урон игроку и выпущенные стрелы записываются на тип врага
+            hp = self.player.hp
+            self.projectiles.source = type(e).__name__
+            if isinstance(e, Boss):
+                e.update_phase(self.player, self.wall_grid, dt)
+            elif isinstance(e, BossFloor2):
+                e.update(self.player, self.wall_grid, dt, self.projectiles)
+            elif isinstance(e, BossFloor3):
+                new_enemies = []
+                e.update_phase(
+                    player=self.player,
+                    walls=self.wall_grid,
+                    dt=dt,
+                    enemies=new_enemies,
+                    enemy_projectiles=self.projectiles
+                )
+                if len(new_enemies) > 0:
+                    for ne in new_enemies:
+                        self.current_enemies.append(ne)
+                        self.enemy_sprites.append(ne.sprite)
+                    new_enemies.clear()
+            elif e.batch_done:
+                e.batch_done = False
+            elif isinstance(e, (RangedEnemy, EliteShooter, EliteArcherFloor3)):
+                e.update(self.player, self.wall_grid, dt, self.projectiles)
+            else:
+                e.update(self.player, self.wall_grid, dt)
+            
+            if abs(e.x - self.player.x) < 28 and abs(e.y - self.player.y) < 28:
+                self.player.hp -= 20 * dt
+            self._record_damage(type(e).__name__, hp - self.player.hp)
+
+            if not e.alive:
+                try:
+                    self.current_enemies.remove(e)
+                except ValueError:
+                    pass
+                try:
+                    self.enemy_sprites.remove(e.sprite)
+                except ValueError:
+                    pass
+        self.projectiles.source = None
+        prof.lap("enemies")
+
+        pool = self.projectiles
+        if len(pool):
+            pool.step(dt)
+
+            shots = pool.indices(from_enemy=False)
+            if len(shots) and self.current_enemies:
+                rows, targets = pool.first_hits(shots, [sprite_box(e.sprite) for e in self.current_enemies])
+                for i, j in zip(rows.tolist(), targets.tolist()):
+                    self.current_enemies[j].hp -= int(pool.damage[shots[i]])
+                pool.release(shots[rows])
+
+            arrows = pool.indices(from_enemy=True)
+            if len(arrows):
+                hit = arrows[np.isfinite(pool.impact_times(arrows, [sprite_box(self.player.sprite)])[:, 0])]
+                if len(hit) and self.player.parry_active:
+                    pool.reflect(hit[0])
+                    self.player.parry_active = False
+                    self.player.parry_timer = 0
+                    hit = hit[1:]
+                for i in hit:
+                    self.player.hp -= int(pool.damage[i])
+                    self._record_damage(pool.sources[i] or "unknown", int(pool.damage[i]))
+                pool.release(hit)
+
+            pool.cull(self.wall_grid)
+        prof.lap("projectiles")
+
+        for s in list(self.sword_slashes):
+            s["time"] -= dt
+            if s["time"] <= 0:
+                self.sword_slashes.remove(s)
+
+        for a in list(self.axe_swings):
+            if a.get("applied", False) is False:
+                for e in list(self.current_enemies):
+                    if distance((e.x, e.y), (a["x"], a["y"])) <= a["radius"]:
+                        e.hp -= a.get("damage", 60)
+                a["applied"] = True
+
+            a["time"] -= dt
+            if a["time"] <= 0:
+                self.axe_swings.remove(a)
+
+        for h in list(self.halberd_swings):
+            if not h["applied"]:
+                for e in self.current_enemies:
+                    dx = e.x - h["x"]
+                    dy = e.y - h["y"]
+                    dist = math.hypot(dx, dy)
+
+                    if dist > h["radius"]:
+                        continue
+
+                    enemy_angle = math.degrees(math.atan2(dx, dy))
+                    delta = (enemy_angle - h["angle"] + 180) % 360 - 180
+
+                    if abs(delta) <= h["arc"] / 2:
+                        e.hp -= h["damage"]
+
+                h["applied"] = True
+
+            h["time"] -= dt
+            if h["time"] <= 0:
+                self.halberd_swings.remove(h)
+
+        for h in list(self.hammer_swings):
+            h["timer"] -= dt
+
+            if h["phase"] == "windup" and h["timer"] <= HAMMER_IMPACT:
+                h["phase"] = "impact"
+
+                for e in self.current_enemies:
+                    if arcade.get_distance_between_sprites(e.sprite, self.player.sprite) <= h["radius"]:
+                        e.hp -= h["damage"]
+                        
+                        if getattr(e, "can_be_stunned", True):
+                            e.stun(HAMMER_STUN_TIME)
+                        else:
+                            e.slowed = True
+                            e.slow_timer = HAMMER_BOSS_SLOW_TIME
+                            e.slow_mult = HAMMER_BOSS_SLOW_MULT
+
+                for obj in self.wall_sprites[:]:
+                    if not getattr(obj, "is_rock", False):
+                        continue
+
+                    if arcade.get_distance_between_sprites(obj, self.player.sprite) <= h["radius"]:
+                        obj.remove_from_sprite_lists()
+                        self.wall_grid.remove(obj)
+            
+            if h["timer"] <= 0:
+                self.hammer_swings.remove(h)
+        prof.lap("swings")
+
+        for p in list(self.pickup_sprites):
+            if arcade.check_for_collision(self.player.sprite, p):
+                ptype = getattr(p, "pickup_type", "key")
+                if ptype == "key":
+                    self.player.keys += 1
+                    self.show_notice("Picked up a key!", 2.0)
+                elif ptype == "axe":
+                    self.player.weapon = "axe"
+                    self.show_notice("Picked up: Axe", 2.0)
+                elif ptype == "bow":
+                    self.player.weapon = "bow"
+                    self.show_notice("Picked up: Bow", 2.0)
+                elif ptype == "shield":
+                    self.player.has_shield = True
+                    self.show_notice("Picked up: Shield", 2.0)
+                elif ptype == "halberd":
+                    self.player.weapon = "halberd"
+                    self.show_notice("Picked up: Halberd", 2.0)
+                elif ptype == "hammer":
+                    self.player.weapon = "hammer"
+                    self.show_notice("Picked up: Battle Hammer", 2.0)
+                elif ptype == "heart":
+                    self.player.max_hp += 20
+                    self.player.hp = min(self.player.max_hp, self.player.hp + 40)
+                    self.show_notice("Max HP increased!", 2.0)
+                
+                try:
+                    self.pickup_sprites.remove(p)
+                except ValueError:
+                    pass
+        prof.lap("pickups")
+
+        prev_cleared = self.room_cleared
+        self.room_cleared = len(self.current_enemies) == 0
+        room = self.floor.get_current_room()
+
+        if self.room_cleared and (not prev_cleared) and room.type == RoomType.BOSS:
+            completed_levels[self.floor_number] = True
+            
+            self.show_notice(f"УРОВЕНЬ {self.floor_number} ПРОЙДЕН!", 3.0)
+            
+            # Переход выполняется по игровому времени, цикл событий не блокируется
+            if self.floor_number == 3 and all(completed_levels.values()):
+                self.scheduler.call_later(1.0, self.finish, "good_ending")
+            else:
+                self.scheduler.call_later(3.0, self.finish, "floor_select")
+
+        if self.room_cleared and (not prev_cleared):
+            if room.type not in (RoomType.START, RoomType.BOSS, RoomType.TREASURE, RoomType.WEAPON, RoomType.SHIELD):
+                if self.rng.spawns.random() < KEY_DROP_CHANCE:
+                    kx, ky = self.find_pickup_position()
+                    key_sprite = make_sprite("assets/key.png", scale=5)
+                    key_sprite.center_x = kx
+                    key_sprite.center_y = ky
+                    key_sprite.pickup_type = "key"
+                    self.pickup_sprites.append(key_sprite)
+                    self.show_notice("A key dropped!", 2.0)
+
+        self.scheduler.advance(dt)
+
+        if self.player.hp <= 0:
+            self.lives -= 1
+            
+            if self.lives > 0:
+                self.player.hp = self.player.max_hp
+                self.load_current_room()
+            else:
+                self.outcome = "bad_ending"
+        self.tick += 1
+        prof.lap("room")
+        if self.recorder is not None:
+            self.recorder.after_tick(self)
+
+    def key_press(self, key):
+        set_clock(self.scheduler)
+        set_random(self.rng)
+        if self.recorder is not None:
+            self.recorder.key(self.tick, key)
+        self.keys_held.add(key)
+
+        if key == arcade.key.LSHIFT:
+            if self.player.dash_cooldown <= 0:
+                dx = dy = 0
+                if arcade.key.W in self.keys_held:
+                    dy += 1
+                if arcade.key.S in self.keys_held:
+                    dy -= 1
+                if arcade.key.A in self.keys_held:
+                    dx -= 1
+                if arcade.key.D in self.keys_held:
+                    dx += 1
+
+                if dx != 0 or dy != 0:
+                    length = math.hypot(dx, dy)
+                    self.player.dash_dx = dx / length
+                    self.player.dash_dy = dy / length
+
+                    self.player.dash_time = self.player.dash_duration
+                    self.player.dash_cooldown = self.player.dash_cd_time
+
+        if key == arcade.key.SPACE:
+            self.try_activate_shield()
+
+        if key in (arcade.key.UP, arcade.key.DOWN, arcade.key.LEFT, arcade.key.RIGHT):
+            if self.player.weapon == "axe":
+                if not self.player.can_attack():
+                    return
+                self.player.reset_attack()
+                swing = {"x": self.player.x, "y": self.player.y, "radius": 120, "time": 0.18, "damage": 70, "applied": False}
+                self.axe_swings.append(swing)
+            
+            elif self.player.weapon == "halberd":
+                if not self.player.can_attack():
+                    return
+
+                self.player.attack_cooldown = HALBERD_COOLDOWN
+                self.player.reset_attack()
+
+                if key == arcade.key.UP:
+                    angle = 90
+                elif key == arcade.key.DOWN:
+                    angle = -90
+                elif key == arcade.key.LEFT:
+                    angle = 180
+                else:
+                    angle = 0
+
+                swing = {
+                    "x": self.player.x,
+                    "y": self.player.y,
+                    "angle": angle,
+                    "radius": HALBERD_RADIUS,
+                    "arc": HALBERD_ARC_ANGLE,
+                    "time": HALBERD_TIME,
+                    "damage": HALBERD_DAMAGE,
+                    "applied": False
+                }
+
+                self.halberd_swings.append(swing)
+                return
+            
+            elif self.player.weapon == "hammer":
+                if not self.player.can_attack():
+                    return
+
+                self.player.attack_cooldown = HAMMER_COOLDOWN
+                self.player.reset_attack()
+
+                if key == arcade.key.UP:
+                    angle = 90
+                elif key == arcade.key.DOWN:
+                    angle = -90
+                elif key == arcade.key.LEFT:
+                    angle = 180
+                else:
+                    angle = 0
+
+                swing = {
+                    "x": self.player.x,
+                    "y": self.player.y,
+                    "radius": HAMMER_RADIUS,
+                    "timer": HAMMER_WINDUP + HAMMER_IMPACT,
+                    "phase": "windup",
+                    "damage": HAMMER_DAMAGE,
+                    "applied": False
+                }   
+
+                self.hammer_swings.append(swing)
+                return
+
+            elif self.player.weapon == "bow":
+                if not self.player.can_attack():
+                    return
+                self.player.reset_attack()
+                
+                dx = dy = 0
+                if key == arcade.key.UP:
+                    dy = 1
+                elif key == arcade.key.DOWN:
+                    dy = -1
+                elif key == arcade.key.LEFT:
+                    dx = -1
+                elif key == arcade.key.RIGHT:
+                    dx = 1
+                
+                length = math.hypot(dx, dy)
+                if length == 0:
+                    length = 1
+                dx /= length
+                dy /= length
+                
+                self.projectiles.spawn(
+                    self.player.x,
+                    self.player.y,
+                    dx * ARROW_SPEED,
+                    dy * ARROW_SPEED,
+                    damage=45,
+                    scale=5,
+                    angle=math.degrees(math.atan2(dy, dx))
+                )
+            
+            else:
+                if not self.player.can_attack():
+                    return
+                self.player.reset_attack()
+
+                x1 = self.player.x
+                y1 = self.player.y
+                x2 = x1
+                y2 = y1
+                L = SWORD_LENGTH
+                if key == arcade.key.UP:
+                    y2 += L
+                elif key == arcade.key.DOWN:
+                    y2 -= L
+                elif key == arcade.key.LEFT:
+                    x2 -= L
+                elif key == arcade.key.RIGHT:
+                    x2 += L
+
+                self.sword_slashes.append({"x1": x1, "y1": y1, "x2": x2, "y2": y2, "time": SWORD_TIME, "width": SWORD_THICKNESS})
+
+                for e in list(self.current_enemies):
+                    if abs(e.x - x2) < 48 and abs(e.y - y2) < 48:
+                        e.hp -= 40
+
+        if key == arcade.key.E and self.room_cleared:
+            room = self.floor.get_current_room()
+            for door in list(self.door_sprites):
+                if arcade.check_for_collision(self.player.sprite, door):
+                    target = self.floor.get_current_room().doors.get(door.direction)
+                    if not target:
+                        continue
+                    target_room = self.floor.rooms.get(target)
+                    
+                    if target_room and target_room.type == RoomType.TREASURE and (not target_room.treasure_unlocked):
+                        if self.player.keys > 0:
+                            self.player.keys -= 1
+                            target_room.treasure_unlocked = True
+                            self.show_notice("Unlocked treasure room!", 2.0)
+                            if self.floor.move(target):
+                                self.load_current_room()
+                        else:
+                            self.show_notice("Door is locked. Need a key.", 2.0)
+                        break
+                    else:
+                        if self.floor.move(target):
+                            self.load_current_room()
+                        break
+
+        if key == arcade.key.R:
+            # Сид нового этажа берётся из текущих потоков, чтобы перезапуск повторялся в реплее
+            seed = self.rng.layout.getrandbits(32)
+            self.floor = Floor(self.floor_number, seed)
+            self.rng = self.floor.rng
+            set_random(self.rng)
+            self.load_current_room()
+
+    def key_release(self, key):
+        if self.recorder is not None:
+            self.recorder.key(self.tick, key, released=True)
+        self.keys_held.discard(key)
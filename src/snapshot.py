@@ -0,0 +1,243 @@
+import pickle
+import zlib
+import numpy as np
+from src.assets import get_texture, make_sprite
+from src.dungeon import Floor
+from src.enemy import *
+from src.boss import *
+from src.placement import FreeSpaceSampler
+from src.projectiles import ProjectilePool
+from src.rng import set_random
+from src.room_layer import RoomLayer
+from src.scheduler import ScheduledAction
+from src.timers import set_clock
+from src.settings import *
+
+
+SNAPSHOT_VERSION = 1
+
+ENEMY_TYPES = {cls.__name__: cls for cls in (
+    Enemy, FastEnemy, TankEnemy, RangedEnemy, EliteRunner, EliteShooter,
+    EliteTankFloor3, EliteArcherFloor3, Boss, BossFloor2, BossFloor3
+)}
+
+PICKUP_TEXTURES = {
+    "key": "assets/key.png",
+    "axe": "assets/axe.png",
+    "bow": "assets/bow).png",
+    "shield": "assets/shield.png",
+    "halberd": "assets/halberd.png",
+    "hammer": "assets/hammer.png",
+}
+
+# Поля сущностей, которые не копируются: спрайт сохраняется отдельно,
+# часы и потоки случайных чисел общие для всей симуляции
+_SHARED = ("sprite", "clock", "rng")
+
+_POOL_ARRAYS = ("x", "y", "prev_x", "prev_y", "vx", "vy", "half_w", "half_h",
+                "age", "damage", "from_enemy", "reflected", "active", "angle", "scale", "generation")
+
+
+class _ActionRef:
+    # Ссылка на запланированное действие по его номеру в снимке планировщика
+    __slots__ = ("index",)
+
+    def __init__(self, index):
+        self.index = index
+
+
+def _pack_random(rng):
+    # Состояние вихря Мерсенна - 625 случайных слов: zlib их не сжимает, а только тратит время,
+    # поэтому они хранятся отдельно от сжатой части как есть
+    version, internal, gauss = rng.getstate()
+    return np.array(internal, dtype=np.uint32).tobytes(), version, gauss
+
+
+def _unpack_random(rng, packed):
+    internal, version, gauss = packed
+    rng.setstate((version, tuple(np.frombuffer(internal, dtype=np.uint32).tolist()), gauss))
+
+
+def _sprite_state(sprite):
+    return sprite.center_x, sprite.center_y, sprite.scale_x, sprite.scale_y, tuple(sprite.color)
+
+
+def _apply_sprite(sprite, state):
+    sprite.center_x, sprite.center_y, sprite.scale_x, sprite.scale_y, color = state
+    sprite.color = color
+
+
+def _entity_state(obj, action_index):
+    data = {}
+    for key, value in obj.__dict__.items():
+        if key in _SHARED:
+            continue
+        if isinstance(value, ScheduledAction):
+            value = _ActionRef(action_index[id(value)]) if id(value) in action_index else None
+        data[key] = value
+    return data, _sprite_state(obj.sprite)
+
+
+def _apply_entity(obj, state, actions):
+    data, sprite = state
+    for key, value in data.items():
+        if isinstance(value, _ActionRef):
+            value = actions[value.index]
+        obj.__dict__[key] = value
+    _apply_sprite(obj.sprite, sprite)
+
+
+def take_snapshot(sim):
+    owners = {id(sim): "sim", id(sim.player): "player"}
+    for i, e in enumerate(sim.current_enemies):
+        owners[id(e)] = i
+
+    # Действия погибших врагов меняют только их самих, в снимок они не попадают
+    entries = []
+    action_index = {}
+    for due, seq, action in sim.scheduler.pending():
+        owner = owners.get(id(getattr(action.callback, "__self__", None)))
+        if owner is None:
+            continue
+        action_index[id(action)] = len(entries)
+        entries.append((due, seq, owner, action.callback.__name__, action.args))
+
+    floor = sim.floor
+    rooms = {}
+    for pos, room in floor.rooms.items():
+        rocks = None
+        if room.static_layer is not None:
+            rocks = [(r.center_x, r.center_y) for r in room.static_layer.rocks]
+        rooms[pos] = (room.type, room.treasure_unlocked, room.item_spawned, room.guaranteed_item, rocks)
+
+    pool = sim.projectiles
+    state = {
+        "floor": (sim.floor_number, floor.seed, floor.current_pos),
+        "rooms": rooms,
+        "scheduler": (sim.scheduler.now, sim.scheduler._order, entries),
+        "player": _entity_state(sim.player, action_index),
+        "enemies": [(type(e).__name__, _entity_state(e, action_index)) for e in sim.current_enemies],
+        "projectiles": (pool.capacity, list(pool.free), list(pool.sources),
+                        {name: getattr(pool, name).copy() for name in _POOL_ARRAYS}),
+        "pickups": [(p.pickup_type, p.center_x, p.center_y) for p in sim.pickup_sprites],
+        "free_space": np.packbits(sim.free_space.free),
+        "swings": (sim.sword_slashes, sim.axe_swings, sim.halberd_swings, sim.hammer_swings),
+        "sim": {
+            "keys_held": sorted(sim.keys_held),
+            "lives": sim.lives,
+            "room_cleared": sim.room_cleared,
+            "door_open": sim.door_open,
+            "notice_text": sim.notice_text,
+            "notice_action": _ActionRef(action_index[id(sim.notice_action)]) if id(sim.notice_action) in action_index else None,
+            "screen_shake": sim.screen_shake,
+            "outcome": sim.outcome,
+            "tick": sim.tick,
+            "completed_levels": dict(completed_levels),
+        },
+    }
+    # Быстрое сжатие: снимок делается во время игры и не должен давать рывок кадра
+    packed = zlib.compress(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL), 1)
+    streams = [_pack_random(r) for r in (sim.rng.layout, sim.rng.spawns, sim.rng.ai)]
+    return pickle.dumps((SNAPSHOT_VERSION, streams, packed), protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def restore_snapshot(sim, data):
+    version, streams, packed = pickle.loads(data)
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"неизвестная версия снимка: {version}")
+    state = pickle.loads(zlib.decompress(packed))
+
+    floor_number, seed, current_pos = state["floor"]
+    if sim.floor is None:
+        sim.setup(floor_number, seed)
+    sim.floor_number = floor_number
+    sim.floor = Floor(floor_number, seed)
+    sim.floor.current_pos = current_pos
+    sim.rng = sim.floor.rng
+    set_clock(sim.scheduler)
+    set_random(sim.rng)
+
+    # Камни строятся заново из потока комнаты, разбитые молотом убираются
+    for pos, (room_type, unlocked, item_spawned, item, rocks) in state["rooms"].items():
+        room = sim.floor.rooms[pos]
+        room.type = room_type
+        room.treasure_unlocked = unlocked
+        room.item_spawned = item_spawned
+        room.guaranteed_item = item
+        if rocks is None:
+            continue
+        layer = RoomLayer.for_room(room, sim.rng)
+        left = list(rocks)
+        for rock in list(layer.rocks):
+            key = (rock.center_x, rock.center_y)
+            if key in left:
+                left.remove(key)
+            else:
+                rock.remove_from_sprite_lists()
+                layer.grid.remove(rock)
+
+    layer = RoomLayer.for_room(sim.floor.get_current_room(), sim.rng)
+    sim.wall_sprites = layer.rocks
+    sim.door_sprites = layer.doors
+    sim.wall_grid = layer.grid
+
+    # Конструкторы врагов сами бросают кости и заводят таймеры,
+    # поэтому потоки и планировщик восстанавливаются после них
+    sim.current_enemies = [ENEMY_TYPES[name](0, 0) for name, _ in state["enemies"]]
+    sim.enemy_sprites.clear()
+    for e in sim.current_enemies:
+        sim.enemy_sprites.append(e.sprite)
+
+    owners = {"sim": sim, "player": sim.player}
+    now, order, entries = state["scheduler"]
+    actions = sim.scheduler.restore(now, order, [
+        (due, seq, getattr(owners[owner] if isinstance(owner, str) else sim.current_enemies[owner], name), args)
+        for due, seq, owner, name, args in entries
+    ])
+
+    _apply_entity(sim.player, state["player"], actions)
+    for e, (_, entity) in zip(sim.current_enemies, state["enemies"]):
+        _apply_entity(e, entity, actions)
+
+    for rng, packed_rng in zip((sim.rng.layout, sim.rng.spawns, sim.rng.ai), streams):
+        _unpack_random(rng, packed_rng)
+
+    capacity, free, sources, arrays = state["projectiles"]
+    pool = ProjectilePool(capacity)
+    pool.sources = list(sources)
+    for name, values in arrays.items():
+        setattr(pool, name, values.copy())
+    pool.free = list(free)
+    texture = None
+    for i in np.flatnonzero(pool.active).tolist():
+        if texture is None:
+            try:
+                texture = get_texture("assets/arrow.png")
+            except:
+                texture = None
+        pool.textures[i] = texture
+    sim.projectiles = pool
+
+    sim.pickup_sprites.clear()
+    for pickup_type, x, y in state["pickups"]:
+        sprite = make_sprite(PICKUP_TEXTURES[pickup_type], scale=5)
+        sprite.center_x = x
+        sprite.center_y = y
+        sprite.pickup_type = pickup_type
+        sim.pickup_sprites.append(sprite)
+
+    sim.free_space = FreeSpaceSampler()
+    shape = sim.free_space.free.shape
+    sim.free_space.free = np.unpackbits(state["free_space"], count=shape[0] * shape[1]).reshape(shape).astype(bool)
+
+    sim.sword_slashes, sim.axe_swings, sim.halberd_swings, sim.hammer_swings = (
+        [dict(s) for s in swings] for swings in state["swings"]
+    )
+
+    fields = dict(state["sim"])
+    sim.keys_held = set(fields.pop("keys_held"))
+    completed_levels.update(fields.pop("completed_levels"))
+    notice = fields.pop("notice_action")
+    sim.notice_action = actions[notice.index] if notice is not None else None
+    for key, value in fields.items():
+        setattr(sim, key, value)
@@ -0,0 +1,72 @@
+import math
+import numpy as np
+from src.collision import sprite_box
+
+
+_offsets = {}
+
+
+def _box_offsets(sprite):
+    # Хитбокс относительно центра зависит только от текстуры, масштаба и угла
+    key = (id(sprite.texture), sprite.scale_x, sprite.scale_y, sprite.angle)
+    offsets = _offsets.get(key)
+    if offsets is None:
+        x, y = sprite.center_x, sprite.center_y
+        left, bottom, right, top = sprite_box(sprite)
+        offsets = (left - x, bottom - y, right - x, top - y)
+        _offsets[key] = offsets
+    return offsets
+
+
+def steer_enemies(enemies, player, walls, dt):
+    # Шаг, разворот и проверка стен для всей толпы за раз; update таких врагов
+    # в этом тике не вызывается. Рывок и удар враг делает сам
+    enemies = [e for e in enemies if e.steer_batched and not e.steers_itself(player)]
+    if not enemies:
+        return
+
+    rows = []
+    for e in enemies:
+        sprite = e.sprite
+        # Расстояние считается так же, как в update врага, до последнего бита
+        dist = math.hypot(player.x - sprite.center_x, player.y - sprite.center_y)
+        rows.append((sprite.center_x, sprite.center_y, dist, e.speed,
+                     e.steer_min, e.steer_max, e.stunned) + _box_offsets(sprite))
+
+    data = np.array(rows, dtype=float)
+    cx, cy, dist, speed, steer_min, steer_max = data[:, :6].T
+    stunned = data[:, 6] > 0
+    box = data[:, 7:]
+
+    dx = player.x - cx
+    dy = player.y - cy
+    safe = np.maximum(dist, 1e-9)
+    moving = (dist > steer_min) & (dist < steer_max) & ~stunned
+
+    # Погоня идёт по полю путей комнаты, без него - прямо к игроку
+    fx, fy, use = walls.flow_field().towards(player.x, player.y, cx, cy)
+    ux = np.where(use, fx, dx / safe)
+    uy = np.where(use, fy, dy / safe)
+    vx = np.where(moving, ux * speed * dt, 0.0)
+    vy = np.where(moving, uy * speed * dt, 0.0)
+
+    # Шаг по x и затем по y проверяется одним вызовом. Кто упёрся,
+    # в пакет не попадает и доезжает до касания сам через walls.slide
+    nx = cx + vx
+    ny = cy + vy
+    n = len(enemies)
+    blocked = walls.boxes_blocked(
+        np.concatenate([nx + box[:, 0], nx + box[:, 0]]),
+        np.concatenate([cy + box[:, 1], ny + box[:, 1]]),
+        np.concatenate([nx + box[:, 2], nx + box[:, 2]]),
+        np.concatenate([cy + box[:, 3], ny + box[:, 3]]),
+    )
+    blocked = (blocked[:n] | blocked[n:]) & moving
+
+    for e, x, y, step_dx, step_dist, stop in zip(enemies, nx.tolist(), ny.tolist(), dx.tolist(),
+                                                 dist.tolist(), blocked.tolist()):
+        if stop:
+            continue
+        e.sprite.position = (x, y)
+        e.steered(step_dx, step_dist)
+        e.batch_done = True
@@ -0,0 +1,56 @@
+import threading
+from src.scheduler import Scheduler
+
+
+_local = threading.local()
+
+
+def get_clock():
+    # Часы свои у каждого потока: этаж может собираться в фоне, пока идёт игра
+    clock = getattr(_local, "clock", None)
+    if clock is None:
+        clock = _local.clock = Scheduler()
+    return clock
+
+
+def set_clock(clock):
+    _local.clock = clock
+
+
+class Countdown:
+    # Хранит не остаток, а момент срабатывания на часах объекта (obj.clock),
+    # поэтому уменьшать таймер каждый кадр не нужно. on_expire - имя метода,
+    # который вызывается, когда отсчёт дошёл до нуля
+    def __init__(self, on_expire=None):
+        self.on_expire = on_expire
+
+    def __set_name__(self, owner, name):
+        self.due_attr = "_" + name + "_due"
+        self.action_attr = "_" + name + "_action"
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        due = obj.__dict__.get(self.due_attr)
+        if due is None:
+            return 0.0
+        return max(0.0, due - obj.clock.now)
+
+    def __set__(self, obj, value):
+        self._schedule(obj, obj.clock.now + value if value > 0 else None)
+
+    def delay(self, obj, seconds):
+        due = obj.__dict__.get(self.due_attr)
+        if due is not None and due > obj.clock.now:
+            self._schedule(obj, due + seconds)
+
+    def _schedule(self, obj, due):
+        action = obj.__dict__.get(self.action_attr)
+        if action is not None:
+            action.cancel()
+            action = None
+
+        if due is not None and self.on_expire is not None:
+            action = obj.clock.call_later(due - obj.clock.now, getattr(obj, self.on_expire))
+        obj.__dict__[self.due_attr] = due
+        obj.__dict__[self.action_attr] = action
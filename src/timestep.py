@@ -0,0 +1,54 @@
+from src.settings import TICK_RATE, MAX_CATCH_UP_STEPS
+
+
+class FixedTimestep:
+    def __init__(self, tick_rate=TICK_RATE, max_steps=MAX_CATCH_UP_STEPS):
+        self.step = 1.0 / tick_rate
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.ticks = 0
+
+    def advance(self, dt):
+        self.accumulator += dt
+        steps = int(self.accumulator / self.step)
+        if steps > self.max_steps:
+            # Не догоняем бесконечно после долгого зависания кадра
+            steps = self.max_steps
+            self.accumulator = steps * self.step
+        self.accumulator -= steps * self.step
+        self.ticks += steps
+        return steps
+
+    @property
+    def alpha(self):
+        return min(1.0, self.accumulator / self.step)
+
+
+class SpriteInterpolator:
+    def __init__(self, snap_distance=200):
+        self.snap_distance = snap_distance
+        self.previous = {}
+        self.saved = []
+
+    def capture(self, sprites):
+        self.previous = {s: (s.center_x, s.center_y) for s in sprites}
+
+    def apply(self, sprites, alpha):
+        self.saved = []
+        for s in sprites:
+            prev = self.previous.get(s)
+            if prev is None:
+                continue
+            x, y = s.center_x, s.center_y
+            px, py = prev
+            if abs(x - px) > self.snap_distance or abs(y - py) > self.snap_distance:
+                continue
+            self.saved.append((s, x, y))
+            s.center_x = px + (x - px) * alpha
+            s.center_y = py + (y - py) * alpha
+
+    def restore(self):
+        for s, x, y in self.saved:
+            s.center_x = x
+            s.center_y = y
+        self.saved = []
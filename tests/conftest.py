@@ -0,0 +1,12 @@
+import arcade
+
+
+KEYS = [arcade.key.W, arcade.key.A, arcade.key.S, arcade.key.D,
+        arcade.key.UP, arcade.key.DOWN, arcade.key.LEFT, arcade.key.RIGHT, arcade.key.SPACE]
+
+
+def state(sim):
+    # Всё, что должно совпасть побитно при повторе и восстановлении
+    return (sim.tick, sim.floor.seed, sim.floor.current_pos, sim.lives,
+            round(sim.player.x, 6), round(sim.player.y, 6), sim.player.hp, len(sim.projectiles),
+            tuple((type(e).__name__, round(e.x, 6), round(e.y, 6), e.hp) for e in sim.current_enemies))
@@ -0,0 +1,50 @@
+import os
+import pytest
+from PIL import Image
+from src import asset_pipeline
+from src.asset_pipeline import build_assets, resolve
+
+
+@pytest.fixture
+def source(tmp_path, monkeypatch):
+    path = str(tmp_path / "big.png")
+    Image.new("RGBA", (400, 200), (10, 20, 30, 255)).save(path)
+    build = tmp_path / ".build"
+    monkeypatch.setattr(asset_pipeline, "BUILD_DIR", str(build))
+    monkeypatch.setattr(asset_pipeline, "MANIFEST", str(build / "manifest.json"))
+    monkeypatch.setattr(asset_pipeline, "TARGETS", {path: lambda w, h: (w // 4, h // 4)})
+    monkeypatch.setattr(asset_pipeline, "_manifest", None)
+    return path
+
+
+def test_baked_copy_used_until_source_changes(source):
+    assert resolve(source) == source
+    build_assets()
+    baked = resolve(source)
+    assert baked != source
+    with Image.open(baked) as img:
+        assert img.size == (100, 50)
+
+    # Манифест читается с диска заново
+    asset_pipeline._manifest = None
+    assert resolve(source) == baked
+
+    # Другое время изменения - копия устарела, пока её не пересоберут
+    st = os.stat(source)
+    os.utime(source, ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+    assert resolve(source) == source
+    build_assets()
+    assert resolve(source) == baked
+
+
+def test_stale_when_screen_or_copy_changes(source, monkeypatch):
+    build_assets()
+    baked = resolve(source)
+    width = asset_pipeline.SCREEN_WIDTH
+    monkeypatch.setattr(asset_pipeline, "SCREEN_WIDTH", width + 640)
+    assert resolve(source) == source
+    monkeypatch.setattr(asset_pipeline, "SCREEN_WIDTH", width)
+    assert resolve(source) == baked
+
+    os.remove(baked)
+    assert resolve(source) == source
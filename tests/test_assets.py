@@ -0,0 +1,102 @@
+import pytest
+from PIL import Image
+from src import assets
+from src.assets import clear_texture_cache, get_texture, make_sprite, pixel_matrix_texture, texture_cache_stats
+from src import hud
+from src.hud import LivesRow, OverlayBatch
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_texture_cache()
+    yield
+    clear_texture_cache()
+
+
+def png(path, w, h):
+    Image.new("RGBA", (w, h), (200, 30, 30, 255)).save(path)
+    return str(path)
+
+
+def test_texture_loaded_once(tmp_path):
+    path = png(tmp_path / "a.png", 8, 8)
+    first = get_texture(path)
+    assert get_texture(path) is first
+    assert texture_cache_stats() == {"hits": 1, "misses": 1, "loaded": 1, "missing": 0}
+
+
+def test_missing_file_is_remembered(tmp_path):
+    path = str(tmp_path / "none.png")
+    for _ in range(2):
+        with pytest.raises(FileNotFoundError):
+            get_texture(path)
+    assert texture_cache_stats()["missing"] == 1
+
+
+def test_downscaled_copy_keeps_screen_size(tmp_path, monkeypatch):
+    source = png(tmp_path / "big.png", 40, 20)
+    baked = png(tmp_path / "small.png", 10, 5)
+    monkeypatch.setattr(assets, "resolve", lambda path: baked if path == source else path)
+    sprite = make_sprite(source, scale=2)
+    assert sprite.texture.size == (10, 5)
+    assert (sprite.width, sprite.height) == (80, 40)
+
+
+def test_pixel_matrix_texture():
+    texture = pixel_matrix_texture(["010", "111"], 4, (255, 0, 0))
+    assert texture.size == (12, 8)
+    image = texture.image
+    # Верхняя строка матрицы - верх картинки
+    assert image.getpixel((0, 0)) == (0, 0, 0, 0)
+    assert image.getpixel((5, 2)) == (255, 0, 0, 255)
+    assert image.getpixel((0, 6)) == (255, 0, 0, 255)
+    assert pixel_matrix_texture(["010", "111"], 4, (255, 0, 0, 255)) is texture
+    assert pixel_matrix_texture(["010", "111"], 2, (255, 0, 0)) is not texture
+
+
+def test_lives_row_rebuilds_on_change():
+    row = LivesRow(10, 700)
+    row.update(3)
+    hearts = list(row.sprites)
+    row.update(3)
+    assert list(row.sprites) == hearts
+    row.update(2)
+    assert len(row.sprites) == 2
+    assert row.sprites[1].center_x - row.sprites[0].center_x == row.spacing
+
+
+class FakeShapes:
+    def __init__(self):
+        self.elements = []
+        self.draws = []
+
+    def append(self, shape):
+        self.elements.append(shape)
+
+    def draw(self):
+        self.draws.append((self.position, self.angle))
+
+
+def test_overlay_shapes_built_once_and_moved(monkeypatch):
+    monkeypatch.setattr(hud.shape_list, "ShapeElementList", FakeShapes)
+    monkeypatch.setattr(hud.shape_list, "create_triangles_strip_filled_with_colors", lambda points, colors: points)
+    monkeypatch.setattr(hud.shape_list, "create_ellipse_filled", lambda *args, **kwargs: args)
+    lines = []
+    monkeypatch.setattr(hud.arcade, "draw_line", lambda *args: lines.append(args))
+    overlay = OverlayBatch()
+    for x in range(5):
+        overlay.circle_outline(100 + x, 50, 30, (255, 0, 0), 3)
+        overlay.circle_filled(100 + x, 50, 30, (255, 0, 0, 120))
+        overlay.arc_outline(200, 60, 80, (0, 0, 255), 10 * x, 10 * x + 90, 4)
+        overlay.line(0, 0, x, x, (255, 255, 255), 2)
+    assert len(overlay.templates) == 3
+    assert all(len(shapes.elements) == 1 for shapes in overlay.templates.values())
+    ring = overlay.templates[("ring", 30, (255, 0, 0), 3, 360.0)]
+    assert [position for position, _ in ring.draws] == [(100 + x, 50) for x in range(5)]
+    arc = overlay.templates[("ring", 80, (0, 0, 255), 2.0, 90)]
+    # Дуга повёрнута к своей середине; angle списка - по часовой стрелке
+    assert [angle for _, angle in arc.draws] == [-(10 * x + 45) for x in range(5)]
+    # Шаблон дуги лежит от -45 до 45 градусов вокруг начала координат
+    points = arc.elements[0]
+    assert points[0][1] < 0 < points[-1][1]
+    assert len(lines) == 5
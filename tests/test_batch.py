@@ -0,0 +1,45 @@
+import pytest
+from src.batch import aggregate, parse_seeds, run_one
+from src.settings import completed_levels
+
+
+def test_parse_seeds():
+    assert parse_seeds("1-3, 7,,10-11") == [1, 2, 3, 7, 10, 11]
+    assert parse_seeds("") == []
+
+
+def test_aggregate():
+    runs = [
+        {"result": "win", "ticks": 600, "seconds": 1.0, "worker": 11,
+         "clears": {"normal": [3.0, 5.0]}, "damage": {"Enemy": 40.0}},
+        {"result": "loss", "ticks": 300, "seconds": 0.5, "worker": 11,
+         "clears": {"normal": [4.0], "boss": [30.0]}, "damage": {"Enemy": 20.0, "Boss": 100.0}},
+        {"result": "win", "ticks": 900, "seconds": 3.0, "worker": 12,
+         "clears": {}, "damage": {}},
+    ]
+    report = aggregate(runs)
+    assert report["runs"] == 3
+    assert report["win_rate"] == pytest.approx(2 / 3)
+    assert report["results"] == {"win": 2, "loss": 1}
+    assert report["clear_seconds"]["normal"] == {"count": 3, "mean": 4.0, "p50": 4.0, "max": 5.0}
+    assert report["clear_seconds"]["boss"]["count"] == 1
+    # Урон - в среднем на прогон, по убыванию
+    assert list(report["damage_per_run"].items()) == [("Boss", 100 / 3), ("Enemy", 20.0)]
+    assert report["ticks_per_sec"] == {"11": 600.0, "12": 300.0}
+
+
+def test_aggregate_empty():
+    assert aggregate([])["win_rate"] == 0.0
+
+
+def test_run_one_times_out():
+    saved = dict(completed_levels)
+    try:
+        r = run_one(5, 2, "bot", 120)
+        assert (r["seed"], r["result"], r["ticks"]) == (5, "timeout", 120)
+        assert completed_levels[1] and not completed_levels[2]
+        # Тот же сид - тот же прогон
+        again = run_one(5, 2, "bot", 120)
+        assert (again["damage"], again["clears"], again["lives"]) == (r["damage"], r["clears"], r["lives"])
+    finally:
+        completed_levels.update(saved)
@@ -0,0 +1,129 @@
+import random
+import arcade
+import numpy as np
+from src.collision import CONTACT_SKIN, CollisionGrid, sprite_box
+from src.room_layer import border_sprites
+from src.settings import SCREEN_WIDTH, SCREEN_HEIGHT, WALL_TILE
+
+
+def block(x, y, w, h):
+    return arcade.SpriteSolidColor(w, h, center_x=x, center_y=y)
+
+
+def test_aligned_tile_is_solid():
+    grid = CollisionGrid()
+    tile = block(WALL_TILE * 2.5, WALL_TILE * 1.5, WALL_TILE, WALL_TILE)
+    grid.add(tile)
+    assert grid.solid_view[1, 2] == 1
+    assert not grid.partial
+    assert grid.box_blocked(170, 100, 180, 110)
+    assert not grid.box_blocked(100, 100, 128, 110)
+
+    grid.remove(tile)
+    assert not grid.solid_view.any()
+    assert not grid.box_blocked(170, 100, 180, 110)
+
+
+def test_rock_goes_to_partial_cells():
+    grid = CollisionGrid()
+    rock = block(128, 128, 40, 40)
+    grid.add(rock)
+    assert not grid.solid_view.any()
+    assert set(grid.partial) == {(1, 1), (2, 1), (1, 2), (2, 2)}
+    # Та же клетка, но мимо самого камня
+    assert not grid.box_blocked(66, 66, 100, 100)
+    assert grid.box_blocked(100, 100, 110, 110)
+
+    version = grid.version
+    grid.remove(rock)
+    assert not grid.partial
+    assert grid.version > version
+    assert len(grid.obstacle_boxes()) == 0
+
+
+def test_border_not_aligned_to_grid():
+    # 720 не делится на 64: верхняя стена занимает 656..720 и ложится в две строки частично
+    assert SCREEN_HEIGHT % WALL_TILE != 0
+    grid = CollisionGrid.from_sprites(border_sprites())
+    top = SCREEN_HEIGHT - WALL_TILE
+    x = SCREEN_WIDTH / 2
+    assert grid.box_blocked(x, top - 10, x + 10, top + 1)
+    assert not grid.box_blocked(x, top - 10, x + 10, top)
+    assert not grid.box_blocked(x, top - 10, x + 10, top - CONTACT_SKIN)
+    # Нижняя и боковые стены выровнены по сетке и лежат в solid
+    assert grid.solid_view[0].all()
+    assert grid.box_blocked(x, WALL_TILE - 1, x + 10, WALL_TILE + 10)
+    assert not grid.box_blocked(x, WALL_TILE, x + 10, WALL_TILE + 10)
+
+
+def test_sweep_stops_at_contact():
+    grid = CollisionGrid.from_sprites(border_sprites())
+    top = SCREEN_HEIGHT - WALL_TILE
+    t, normal = grid.sweep(600, top - 40, 640, top - 20, 0, 40)
+    assert t == 0.5
+    assert normal == (0, -1)
+    t, normal = grid.sweep(600, top - 40, 640, top - 20, 0, 10)
+    assert t == 1.0
+    assert normal == (0, 0)
+
+
+def test_slide_along_wall_and_into_corner():
+    grid = CollisionGrid.from_sprites(border_sprites())
+    top = SCREEN_HEIGHT - WALL_TILE
+    sprite = block(600, top - 12, 20, 20)
+    # Вверх-вправо у потолка: по y упирается, по x едет дальше
+    assert grid.slide(sprite, 30, 30)
+    assert sprite.center_x == 630
+    assert abs(sprite_box(sprite)[3] - (top - CONTACT_SKIN)) < 1e-9
+
+    # В угол между потолком и правой стеной: упирается по обеим осям
+    right = SCREEN_WIDTH - WALL_TILE
+    sprite.center_x = right - 15
+    assert grid.slide(sprite, 30, 30)
+    left, bottom, r, t = sprite_box(sprite)
+    assert abs(r - (right - CONTACT_SKIN)) < 1e-9
+    assert abs(t - (top - CONTACT_SKIN)) < 1e-9
+    assert not grid.collides(sprite)
+
+    # Дальше в угол не сдвинуть, от него - свободно
+    x, y = sprite.center_x, sprite.center_y
+    assert grid.slide(sprite, 5, 5)
+    assert abs(sprite.center_x - x) <= CONTACT_SKIN and abs(sprite.center_y - y) <= CONTACT_SKIN
+    assert not grid.slide(sprite, -5, -5)
+
+
+def test_slide_around_rock_corner():
+    grid = CollisionGrid()
+    grid.add(block(300, 300, 40, 40))
+    sprite = block(265, 250, 20, 20)
+    # Край спрайта 275 левее камня (280): вдоль его стороны движение свободно
+    assert not grid.slide(sprite, 0, 100)
+    assert sprite.center_y == 350
+    sprite.position = (250, 300)
+    assert grid.slide(sprite, 50, 10)
+    assert abs(sprite_box(sprite)[2] - (280 - CONTACT_SKIN)) < 1e-9
+    assert sprite.center_y == 310
+
+
+def test_boxes_blocked_matches_box_blocked():
+    grid = CollisionGrid.from_sprites(border_sprites())
+    rng = random.Random(3)
+    for _ in range(12):
+        grid.add(block(rng.uniform(100, 1180), rng.uniform(100, 620), rng.randint(20, 90), rng.randint(20, 90)))
+    boxes = []
+    for _ in range(500):
+        x = rng.uniform(-50, SCREEN_WIDTH)
+        y = rng.uniform(-50, SCREEN_HEIGHT)
+        boxes.append((x, y, x + rng.uniform(1, 120), y + rng.uniform(1, 120)))
+    # Прямоугольники за краем экрана и нулевой ширины на границе клетки
+    boxes += [(-80, 100, -10, 150), (SCREEN_WIDTH + 5, 10, SCREEN_WIDTH + 40, 60), (128, 128, 128, 200)]
+    boxes = np.array(boxes)
+    expected = [grid.box_blocked(*b) for b in boxes.tolist()]
+    assert grid.boxes_blocked(*boxes.T).tolist() == expected
+
+    # Суммы по сплошным клеткам пересчитываются после изменения стен
+    wall = block(10.5 * WALL_TILE, 5.5 * WALL_TILE, WALL_TILE, WALL_TILE)
+    grid.add(wall)
+    assert grid.boxes_blocked(*boxes.T).tolist() == [grid.box_blocked(*b) for b in boxes.tolist()]
+    grid.remove(wall)
+    assert grid.boxes_blocked(*boxes.T).tolist() == expected
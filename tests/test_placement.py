@@ -0,0 +1,110 @@
+import random
+import arcade
+import pytest
+from src.collision import CollisionGrid, sprite_box
+from src.placement import FreeSpaceSampler, NoFreeSpaceError
+from src import simulation
+from src.room_layer import border_sprites
+from src.simulation import Simulation
+
+
+def overlaps(a, b):
+    return a[0] < b[2] and a[2] > b[0] and a[1] < b[3] and a[3] > b[1]
+
+
+def footprint(sampler, x, y, pad=0):
+    h = sampler.half + pad
+    return x - h, y - h, x + h, y + h
+
+
+def test_take_avoids_walls_rocks_and_sprites():
+    grid = CollisionGrid.from_sprites(border_sprites())
+    rocks = [arcade.SpriteSolidColor(80, 80, center_x=x, center_y=y) for x, y in ((400, 300), (800, 500))]
+    for rock in rocks:
+        grid.add(rock)
+    door = arcade.SpriteList()
+    door.append(arcade.SpriteSolidColor(100, 60, center_x=640, center_y=600))
+
+    sampler = FreeSpaceSampler.for_room(grid, door)
+    boxes = [sprite_box(s) for s in rocks] + [sprite_box(door[0])]
+    rng = random.Random(1)
+    placed = []
+    for _ in range(20):
+        x, y = sampler.take(spacing=24, rng=rng)
+        box = footprint(sampler, x, y)
+        assert not grid.box_blocked(*box)
+        assert not any(overlaps(box, b) for b in boxes)
+        placed.append((x, y))
+
+    # Отступ 24 держится между всеми парами
+    for i, (x1, y1) in enumerate(placed):
+        for x2, y2 in placed[i + 1:]:
+            assert max(abs(x1 - x2), abs(y1 - y2)) >= 2 * sampler.half + 24
+
+
+def test_candidates_stay_in_bounds():
+    sampler = FreeSpaceSampler(min_x=200, max_x=400, min_y=100, max_y=180, size=20, step=10)
+    rng = random.Random(2)
+    taken = 0
+    while sampler.available():
+        x, y = sampler.take(rng=rng)
+        assert 200 <= x <= 400 and 100 <= y <= 180
+        taken += 1
+    # Занятое место закрывает и соседних кандидатов
+    assert 1 < taken < 21 * 9
+    with pytest.raises(NoFreeSpaceError):
+        sampler.take(rng=rng)
+
+
+def test_block_edges():
+    sampler = FreeSpaceSampler(min_x=0, max_x=100, min_y=0, max_y=0, size=20, step=10)
+    # Касание по краю не занимает кандидата: x=30 ровно на расстоянии half от 40
+    sampler.block(40, -5, 60, 5)
+    assert sampler.free[0].tolist() == [True, True, True, True, False, False, False, True, True, True, True]
+
+
+def test_same_seed_same_positions():
+    grid = CollisionGrid.from_sprites(border_sprites())
+
+    def positions(seed):
+        sampler = FreeSpaceSampler.for_room(grid)
+        rng = random.Random(seed)
+        return [sampler.take(24, rng) for _ in range(8)]
+
+    assert positions(5) == positions(5)
+    assert positions(5) != positions(6)
+
+
+def test_full_room_raises():
+    sampler = FreeSpaceSampler()
+    sampler.block(0, 0, 2000, 2000)
+    assert sampler.available() == 0
+    with pytest.raises(NoFreeSpaceError):
+        sampler.take()
+
+
+def test_nearest_takes_closest_free_spot():
+    sampler = FreeSpaceSampler(min_x=0, max_x=100, min_y=0, max_y=100, size=20, step=10)
+    sampler.block(30, 30, 70, 70)
+    state = random.getstate()
+    # Из равноудалённых - первый по строкам снизу вверх
+    assert sampler.nearest(50, 50) == (50, 20)
+    assert random.getstate() == state
+    # Занятое место больше не выдаётся
+    assert sampler.nearest(50, 50) == (20, 50)
+
+
+def test_pickup_placed_when_room_is_full(monkeypatch, capsys):
+    sim = Simulation()
+    sim.setup(1, 4)
+    sim.free_space.block(0, 0, 2000, 2000)
+    x, y = sim.find_pickup_position()
+    h = simulation.PICKUP_MIN_SIZE / 2
+    assert not sim.wall_grid.box_blocked(x - h, y - h, x + h, y + h)
+    assert "нет места для предмета" in capsys.readouterr().out
+
+    # Если не влезает и предмет меньшего размера, ошибка не глотается
+    sim.free_space.block(0, 0, 2000, 2000)
+    monkeypatch.setattr(simulation, "PICKUP_MIN_SIZE", 5000)
+    with pytest.raises(NoFreeSpaceError):
+        sim.find_pickup_position()
@@ -0,0 +1,76 @@
+import arcade
+from src.dungeon import RoomType
+from src.policy import Action, BotPolicy, _move_toward, apply_action
+from src.simulation import Simulation
+
+
+def test_move_toward():
+    assert _move_toward(3, -5) == ()
+    assert _move_toward(100, 10) == ("right",)
+    assert _move_toward(-100, 80) == ("left", "up")
+    assert _move_toward(-10, -100) == ("down",)
+
+
+def test_apply_action_holds_and_taps_keys():
+    sim = Simulation()
+    sim.setup(1, 3)
+    apply_action(sim, Action(("up", "right")))
+    assert sim.keys_held == {arcade.key.W, arcade.key.D}
+    apply_action(sim, Action(("right",), attack="left", dash=True))
+    # Удар и рывок - разовые нажатия, клавиши сразу отпущены
+    assert sim.keys_held == {arcade.key.D}
+
+
+def test_bot_attacks_enemy_in_reach():
+    sim = Simulation()
+    sim.setup(1, 3)
+    room = next(pos for pos, r in sim.floor.rooms.items() if r.type == RoomType.NORMAL)
+    sim.floor.current_pos = room
+    sim.load_current_room()
+    enemy = sim.current_enemies[0]
+    sim.current_enemies[:] = [enemy]
+    enemy.sprite.position = (sim.player.x + 112, sim.player.y)
+    action = BotPolicy().act(sim)
+    assert sim.player.weapon == "sword"
+    assert action.attack == "right"
+
+
+def test_door_route_reaches_boss():
+    sim = Simulation()
+    sim.setup(1, 3)
+    bot = BotPolicy()
+    floor = sim.floor
+    assert bot._next_door(sim) in floor.rooms[floor.current_pos].doors
+    for _ in range(len(floor.rooms)):
+        if floor.current_pos == floor.boss_pos:
+            break
+        floor.current_pos = floor.rooms[floor.current_pos].doors[bot._door_toward(floor, floor.boss_pos)]
+        room = floor.rooms[floor.current_pos]
+        # Запертая сокровищница не по пути
+        assert room.type != RoomType.TREASURE or room.treasure_unlocked
+    assert floor.current_pos == floor.boss_pos
+
+
+def test_field_built_only_when_walls_change():
+    sim = Simulation()
+    sim.setup(3, 3)
+    for pos, room in sim.floor.rooms.items():
+        sim.floor.current_pos = pos
+        sim.load_current_room()
+        if len(sim.wall_sprites):
+            break
+    bot = BotPolicy()
+    bot._toward(sim, 200, 200)
+    field = bot.field
+    field.toward(200, 200, 640, 360)
+    graph = field.neighbours
+    for tx, ty in ((300, 500), (1000, 200), (700, 600)):
+        field.toward(tx, ty, 640, 360)
+    assert field.neighbours is graph
+    bot._toward(sim, 300, 300)
+    assert bot.field is field
+
+    # Камень разбит - граф проходов строится заново
+    sim.wall_grid.remove(sim.wall_sprites[0])
+    field.toward(200, 200, 640, 360)
+    assert field.neighbours is not graph
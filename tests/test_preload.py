@@ -0,0 +1,60 @@
+import threading
+import pytest
+from PIL import Image
+from src import assets, preload
+from src.assets import clear_texture_cache, get_texture
+from src.preload import FloorPreloader
+
+
+def test_preloaded_floor_is_handed_over():
+    loader = FloorPreloader(2)
+    sim = loader.result()
+    assert loader.ready
+    assert sim.floor_number == 2
+    assert sim.floor.rooms
+    assert sim.current_enemies is not None
+
+
+def test_failed_preload_reraises(monkeypatch):
+    class Broken:
+        def setup(self, floor_number):
+            raise RuntimeError("этаж не собрался")
+
+    monkeypatch.setattr(preload, "Simulation", Broken)
+    loader = FloorPreloader(1)
+    with pytest.raises(RuntimeError, match="этаж не собрался"):
+        loader.result()
+
+
+def test_cache_is_readable_while_decoding(tmp_path, monkeypatch):
+    clear_texture_cache()
+    ready = tmp_path / "ready.png"
+    slow = tmp_path / "slow.png"
+    for path in (ready, slow):
+        Image.new("RGBA", (4, 4)).save(path)
+    cached = get_texture(str(ready))
+
+    # Пока один поток декодирует картинку, кэш доступен остальным
+    decoding = threading.Event()
+    release = threading.Event()
+    load = assets.arcade.load_texture
+
+    def slow_load(path):
+        if path == str(slow):
+            decoding.set()
+            release.wait(5)
+        return load(path)
+
+    monkeypatch.setattr(assets.arcade, "load_texture", slow_load)
+    worker = threading.Thread(target=get_texture, args=(str(slow),))
+    worker.start()
+    try:
+        assert decoding.wait(5)
+        assert assets._lock.acquire(timeout=1)
+        assets._lock.release()
+        assert get_texture(str(ready)) is cached
+    finally:
+        release.set()
+        worker.join()
+    assert get_texture(str(slow)) is not None
+    clear_texture_cache()
@@ -0,0 +1,89 @@
+import math
+import numpy as np
+from src.projectiles import ProjectilePool, impact_times
+
+
+def test_free_list_reuses_released_slots():
+    pool = ProjectilePool(capacity=4)
+    slots = [pool.spawn(10 * i, 0, 1, 0, damage=5) for i in range(4)]
+    assert slots == [0, 1, 2, 3]
+    assert len(pool) == 4 and not pool.free
+
+    pool.release([1, 1])
+    assert pool.free == [1]
+    generation = pool.generation[1]
+    assert pool.spawn(0, 0, 0, 1, damage=5) == 1
+    assert pool.generation[1] == generation + 1
+    assert len(pool) == 4
+
+
+def test_pool_grows_when_full():
+    pool = ProjectilePool(capacity=2)
+    pool.source = "RangedEnemy"
+    for _ in range(3):
+        pool.spawn(0, 0, 1, 0, damage=1)
+    assert pool.capacity == 4
+    assert len(pool) == 3
+    assert pool.sources[:3] == ["RangedEnemy"] * 3
+    assert len(pool.x) == len(pool.textures) == len(pool.sources) == 4
+
+    pool.clear()
+    assert len(pool) == 0
+    assert sorted(pool.free) == [0, 1, 2, 3]
+    assert not pool.indices().size
+
+
+def test_indices_by_owner():
+    pool = ProjectilePool()
+    a = pool.spawn(0, 0, 1, 0, damage=1, from_enemy=True)
+    b = pool.spawn(0, 0, 1, 0, damage=1)
+    assert pool.indices(from_enemy=True).tolist() == [a]
+    assert pool.indices(from_enemy=False).tolist() == [b]
+    pool.reflect(a)
+    assert pool.indices(from_enemy=False).tolist() == [a, b]
+    assert pool.vx[a] == -1
+
+
+def test_step_moves_only_active_slots():
+    pool = ProjectilePool(capacity=2)
+    a = pool.spawn(0, 0, 60, -30, damage=1)
+    b = pool.spawn(5, 5, 60, 60, damage=1)
+    pool.release(b)
+    pool.step(0.5)
+    assert (pool.x[a], pool.y[a], pool.age[a]) == (30, -15, 0.5)
+    assert (pool.prev_x[a], pool.prev_y[a]) == (0, 0)
+    assert (pool.x[b], pool.y[b], pool.age[b]) == (5, 5, 0)
+
+
+def test_first_hits_picks_earliest_box():
+    pool = ProjectilePool()
+    fast = pool.spawn(0, 0, 6000, 0, damage=1)
+    slow = pool.spawn(0, 200, 60, 0, damage=1)
+    pool.half_w[:] = 0
+    pool.half_h[:] = 0
+    pool.step(1 / 60)
+    boxes = [(80, -10, 90, 10), (40, -10, 50, 10), (500, 190, 520, 210)]
+    times = pool.impact_times(np.array([fast, slow]), boxes)
+    assert np.isfinite(times[0]).tolist() == [True, True, False]
+    assert not np.isfinite(times[1]).any()
+    rows, first = pool.first_hits(np.array([fast, slow]), boxes)
+    assert rows.tolist() == [0] and first.tolist() == [1]
+
+
+def hit(*args):
+    return float(impact_times(*(np.float64(a) for a in args)))
+
+
+def test_impact_times_cases():
+    box = (100.0, -10.0, 120.0, 10.0)
+    # Пролетает прямоугольник насквозь за один шаг
+    assert hit(0.0, 0.0, 400.0, 0.0, 0.0, 0.0, *box) == 0.25
+    # Половинки размера расширяют прямоугольник
+    assert hit(0.0, 0.0, 400.0, 0.0, 20.0, 0.0, *box) == 0.2
+    # Не долетает, летит мимо, параллельно краю, уже внутри
+    assert hit(0.0, 0.0, 50.0, 0.0, 0.0, 0.0, *box) == math.inf
+    assert hit(0.0, 20.0, 400.0, 0.0, 0.0, 0.0, *box) == math.inf
+    assert hit(0.0, 10.0, 400.0, 0.0, 0.0, 0.0, *box) == math.inf
+    assert hit(110.0, 0.0, 5.0, 5.0, 0.0, 0.0, *box) == 0.0
+    # Вертикальный полёт
+    assert hit(110.0, -100.0, 0.0, 200.0, 0.0, 0.0, *box) == 0.45
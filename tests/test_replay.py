@@ -0,0 +1,95 @@
+import random
+import arcade
+import pytest
+from src.replay import Recorder, Replay, ReplayFormatError, ReplayPlayer, _get_varint, _put_varint
+from src.simulation import Simulation
+from tests.conftest import KEYS, state
+
+
+def test_varint_round_trip():
+    values = [0, 1, 127, 128, 255, 300, 16383, 16384, 2 ** 32 - 1, 2 ** 63 + 5]
+    out = bytearray()
+    for v in values:
+        _put_varint(out, v)
+    assert out[:4] == bytes([0, 1, 0x7F, 0x80])
+    pos = 0
+    decoded = []
+    while pos < len(out):
+        v, pos = _get_varint(out, pos)
+        decoded.append(v)
+    assert decoded == values
+
+
+def test_truncated_data_is_rejected():
+    out = bytearray()
+    _put_varint(out, 300)
+    with pytest.raises(ReplayFormatError):
+        _get_varint(out[:1], 0)
+
+    data = Recorder(1, 5).to_bytes(10)
+    assert Replay.from_bytes(data).ticks == 10
+    for cut in (5, len(data) - 1):
+        with pytest.raises(ReplayFormatError):
+            Replay.from_bytes(data[:cut])
+    with pytest.raises(ReplayFormatError):
+        Replay.from_bytes(b"XXXX" + data[4:])
+
+
+def test_events_round_trip():
+    recorder = Recorder(2, 99)
+    recorder.key(0, arcade.key.W)
+    recorder.key(0, arcade.key.D)
+    recorder.key(200, arcade.key.W, released=True)
+    recorder.key(70000, arcade.key.SPACE)
+    replay = Replay.from_bytes(recorder.to_bytes(70010))
+    assert (replay.floor_number, replay.seed, replay.ticks) == (2, 99, 70010)
+    assert replay.events == [(0, arcade.key.W, False), (0, arcade.key.D, False),
+                             (200, arcade.key.W, True), (70000, arcade.key.SPACE, False)]
+
+
+def record(floor_number, seed, ticks, restarts):
+    sim = Simulation()
+    sim.setup(floor_number, seed)
+    sim.recorder = Recorder(floor_number, sim.floor.seed)
+    rnd = random.Random(seed)
+    trace = []
+    for t in range(ticks):
+        if t in restarts:
+            sim.key_press(arcade.key.R)
+            sim.key_release(arcade.key.R)
+        for _ in range(rnd.choice([0, 0, 1, 2])):
+            key = rnd.choice(KEYS)
+            if key in sim.keys_held:
+                sim.key_release(key)
+            else:
+                sim.key_press(key)
+        sim.update(1 / 60)
+        trace.append(state(sim))
+        if sim.outcome:
+            break
+    return sim, trace
+
+
+def test_restart_replays_identically():
+    sim, trace = record(1, 777, 900, {200, 600})
+    seeds = {s[1] for s in trace}
+    assert len(seeds) == 3
+
+    replay = Replay.from_bytes(sim.recorder.to_bytes(sim.tick))
+    player = ReplayPlayer(replay)
+    replayed = []
+    while not player.done:
+        player.step()
+        replayed.append(state(player.sim))
+    assert replayed == trace
+
+
+def test_seek_past_restart():
+    sim, trace = record(2, 31, 900, {250})
+    replay = Replay.from_bytes(sim.recorder.to_bytes(sim.tick))
+    assert replay.keyframes
+    player = ReplayPlayer(replay)
+    player.seek(700)
+    assert state(player.sim) == trace[699]
+    player.seek(100)
+    assert state(player.sim) == trace[99]
@@ -0,0 +1,96 @@
+from src.scheduler import Scheduler
+from src.timers import Countdown
+
+
+def test_due_order_and_ties():
+    clock = Scheduler()
+    calls = []
+    clock.call_later(0.2, calls.append, "b")
+    clock.call_later(0.1, calls.append, "a")
+    clock.call_later(0.2, calls.append, "c")
+    clock.call_later(0.2, calls.append, "d")
+    clock.advance(0.15)
+    assert calls == ["a"]
+    clock.advance(0.05)
+    # С одинаковым сроком - в порядке постановки
+    assert calls == ["a", "b", "c", "d"]
+    assert len(clock) == 0
+
+
+def test_cancel_and_scheduling_from_callback():
+    clock = Scheduler()
+    calls = []
+
+    def chain():
+        calls.append("chain")
+        clock.call_later(0.0, calls.append, "same tick")
+        clock.call_later(0.1, calls.append, "later")
+
+    skipped = clock.call_later(0.05, calls.append, "cancelled")
+    clock.call_later(0.05, chain)
+    skipped.cancel()
+    assert len(clock) == 1
+    clock.advance(0.05)
+    assert calls == ["chain", "same tick"]
+    clock.advance(0.1)
+    assert calls == ["chain", "same tick", "later"]
+
+
+def test_restore_keeps_order():
+    clock = Scheduler()
+    calls = []
+    for name in "xyz":
+        clock.call_later(1.0, calls.append, name)
+    clock.call_later(0.5, calls.append, "w").cancel()
+    clock.advance(0.25)
+    entries = clock.pending()
+    assert [seq for _, seq, _ in entries] == [0, 1, 2]
+
+    copy = Scheduler()
+    copy.restore(clock.now, clock._order, [(due, seq, a.callback, a.args) for due, seq, a in entries])
+    copy.call_later(0.75, calls.append, "new")
+    copy.advance(1.0)
+    assert calls == ["x", "y", "z", "new"]
+
+
+class Unit:
+    stun = Countdown(on_expire="wake")
+    cooldown = Countdown()
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.woken = 0
+
+    def wake(self):
+        self.woken += 1
+
+
+def test_countdown_reads_clock():
+    clock = Scheduler()
+    unit = Unit(clock)
+    assert unit.cooldown == 0.0
+    unit.cooldown = 1.0
+    clock.advance(0.25)
+    assert unit.cooldown == 0.75
+    Unit.cooldown.delay(unit, 0.5)
+    clock.advance(1.0)
+    assert unit.cooldown == 0.25
+    clock.advance(1.0)
+    assert unit.cooldown == 0.0
+
+
+def test_countdown_expiry_reschedules():
+    clock = Scheduler()
+    unit = Unit(clock)
+    unit.stun = 0.5
+    clock.advance(0.25)
+    # Новое значение отменяет прежнее срабатывание
+    unit.stun = 0.5
+    clock.advance(0.25)
+    assert unit.woken == 0
+    clock.advance(0.25)
+    assert unit.woken == 1
+    unit.stun = 0.5
+    unit.stun = 0
+    clock.advance(1.0)
+    assert unit.woken == 1
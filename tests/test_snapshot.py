@@ -0,0 +1,70 @@
+import random
+import arcade
+from src import settings
+from src.simulation import Simulation
+from src.snapshot import restore_snapshot, take_snapshot
+from tests.conftest import KEYS, state
+
+
+def drive(sim, inputs):
+    trace = []
+    for keys in inputs:
+        for key in keys:
+            if key == arcade.key.R:
+                sim.key_press(key)
+                sim.key_release(key)
+            elif key in sim.keys_held:
+                sim.key_release(key)
+            else:
+                sim.key_press(key)
+        sim.update(1 / 60)
+        trace.append(state(sim))
+    return trace
+
+
+def make_inputs(seed, ticks):
+    rnd = random.Random(seed)
+    return [[rnd.choice(KEYS) for _ in range(rnd.choice([0, 0, 1, 2]))] for _ in range(ticks)]
+
+
+def round_trip(floor_number, seed, before):
+    sim = Simulation()
+    sim.setup(floor_number, seed)
+    drive(sim, before)
+    data = take_snapshot(sim)
+    after = make_inputs(seed + 1, 400)
+    expected = drive(sim, after)
+
+    copy = Simulation()
+    restore_snapshot(copy, data)
+    assert copy.rng is copy.floor.rng
+    return drive(copy, after), expected
+
+
+def test_round_trip():
+    for floor_number in (1, 2, 3):
+        got, expected = round_trip(floor_number, 100 + floor_number, make_inputs(floor_number, 300))
+        assert got == expected
+
+
+def test_round_trip_after_restart():
+    before = make_inputs(5, 300)
+    before[120].append(arcade.key.R)
+    got, expected = round_trip(1, 55, before)
+    assert got == expected
+
+
+def test_restore_updates_shared_levels():
+    levels = settings.completed_levels
+    saved = dict(levels)
+    try:
+        levels.update({1: True, 2: False, 3: False})
+        sim = Simulation()
+        sim.setup(2, 9)
+        data = take_snapshot(sim)
+        levels.update({1: False, 2: True, 3: True})
+        restore_snapshot(Simulation(), data)
+        assert settings.completed_levels is levels
+        assert levels == {1: True, 2: False, 3: False}
+    finally:
+        levels.update(saved)
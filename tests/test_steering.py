@@ -0,0 +1,66 @@
+import arcade
+import pytest
+from src import simulation
+from src.dungeon import RoomType
+from src.enemy import (Enemy, FastEnemy, TankEnemy, RangedEnemy, EliteRunner, EliteShooter,
+                       EliteTankFloor3, EliteArcherFloor3)
+from src.simulation import Simulation
+from src.steering import steer_enemies
+
+
+ARCHETYPES = [Enemy, FastEnemy, TankEnemy, RangedEnemy, EliteRunner, EliteShooter,
+              EliteTankFloor3, EliteArcherFloor3]
+MOVES = [arcade.key.W, arcade.key.D, arcade.key.S, arcade.key.A]
+
+
+def rocky_room(sim):
+    rooms = [pos for pos, room in sim.floor.rooms.items() if room.type == RoomType.NORMAL]
+    for pos in rooms:
+        sim.floor.current_pos = pos
+        sim.load_current_room()
+        if len(sim.wall_sprites):
+            return
+    pytest.skip("на этаже нет комнаты с камнями")
+
+
+def run(monkeypatch, batch, seed, ticks):
+    monkeypatch.setattr(simulation, "BATCH_STEERING", batch)
+    monkeypatch.setattr(simulation, "BATCH_STEERING_MIN_ENEMIES", 1)
+    # Сколько шагов врагов сделал пакетный проход вместо их update
+    handled = []
+
+    def counted(enemies, *args):
+        steer_enemies(enemies, *args)
+        handled.append(sum(e.batch_done for e in enemies))
+
+    monkeypatch.setattr(simulation, "steer_enemies", counted)
+    sim = Simulation()
+    sim.setup(3, seed)
+    rocky_room(sim)
+    sim.current_enemies.clear()
+    sim.enemy_sprites.clear()
+    for i in range(24):
+        x, y = sim.find_free_position()
+        e = ARCHETYPES[i % len(ARCHETYPES)](x, y)
+        e.hp = 10 ** 9
+        sim.current_enemies.append(e)
+        sim.enemy_sprites.append(e.sprite)
+
+    trace = []
+    for t in range(ticks):
+        sim.player.hp = sim.player.max_hp
+        if t % 90 == 0:
+            sim.keys_held.clear()
+            sim.key_press(MOVES[t // 90 % len(MOVES)])
+        sim.update(1 / 60)
+        trace.append([(e.x, e.y) for e in sim.current_enemies])
+    return trace, sum(handled)
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_batch_matches_scalar(monkeypatch, seed):
+    batch, handled = run(monkeypatch, True, seed, 600)
+    scalar, _ = run(monkeypatch, False, seed, 600)
+    assert batch == scalar
+    # Пакет действительно заменяет update, а не только дублирует его
+    assert handled > 600 * 24 // 4
@@ -0,0 +1,38 @@
+import arcade
+import pytest
+from src.timestep import FixedTimestep, SpriteInterpolator
+
+
+def test_accumulator_carries_remainder():
+    clock = FixedTimestep(tick_rate=10, max_steps=5)
+    assert clock.advance(0.05) == 0
+    assert clock.alpha == pytest.approx(0.5)
+    assert clock.advance(0.07) == 1
+    assert clock.accumulator == pytest.approx(0.02)
+    assert clock.advance(0.28) == 3
+    assert clock.ticks == 4
+    assert clock.accumulator == pytest.approx(0.0, abs=1e-12)
+
+
+def test_catch_up_is_capped():
+    clock = FixedTimestep(tick_rate=60, max_steps=5)
+    # Долгое зависание кадра: не больше max_steps шагов, остаток отбрасывается
+    assert clock.advance(2.0) == 5
+    assert clock.accumulator == 0.0
+    assert clock.advance(1 / 60) == 1
+
+
+def test_interpolator_blends_and_restores():
+    near = arcade.SpriteSolidColor(4, 4, center_x=0, center_y=0)
+    far = arcade.SpriteSolidColor(4, 4, center_x=0, center_y=0)
+    lerp = SpriteInterpolator(snap_distance=200)
+    lerp.capture([near, far])
+    near.center_x, near.center_y = 100, 40
+    # Телепорт дальше snap_distance не сглаживается
+    far.center_x = 500
+
+    lerp.apply([near, far], 0.25)
+    assert (near.center_x, near.center_y) == (25, 10)
+    assert far.center_x == 500
+    lerp.restore()
+    assert (near.center_x, near.center_y) == (100, 40)